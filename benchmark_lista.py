@@ -0,0 +1,257 @@
+"""
+╔══════════════════════════════════════════════════════════════╗
+║         BENCHMARK DA LISTA DE ATIVIDADES — NuAr              ║
+║  Gera atividades.json sintéticos com cada vez mais           ║
+║  atividades e mede as operações do gestor_atividades.py      ║
+║  sobre eles, tal como o menu as faz (adicionar / mover /     ║
+║  apagar: dados, diário, página e lista regenerada) e cada    ║
+║  etapa em separado (gerar e escrever a página, regenerar     ║
+║  a lista).                                                   ║
+║                                                              ║
+║  Ficheiros gerados:                                          ║
+║    .benchmark-baseline.json — tempos de referência desta     ║
+║                               máquina (com --gravar)         ║
+║                                                              ║
+║  Corre numa pasta temporária: o site não é alterado.         ║
+║  Termina com código 1 se alguma operação ficar mais lenta    ║
+║  do que a referência para além do limiar.                    ║
+╚══════════════════════════════════════════════════════════════╝
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import gestor_atividades as gestor
+
+
+# ──────────────────────────────────────────────────────────────
+# CONFIGURAÇÃO
+# ──────────────────────────────────────────────────────────────
+BASELINE_JSON = Path(".benchmark-baseline.json").resolve()
+TAMANHOS      = (100, 500, 1000, 2000)     # número de cards no activities.html
+REPETICOES    = 5
+
+# Regressão: mais lento do que a referência em LIMIAR (fração) e em pelo
+# menos MINIMO_MS (abaixo disso é ruído da medição)
+LIMIAR        = 0.25
+MINIMO_MS     = 1.0
+
+# Copiados para a pasta temporária
+FICHEIROS_SITE = (gestor.ACTIVITIES_HTML, gestor.TEMPLATE_HTML)
+
+LOCAIS = ("Anfiteatro da FCT", "Campus de Caparica", "Online", "Escola Secundária")
+MESES  = ("janeiro", "fevereiro", "março", "abril", "maio", "junho", "julho",
+          "agosto", "setembro", "outubro", "novembro", "dezembro")
+
+
+# ──────────────────────────────────────────────────────────────
+# DADOS SINTÉTICOS
+# ──────────────────────────────────────────────────────────────
+
+def atividade_sintetica(n: int) -> dict:
+    ano = 2030 - n // 120
+    data = f"{n % 28 + 1} de {MESES[n // 10 % 12]} de {ano}"
+    return gestor.montar_atividade(
+        titulo=f"Atividade sintética {n}", data=data, hora="14h00 – 16h00",
+        local=LOCAIS[n % len(LOCAIS)], vagas="30", thumb="images/Foto_index.jpeg",
+        paragrafos=[f"Descrição da atividade {n}. " * 8, "Segundo parágrafo com mais texto. " * 6],
+        fotos=[{"url": "images/Egg_1.jpg", "thumbnail": "images/Egg_1.jpg"}] * 3, link_galeria="",
+        inscricao_email="nuar@exemplo.pt",
+    )
+
+
+def gerar_dados(tamanho: int) -> dict:
+    """Metade por vir, metade passadas (pela ordem dos dados: a última é a primeira da lista)."""
+    dados = {"atividades": {}}
+    for n in reversed(range(tamanho)):
+        secao = "upcoming" if n < tamanho // 2 else "past"
+        gestor.guardar_atividade(dados, atividade_sintetica(n), secao)
+    return dados
+
+
+def gerar_lista_sintetica(base: str, dados: dict) -> str:
+    """activities.html com todos os cards (sem o arquivo por anos, para medir a lista inteira)."""
+    for secao, (inicio, fim) in gestor.SECOES.items():
+        cards = gestor.gerar_cards_html(gestor.atividades_da_secao(dados, secao))
+        base = gestor.substituir_zona(base, inicio, fim, cards)
+    return gestor.conteudo_final(gestor.ACTIVITIES_HTML, base)
+
+
+# ──────────────────────────────────────────────────────────────
+# MEDIÇÃO
+# ──────────────────────────────────────────────────────────────
+
+def cronometrar(operacao, preparar=None, repeticoes: int = REPETICOES) -> dict:
+    """Mediana e mínimo em ms; `preparar` repõe o estado antes de cada repetição (fora do tempo)."""
+    tempos = []
+    for _ in range(repeticoes):
+        if preparar:
+            preparar()
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            operacao()
+            tempos.append((time.perf_counter() - inicio) * 1000)
+        for lista in gestor.RELATORIO_BUILD.values():
+            lista.clear()
+    return {"mediana": statistics.median(tempos), "minimo": min(tempos)}
+
+
+def medir_tamanho(tamanho: int, base: str, repeticoes: int) -> dict[str, dict]:
+    dados = gerar_dados(tamanho)
+    lista = gerar_lista_sintetica(base, dados)
+    por_vir = gestor.atividades_da_secao(dados, "upcoming")
+    alvo = por_vir[len(por_vir) // 2]              # card a meio da lista
+    nova = atividade_sintetica(tamanho + 1)
+
+    def repor_tudo():
+        """Estado de partida: dados, lista e página do alvo como estavam, diário vazio."""
+        Path(gestor.ACTIVITIES_HTML).write_text(lista, encoding='utf-8')
+        Path(gestor.DADOS_JSON).write_text(json.dumps(dados, ensure_ascii=False, indent=2) + "\n",
+                                           encoding='utf-8')
+        Path(gestor.DIARIO_JSONL).unlink(missing_ok=True)
+        Path(nova["pagina"]).unlink(missing_ok=True)
+        Path(alvo["pagina"]).write_text(pagina_alvo, encoding='utf-8')
+
+    def repor_pagina():
+        Path(alvo["pagina"]).unlink(missing_ok=True)
+
+    pagina_alvo = gestor.conteudo_final(alvo["pagina"], gestor.gerar_pagina_atividade(alvo))
+    return {
+        "gravar_nova_atividade":  cronometrar(lambda: gestor.gravar_nova_atividade(nova), repor_tudo, repeticoes),
+        "mover_atividade":        cronometrar(lambda: gestor.mover_atividade(alvo["pagina"]), repor_tudo, repeticoes),
+        "apagar_atividade":       cronometrar(lambda: gestor.apagar_atividade(alvo["pagina"]), repor_tudo, repeticoes),
+        "gerar_pagina_atividade": cronometrar(lambda: gestor.gerar_pagina_atividade(alvo), None, repeticoes),
+        "renderizar_pagina":      cronometrar(lambda: gestor.renderizar_pagina(alvo), repor_pagina, repeticoes),
+        "renderizar_lista":       cronometrar(lambda: gestor.renderizar_lista(dados), repor_tudo, repeticoes),
+    }
+
+
+def correr(tamanhos: list[int], repeticoes: int) -> dict[str, dict[str, dict]]:
+    """{operação: {tamanho: {mediana, minimo}}}, numa pasta temporária com cópia do site."""
+    origem = Path.cwd()
+    resultados = {}
+    with tempfile.TemporaryDirectory(prefix="nuar-benchmark-") as pasta:
+        for nome in FICHEIROS_SITE:
+            shutil.copy2(origem / nome, pasta)
+        os.chdir(pasta)
+        try:
+            base = Path(gestor.ACTIVITIES_HTML).read_text(encoding='utf-8')
+            for tamanho in tamanhos:
+                print(f"⏱  {tamanho} cards…")
+                for operacao, tempo in medir_tamanho(tamanho, base, repeticoes).items():
+                    resultados.setdefault(operacao, {})[str(tamanho)] = tempo
+                # cada tamanho começa sem o manifesto do anterior
+                Path(gestor.MANIFESTO_JSON).unlink(missing_ok=True)
+                gestor._manifesto = None
+        finally:
+            os.chdir(origem)
+    return resultados
+
+
+# ──────────────────────────────────────────────────────────────
+# RELATÓRIO E COMPARAÇÃO
+# ──────────────────────────────────────────────────────────────
+
+def regressoes(resultados: dict, referencia: dict, limiar: float) -> list[tuple[str, str, float, float]]:
+    """(operação, tamanho, referência, atual) das medianas que pioraram para além do limiar."""
+    piores = []
+    for operacao, por_tamanho in resultados.items():
+        for tamanho, tempo in por_tamanho.items():
+            antes = referencia.get(operacao, {}).get(tamanho)
+            if antes is None:
+                continue
+            atual, anterior = tempo["mediana"], antes["mediana"]
+            if atual > anterior * (1 + limiar) and atual - anterior >= MINIMO_MS:
+                piores.append((operacao, tamanho, anterior, atual))
+    return piores
+
+
+def mostrar_tabela(resultados: dict, referencia: dict):
+    tamanhos = sorted({int(t) for r in resultados.values() for t in r})
+    print("\n" + f"{'operação (mediana, ms)':28}" + "".join(f"{t:>12}" for t in tamanhos) + "  crescimento")
+    for operacao, por_tamanho in resultados.items():
+        linha = f"{operacao:28}"
+        for tamanho in tamanhos:
+            tempo = por_tamanho[str(tamanho)]["mediana"]
+            antes = referencia.get(operacao, {}).get(str(tamanho))
+            marca = " "
+            if antes and tempo > antes["mediana"] * (1 + LIMIAR):
+                marca = "▲"
+            elif antes and tempo < antes["mediana"] * (1 - LIMIAR):
+                marca = "▼"
+            linha += f"{tempo:11.2f}{marca}"
+        # quanto cresce o tempo face ao crescimento do número de cards (1.0 ≈ linear)
+        primeiro, ultimo = por_tamanho[str(tamanhos[0])]["mediana"], por_tamanho[str(tamanhos[-1])]["mediana"]
+        if len(tamanhos) > 1 and primeiro > 0:
+            linha += f"  ×{ultimo / primeiro:.1f} para ×{tamanhos[-1] / tamanhos[0]:.0f} cards"
+        print(linha)
+
+
+def carregar_baseline(caminho: Path) -> dict:
+    try:
+        return json.loads(caminho.read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return {}
+
+
+# ──────────────────────────────────────────────────────────────
+# MAIN
+# ──────────────────────────────────────────────────────────────
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark das operações sobre activities.html com muitos cards.")
+    parser.add_argument("-t", "--tamanhos", type=int, nargs="+", default=list(TAMANHOS),
+                        help=f"números de cards a testar (por omissão, {' '.join(map(str, TAMANHOS))})")
+    parser.add_argument("-r", "--repeticoes", type=int, default=REPETICOES,
+                        help=f"repetições por medição; conta a mediana (por omissão, {REPETICOES})")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_JSON,
+                        help="ficheiro JSON com os tempos de referência")
+    parser.add_argument("--gravar", action="store_true", help="grava os resultados como nova referência")
+    parser.add_argument("--limiar", type=float, default=LIMIAR,
+                        help=f"fração de abrandamento que conta como regressão (por omissão, {LIMIAR})")
+    args = parser.parse_args(argv)
+
+    baseline = carregar_baseline(args.baseline)
+    referencia = baseline.get("resultados", {})
+    resultados = correr(sorted(set(args.tamanhos)), args.repeticoes)
+    mostrar_tabela(resultados, referencia)
+
+    if args.gravar:
+        args.baseline.write_text(json.dumps({
+            "gerado":      datetime.now().isoformat(timespec="seconds"),
+            "python":      platform.python_version(),
+            "maquina":     platform.platform(),
+            "repeticoes":  args.repeticoes,
+            "resultados":  resultados,
+        }, ensure_ascii=False, indent=1) + "\n", encoding='utf-8')
+        print(f"\n💾 Referência gravada em {args.baseline}.")
+        return 0
+    if not referencia:
+        print(f"\nℹ️  Sem referência ({args.baseline}) — corre com --gravar para a criar.")
+        return 0
+
+    piores = regressoes(resultados, referencia, args.limiar)
+    print(f"\nReferência de {baseline.get('gerado', '?')} (Python {baseline.get('python', '?')}).")
+    for operacao, tamanho, antes, atual in piores:
+        print(f"   ❌ {operacao} com {tamanho} cards: {antes:.2f} → {atual:.2f} ms "
+              f"(+{100 * (atual / antes - 1):.0f}%)")
+    if piores:
+        print(f"\n❌ {len(piores)} regressão(ões) acima de {100 * args.limiar:.0f}%.")
+        return 1
+    print(f"✅ Sem regressões acima de {100 * args.limiar:.0f}%.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
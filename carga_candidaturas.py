@@ -0,0 +1,227 @@
+"""
+╔══════════════════════════════════════════════════════════════╗
+║         TESTE DE CARGA DAS CANDIDATURAS — NuAr               ║
+║  Abre N clientes em simultâneo (ligações keep-alive) que     ║
+║  submetem candidaturas válidas ao servidor_candidaturas.py   ║
+║  durante D segundos e mostra candidaturas/s, latências       ║
+║  (p50 / p95 / p99), recusas 503 e o tamanho médio dos lotes. ║
+║                                                              ║
+║  Com --iniciar arranca o próprio servidor (preso a um só     ║
+║  núcleo, com uma base e um esquema temporários) e no fim     ║
+║  confirma que todas as candidaturas aceites foram gravadas.  ║
+╚══════════════════════════════════════════════════════════════╝
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+import servidor_candidaturas as servidor
+
+
+# ──────────────────────────────────────────────────────────────
+# CONFIGURAÇÃO
+# ──────────────────────────────────────────────────────────────
+URL         = f"http://{servidor.ENDERECO}:{servidor.PORTA}{servidor.CAMINHO}"
+CLIENTES    = 64
+DURACAO     = 10.0      # segundos
+PORTA_TESTE = 8765
+
+# Esquema usado com --iniciar: um pouco de cada tipo de pergunta
+ESQUEMA_TESTE = {
+    "basic": [
+        {"id": "basic_nome", "label": "Nome", "tipo": "short", "required": True},
+        {"id": "basic_email", "label": "Email", "tipo": "short", "required": True},
+        {"id": "basic_curso", "label": "Curso", "tipo": "dropdown", "required": True,
+         "options": ["Física", "Engenharia Física", "Outro"]},
+    ],
+    "astro": [
+        {"id": "astro_motivacao", "label": "Motivação", "tipo": "long"},
+        {"id": "astro_areas", "label": "Áreas", "tipo": "checkbox",
+         "options": ["Observação", "Astrofotografia", "Divulgação"]},
+    ],
+}
+
+
+# ──────────────────────────────────────────────────────────────
+# CANDIDATURAS
+# ──────────────────────────────────────────────────────────────
+
+def candidatura_aleatoria(regras: dict[str, dict], n: int) -> bytes:
+    """Corpo form-urlencoded, como o que o browser envia a partir do <form>."""
+    campos = []
+    for qid, p in regras.items():
+        if p["tipo"] == "checkbox":
+            escolhidas = random.sample(p["options"], random.randint(0 if not p["required"] else 1,
+                                                                    len(p["options"])))
+            campos.extend((qid, opcao) for opcao in escolhidas)
+        elif p["tipo"] == "dropdown":
+            campos.append((qid, random.choice(p["options"])))
+        elif p["tipo"] == "long":
+            campos.append((qid, f"Candidatura {n}. " * random.randint(5, 40)))
+        else:
+            campos.append((qid, f"candidato{n}@exemplo.pt" if "email" in qid else f"Candidato {n}"))
+    return urlencode(campos).encode("utf-8")
+
+
+# ──────────────────────────────────────────────────────────────
+# CLIENTES
+# ──────────────────────────────────────────────────────────────
+
+async def ler_resposta(leitor: asyncio.StreamReader) -> int:
+    cabecalho = await leitor.readuntil(b"\r\n\r\n")
+    linhas = cabecalho.decode("latin-1").split("\r\n")
+    tamanho = 0
+    for linha in linhas[1:]:
+        nome, _, valor = linha.partition(":")
+        if nome.strip().lower() == "content-length":
+            tamanho = int(valor)
+    await leitor.readexactly(tamanho)
+    return int(linhas[0].split(" ", 2)[1])
+
+
+async def cliente(anfitriao: str, porta: int, caminho: str, regras: dict, fim: float, resultados: dict):
+    leitor, escritor = await asyncio.open_connection(anfitriao, porta)
+    try:
+        while time.perf_counter() < fim:
+            resultados["enviadas"] += 1
+            corpo = candidatura_aleatoria(regras, resultados["enviadas"])
+            pedido = (f"POST {caminho} HTTP/1.1\r\nHost: {anfitriao}\r\n"
+                      f"Content-Type: application/x-www-form-urlencoded\r\n"
+                      f"Content-Length: {len(corpo)}\r\n\r\n").encode("latin-1") + corpo
+            inicio = time.perf_counter()
+            escritor.write(pedido)
+            await escritor.drain()
+            estado = await ler_resposta(leitor)
+            resultados["estados"][estado] = resultados["estados"].get(estado, 0) + 1
+            if estado == 201:
+                resultados["latencias"].append(time.perf_counter() - inicio)
+            elif estado == 503:
+                await asyncio.sleep(0.05)       # Retry-After em versão curta
+    except (ConnectionError, asyncio.IncompleteReadError) as e:
+        resultados["erros"].append(str(e) or type(e).__name__)
+    finally:
+        escritor.close()
+
+
+async def carga(url: str, regras: dict, clientes: int, duracao: float) -> dict:
+    partes = urlsplit(url)
+    resultados = {"enviadas": 0, "estados": {}, "latencias": [], "erros": []}
+    inicio = time.perf_counter()
+    fim = inicio + duracao
+    await asyncio.gather(*(cliente(partes.hostname, partes.port or 80, partes.path, regras, fim, resultados)
+                           for _ in range(clientes)))
+    resultados["duracao"] = time.perf_counter() - inicio
+    return resultados
+
+
+async def pedir_saude(url: str) -> dict:
+    partes = urlsplit(url)
+    leitor, escritor = await asyncio.open_connection(partes.hostname, partes.port or 80)
+    escritor.write(f"GET /saude HTTP/1.1\r\nHost: {partes.hostname}\r\nConnection: close\r\n\r\n".encode())
+    corpo = (await leitor.read()).split(b"\r\n\r\n", 1)[1]
+    escritor.close()
+    return json.loads(corpo)
+
+
+# ──────────────────────────────────────────────────────────────
+# SERVIDOR DE TESTE
+# ──────────────────────────────────────────────────────────────
+
+def iniciar_servidor(pasta: Path, porta: int) -> subprocess.Popen:
+    """servidor_candidaturas.py num processo à parte, preso ao núcleo 0 quando o sistema deixa."""
+    esquema = pasta / "esquema.json"
+    esquema.write_text(json.dumps(ESQUEMA_TESTE, ensure_ascii=False), encoding="utf-8")
+    preso = hasattr(os, "sched_setaffinity")
+    processo = subprocess.Popen(
+        [sys.executable, str(Path(servidor.__file__).resolve()), "--porta", str(porta),
+         "--base", str(pasta / "candidaturas.sqlite3"), "--esquema", str(esquema)],
+        stdout=subprocess.DEVNULL, preexec_fn=(lambda: os.sched_setaffinity(0, {0})) if preso else None)
+    for _ in range(100):                         # espera que a porta aceite ligações
+        try:
+            asyncio.run(pedir_saude(f"http://127.0.0.1:{porta}"))
+            return processo
+        except OSError:
+            time.sleep(0.05)
+    processo.kill()
+    raise RuntimeError("O servidor de teste não arrancou.")
+
+
+def percentil(valores: list[float], p: float) -> float:
+    return statistics.quantiles(valores, n=100, method="inclusive")[p - 1] if len(valores) > 1 else valores[0]
+
+
+# ──────────────────────────────────────────────────────────────
+# MAIN
+# ──────────────────────────────────────────────────────────────
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga do servidor de candidaturas do NuAr.")
+    parser.add_argument("--url", default=URL, help=f"onde submeter (por omissão, {URL})")
+    parser.add_argument("-c", "--clientes", type=int, default=CLIENTES,
+                        help=f"clientes em simultâneo (por omissão, {CLIENTES})")
+    parser.add_argument("-d", "--duracao", type=float, default=DURACAO,
+                        help=f"segundos de carga (por omissão, {DURACAO:g})")
+    parser.add_argument("--iniciar", action="store_true",
+                        help="arranca um servidor de teste com base e esquema temporários")
+    parser.add_argument("--esquema", type=Path, default=None,
+                        help="esquema das perguntas a preencher (sem --iniciar; por omissão, o do recrutamento.py)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="nuar-carga-") as pasta:
+        processo = None
+        if args.iniciar:
+            args.url = f"http://127.0.0.1:{PORTA_TESTE}{servidor.CAMINHO}"
+            processo = iniciar_servidor(Path(pasta), PORTA_TESTE)
+            regras = servidor.regras_do_formulario(Path(pasta) / "esquema.json")
+        else:
+            regras = servidor.regras_do_formulario(args.esquema)
+        try:
+            print(f"🚀 {args.clientes} cliente(s) durante {args.duracao:g} s contra {args.url}…")
+            resultados = asyncio.run(carga(args.url, regras, args.clientes, args.duracao))
+            try:
+                saude = asyncio.run(pedir_saude(args.url))
+            except OSError:                     # o servidor já terminou
+                saude = {}
+        finally:
+            if processo:
+                processo.send_signal(signal.SIGINT)     # como o Ctrl+C: grava o que falta
+                processo.wait()
+
+        aceites = resultados["estados"].get(201, 0)
+        latencias = [1000 * t for t in resultados["latencias"]]
+        print(f"\n📊 {aceites} candidatura(s) aceite(s) em {resultados['duracao']:.1f} s "
+              f"→ {aceites / resultados['duracao']:.0f} candidaturas/s")
+        if latencias:
+            print(f"   latência (ms): p50 {percentil(latencias, 50):.1f} · p95 {percentil(latencias, 95):.1f} · "
+                  f"p99 {percentil(latencias, 99):.1f} · máx {max(latencias):.1f}")
+        outros = {e: n for e, n in resultados["estados"].items() if e != 201}
+        print(f"   respostas: 201 × {aceites}" + "".join(f" · {e} × {n}" for e, n in sorted(outros.items())))
+        if saude.get("lotes"):
+            print(f"   {saude['lotes']} lote(s), {saude['gravadas'] / saude['lotes']:.1f} candidatura(s) por transação")
+        for erro in sorted(set(resultados["erros"])):
+            print(f"   ⚠️  {erro}")
+
+        if processo:
+            with sqlite3.connect(Path(pasta) / "candidaturas.sqlite3") as conexao:
+                gravadas = conexao.execute("SELECT COUNT(*) FROM candidaturas").fetchone()[0]
+            if gravadas != aceites:
+                print(f"\n❌ {aceites} aceite(s) mas {gravadas} gravada(s).")
+                return 1
+            print(f"\n✅ Todas as {gravadas} candidatura(s) aceites estão na base.")
+    return 1 if resultados["erros"] or any(e >= 400 and e != 503 for e in outros) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+╔══════════════════════════════════════════════════════════════╗
+║         COMPRESSÃO PRÉVIA DOS FICHEIROS ESTÁTICOS — NuAr     ║
+║  Escreve ao lado de cada HTML / CSS / SVG do site (e dos     ║
+║  JSON que o browser pede) as versões comprimidas             ║
+║  (ficheiro.gz e ficheiro.br), para o servidor (nginx         ║
+║  gzip_static / brotli_static, CDN) as enviar sem comprimir   ║
+║  a cada pedido.                                              ║
+║                                                              ║
+║  Ficheiros gerados:                                          ║
+║    <ficheiro>.gz, <ficheiro>.br                              ║
+║    .cache-compressao.json — hash de cada original            ║
+║                                                              ║
+║  Brotli requer o módulo brotli (pip install brotli); sem     ║
+║  ele só se geram os .gz.                                     ║
+╚══════════════════════════════════════════════════════════════╝
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# ──────────────────────────────────────────────────────────────
+# CONFIGURAÇÃO
+# ──────────────────────────────────────────────────────────────
+EXTENSOES      = {".html", ".css", ".svg"}
+
+# Dos JSON, só os que o browser pede; os outros (atividades.json, os
+# manifestos, images/*/indice.json) são de uso interno e não se servem
+JSON_SERVIDOS  = {"activities.json", "activities-index.json"}
+CACHE          = Path(".cache-compressao.json")
+
+# Abaixo disto a compressão não compensa o cabeçalho
+TAMANHO_MINIMO = 512
+
+# Pastas que não são servidas
+IGNORAR        = {".git", "__pycache__", "node_modules", ".venv", "venv"}
+
+
+# ──────────────────────────────────────────────────────────────
+# UTILITÁRIOS
+# ──────────────────────────────────────────────────────────────
+
+def listar_ficheiros() -> list[str]:
+    """Ficheiros do site a comprimir (os escondidos, como as caches, ficam de fora)."""
+    ficheiros = []
+    for raiz, pastas, nomes in os.walk("."):
+        pastas[:] = sorted(p for p in pastas if p not in IGNORAR and not p.startswith("."))
+        for nome in sorted(nomes):
+            caminho = Path(raiz, nome).as_posix().removeprefix("./")
+            if not nome.startswith(".") and servido(caminho):
+                ficheiros.append(caminho)
+    return ficheiros
+
+
+def servido(caminho: str) -> bool:
+    return Path(caminho).suffix in EXTENSOES or Path(caminho).as_posix() in JSON_SERVIDOS
+
+
+def variantes(caminho: str) -> list[str]:
+    return [caminho + ".gz"] + ([caminho + ".br"] if brotli else [])
+
+
+def carregar_cache() -> dict:
+    try:
+        return json.loads(CACHE.read_text(encoding='utf-8'))
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def gravar_cache(cache: dict):
+    CACHE.write_text(json.dumps(cache, ensure_ascii=False, indent=1, sort_keys=True) + "\n", encoding='utf-8')
+
+
+def _apagar_comprimidos(caminho: str):
+    # as duas extensões, mesmo sem o módulo brotli: pode haver .br de outra máquina
+    for extensao in (".gz", ".br"):
+        Path(caminho + extensao).unlink(missing_ok=True)
+
+
+def _escrever_atomico(destino: str, dados: bytes):
+    """Temporário + os.replace: o servidor nunca envia um .gz/.br a meio de ser escrito."""
+    temporario = Path(destino).with_name(f".{Path(destino).name}.{os.getpid()}.tmp")
+    try:
+        temporario.write_bytes(dados)
+        os.replace(temporario, destino)
+    except BaseException:
+        temporario.unlink(missing_ok=True)
+        raise
+
+
+def apagar_variantes(caminho: str):
+    """Para quando o original é apagado (não deixar .gz/.br órfãos)."""
+    _apagar_comprimidos(caminho)
+    cache = carregar_cache()
+    if cache.pop(caminho, None) is not None:
+        gravar_cache(cache)
+
+
+# ──────────────────────────────────────────────────────────────
+# COMPRESSÃO
+# ──────────────────────────────────────────────────────────────
+
+def comprimir_ficheiro(caminho: str) -> tuple[str, int, int, int | None]:
+    """Trabalho de cada processo: (caminho, original, gzip, brotli) em bytes."""
+    dados = Path(caminho).read_bytes()
+    # mtime=0 → o mesmo original dá sempre o mesmo .gz
+    gz = gzip.compress(dados, compresslevel=9, mtime=0)
+    _escrever_atomico(caminho + ".gz", gz)
+    br = None
+    if brotli:
+        br = brotli.compress(dados, quality=11)
+        _escrever_atomico(caminho + ".br", br)
+    return caminho, len(dados), len(gz), len(br) if br is not None else None
+
+
+def comprimir(caminhos: list[str], forcar: bool = False, processos: int | None = None,
+              mostrar: bool = True) -> int:
+    """
+    Comprime os ficheiros cujo conteúdo mudou desde a última vez (ou cujas
+    variantes desapareceram). Devolve quantos foram comprimidos.
+    """
+    cache = carregar_cache()
+    hashes = {}
+    pendentes = []
+    for caminho in caminhos:
+        p = Path(caminho)
+        if not p.is_file() or not servido(caminho):
+            # apagado (uma página, um asset versionado antigo) ou de uso interno,
+            # como o atividades.json de um build: sem .gz/.br, nem os de antes
+            _apagar_comprimidos(caminho)
+            cache.pop(caminho, None)
+            continue
+        if p.stat().st_size < TAMANHO_MINIMO:
+            _apagar_comprimidos(caminho)
+            continue
+        h = hashlib.sha256(p.read_bytes()).hexdigest()
+        hashes[caminho] = h
+        if forcar or cache.get(caminho) != h or not all(Path(v).exists() for v in variantes(caminho)):
+            pendentes.append(caminho)
+
+    inicio = time.perf_counter()
+    processos = processos or os.cpu_count() or 1
+    if processos > 1 and len(pendentes) > 1:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            lote = max(1, len(pendentes) // (processos * 4))
+            resultados = list(pool.map(comprimir_ficheiro, pendentes, chunksize=lote))
+    else:
+        resultados = [comprimir_ficheiro(c) for c in pendentes]
+    duracao = time.perf_counter() - inicio
+
+    total = total_gz = total_br = 0
+    for caminho, original, gz, br in resultados:
+        cache[caminho] = hashes[caminho]
+        total += original
+        total_gz += gz
+        total_br += br or 0
+        if mostrar:
+            linha = f"🗜  {caminho:48} {original / 1024:7.1f} KB  gz {100 * gz / original:3.0f}%"
+            print(linha + (f"  br {100 * br / original:3.0f}%" if br is not None else ""))
+
+    # originais que desapareceram desde a última vez (ou que deixaram de se servir):
+    # um .gz/.br órfão continuava a ser enviado pelo gzip_static
+    for caminho in [c for c in cache if not Path(c).exists() or not servido(c)]:
+        _apagar_comprimidos(caminho)
+        del cache[caminho]
+    gravar_cache(cache)
+
+    if mostrar:
+        if total:
+            resumo = f"gz {total_gz / 1024:.1f} KB ({100 * total_gz / total:.0f}%)"
+            if brotli:
+                resumo += f", br {total_br / 1024:.1f} KB ({100 * total_br / total:.0f}%)"
+            print(f"\n✅ {len(resultados)} ficheiro(s) comprimido(s) em {duracao:.2f} s: "
+                  f"{total / 1024:.1f} KB → {resumo}")
+        print(f"ℹ️  {len(hashes) - len(resultados)} sem alterações (cache).")
+        if brotli is None:
+            print("⚠️  Módulo brotli não instalado (pip install brotli) — só foram gerados .gz.")
+    return len(resultados)
+
+
+# ──────────────────────────────────────────────────────────────
+# MAIN
+# ──────────────────────────────────────────────────────────────
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Gera versões .gz/.br dos ficheiros estáticos do site NuAr.")
+    parser.add_argument("ficheiros", nargs="*", help="ficheiros a comprimir (por omissão, todo o site)")
+    parser.add_argument("--forcar", action="store_true", help="ignora a cache e comprime tudo outra vez")
+    parser.add_argument("-j", "--processos", type=int, default=None,
+                        help="número de processos (por omissão, um por núcleo)")
+    args = parser.parse_args(argv)
+
+    comprimir(args.ficheiros or listar_ficheiros(), args.forcar, args.processos)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
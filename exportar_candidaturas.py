@@ -0,0 +1,250 @@
+"""
+╔══════════════════════════════════════════════════════════════╗
+║         EXPORTAR CANDIDATURAS — NuAr                         ║
+║  Tira as candidaturas de uma secção (basic, astro, nss,      ║
+║  star) do candidaturas.sqlite3 para CSV ou JSONL, uma linha  ║
+║  de cada vez: a memória usada não depende do número de       ║
+║  candidaturas. Cada opção de uma checkbox é uma coluna.      ║
+║  As secções de projeto levam também as informações básicas   ║
+║  (para o júri poder contactar os candidatos).                ║
+║                                                              ║
+║  Ficheiros:                                                  ║
+║    .exportacoes-candidaturas.json — última candidatura       ║
+║                                     exportada por ficheiro   ║
+║                                                              ║
+║  Com --novas acrescenta ao ficheiro só as candidaturas que   ║
+║  chegaram desde a última exportação para ele.                ║
+╚══════════════════════════════════════════════════════════════╝
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import recrutamento
+from servidor_candidaturas import BASE_DADOS, regras_do_formulario
+
+
+# ──────────────────────────────────────────────────────────────
+# CONFIGURAÇÃO
+# ──────────────────────────────────────────────────────────────
+CURSORES_JSON = Path(".exportacoes-candidaturas.json")
+FORMATOS      = ("csv", "jsonl")
+PREFIXOS      = [sec["prefix"] for sec in recrutamento.SECTIONS.values()]
+BASICAS       = PREFIXOS[0]
+
+LINHAS_POR_LEITURA = 500       # fetchmany: só estas linhas em memória de cada vez
+MARCA_CHECKBOX     = "x"       # valor das colunas das opções escolhidas
+
+# Células que o Excel / LibreOffice interpretam como fórmula
+INICIO_DE_FORMULA  = ("=", "+", "-", "@", "\t", "\r")
+
+
+# ──────────────────────────────────────────────────────────────
+# CURSORES ("desde a última exportação")
+# ──────────────────────────────────────────────────────────────
+
+def carregar_cursores() -> dict:
+    try:
+        return json.loads(CURSORES_JSON.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def gravar_cursor(destino: str, ultimo_id: int, linhas: int):
+    cursores = carregar_cursores()
+    cursores[destino] = {"ultimo_id": ultimo_id, "linhas": linhas,
+                         "exportado": datetime.now().isoformat(timespec="seconds")}
+    temporario = CURSORES_JSON.with_name(CURSORES_JSON.name + ".tmp")
+    temporario.write_text(json.dumps(cursores, ensure_ascii=False, indent=1) + "\n", encoding="utf-8")
+    os.replace(temporario, CURSORES_JSON)
+
+
+# ──────────────────────────────────────────────────────────────
+# COLUNAS
+# ──────────────────────────────────────────────────────────────
+
+def perguntas_exportadas(secao: str, regras: dict[str, dict], com_basicas: bool) -> list[dict]:
+    prefixos = [secao] if secao == BASICAS or not com_basicas else [BASICAS, secao]
+    return [p for prefixo in prefixos for p in regras.values() if p["id"].startswith(f"{prefixo}_")]
+
+
+def colunas(perguntas: list[dict]) -> list[str]:
+    """id, recebida e uma coluna por pergunta — ou por opção, nas checkboxes."""
+    nomes = ["id", "recebida"]
+    for p in perguntas:
+        if p["tipo"] == "checkbox":
+            # "outras": opções que entretanto saíram do esquema
+            nomes.extend([f"{p['id']}: {opcao}" for opcao in p["options"]] + [f"{p['id']}: outras"])
+        else:
+            nomes.append(p["id"])
+    return nomes
+
+
+def achatar(candidatura_id: int, recebida: str, respostas: dict, perguntas: list[dict]) -> list:
+    """A linha da candidatura, pela ordem de colunas()."""
+    linha = [candidatura_id, recebida]
+    for p in perguntas:
+        resposta = respostas.get(p["id"], [] if p["tipo"] == "checkbox" else "")
+        if p["tipo"] == "checkbox":
+            escolhidas = resposta if isinstance(resposta, list) else [resposta]
+            linha.extend(MARCA_CHECKBOX if opcao in escolhidas else "" for opcao in p["options"])
+            linha.append("; ".join(e for e in escolhidas if e not in p["options"]))
+        else:
+            linha.append("; ".join(resposta) if isinstance(resposta, list) else str(resposta))
+    return linha
+
+
+def sem_formulas(linha: list) -> list:
+    """Para CSV: as respostas vêm do formulário público, uma "=HYPERLINK(…)" não pode ficar ativa."""
+    return [f"'{c}" if isinstance(c, str) and c.startswith(INICIO_DE_FORMULA) else c for c in linha]
+
+
+# ──────────────────────────────────────────────────────────────
+# LEITURA EM STREAMING
+# ──────────────────────────────────────────────────────────────
+
+def candidaturas(base: Path, secao: str, depois_de: int = 0):
+    """
+    Gera (id, recebida, respostas) por ordem de id, LINHAS_POR_LEITURA de cada
+    vez. Uma só consulta, por isso uma só fotografia da base, mesmo com o
+    servidor a gravar ao mesmo tempo (WAL). Nas secções de projeto só entram
+    as candidaturas que responderam a alguma pergunta dessa secção.
+    """
+    conexao = sqlite3.connect(f"file:{base}?mode=ro", uri=True)
+    try:
+        consulta = "SELECT id, recebida, respostas FROM candidaturas WHERE id > ?"
+        parametros = [depois_de]
+        if secao != BASICAS:
+            # pré-filtro barato no SQLite; a confirmação é feita nas chaves do JSON
+            consulta += " AND instr(respostas, ?) > 0"
+            parametros.append(f'"{secao}_')
+        cursor = conexao.execute(consulta + " ORDER BY id", parametros)
+        while lote := cursor.fetchmany(LINHAS_POR_LEITURA):
+            for candidatura_id, recebida, texto in lote:
+                respostas = json.loads(texto)
+                if secao == BASICAS or any(k.startswith(f"{secao}_") for k in respostas):
+                    yield candidatura_id, recebida, respostas
+    finally:
+        conexao.close()
+
+
+# ──────────────────────────────────────────────────────────────
+# ESCRITA
+# ──────────────────────────────────────────────────────────────
+
+def cabecalho_existente(caminho: Path) -> list[str] | None:
+    """Primeira linha de um CSV já exportado (None se o ficheiro não existir ou estiver vazio)."""
+    try:
+        with caminho.open(encoding="utf-8-sig", newline="") as f:
+            return next(csv.reader(f), None)
+    except FileNotFoundError:
+        return None
+
+
+def exportar(secao: str, formato: str, destino: Path | None, base: Path = BASE_DADOS,
+             regras: dict[str, dict] | None = None, novas: bool = False, com_basicas: bool = True) -> tuple[int, int]:
+    """
+    Escreve as candidaturas em `destino` (stdout se None) e devolve
+    (linhas escritas, id da última). Com `novas`, começa depois da última
+    exportação para o mesmo destino e acrescenta ao ficheiro.
+    """
+    perguntas = perguntas_exportadas(secao, regras or regras_do_formulario(), com_basicas)
+    nomes = colunas(perguntas)
+    chave = f"{secao}:{destino or '-'}"
+    acrescentar = novas and destino is not None and destino.exists() and destino.stat().st_size > 0
+    # o cursor só vale se as linhas anteriores ainda lá estão (ou para o stdout);
+    # um ficheiro apagado ou vazio recebe a exportação completa
+    continuar = acrescentar or (novas and destino is None)
+    depois_de = carregar_cursores().get(chave, {}).get("ultimo_id", 0) if continuar else 0
+
+    if acrescentar and formato == "csv" and cabecalho_existente(destino) != nomes:
+        raise ValueError(f"As colunas de {destino} já não são as do formulário — faz uma exportação completa.")
+
+    if destino is None:
+        saida = sys.stdout
+        tamanho_inicial = None
+    else:
+        # o Excel só reconhece UTF-8 com BOM; ao acrescentar o BOM já lá está
+        saida = destino.open("a" if acrescentar else "w", newline="",
+                             encoding="utf-8" if acrescentar or formato != "csv" else "utf-8-sig")
+        tamanho_inicial = destino.stat().st_size if acrescentar else 0
+
+    linhas, ultimo_id = 0, depois_de
+    try:
+        escritor = csv.writer(saida) if formato == "csv" else None
+        if escritor and not acrescentar:
+            escritor.writerow(nomes)
+        for candidatura_id, recebida, respostas in candidaturas(base, secao, depois_de):
+            linha = achatar(candidatura_id, recebida, respostas, perguntas)
+            if escritor:
+                escritor.writerow(sem_formulas(linha))
+            else:
+                saida.write(json.dumps(dict(zip(nomes, linha)), ensure_ascii=False) + "\n")
+            linhas += 1
+            ultimo_id = candidatura_id
+        saida.flush()
+        if destino is not None:
+            os.fsync(saida.fileno())
+    except BaseException:
+        if destino is not None:
+            # não deixar meia exportação: o cursor não avançou, a próxima repete-a
+            saida.truncate(tamanho_inicial)
+        raise
+    finally:
+        if destino is not None:
+            saida.close()
+
+    gravar_cursor(chave, ultimo_id, linhas)
+    return linhas, ultimo_id
+
+
+# ──────────────────────────────────────────────────────────────
+# MAIN
+# ──────────────────────────────────────────────────────────────
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Exporta as candidaturas de uma secção para CSV ou JSONL.")
+    parser.add_argument("secao", choices=PREFIXOS, help="secção do formulário")
+    parser.add_argument("-o", "--saida", default=None,
+                        help="ficheiro de destino ('-' para o stdout; por omissão, candidaturas-SECAO.FORMATO)")
+    parser.add_argument("-f", "--formato", choices=FORMATOS, default=None,
+                        help="por omissão, o da extensão da saída (ou csv)")
+    parser.add_argument("--novas", action="store_true",
+                        help="só as candidaturas desde a última exportação para o mesmo ficheiro")
+    parser.add_argument("--sem-basicas", action="store_true",
+                        help="nas secções de projeto, não incluir as informações básicas")
+    parser.add_argument("--base", type=Path, default=BASE_DADOS, help=f"base SQLite (por omissão, {BASE_DADOS})")
+    parser.add_argument("--esquema", type=Path, default=None,
+                        help="esquema das perguntas (por omissão, o do recrutamento.py ou o próprio HTML)")
+    args = parser.parse_args(argv)
+
+    formato = args.formato
+    if formato is None:
+        sufixo = Path(args.saida).suffix.lstrip(".").lower() if args.saida not in (None, "-") else ""
+        formato = sufixo if sufixo in FORMATOS else "csv"
+    destino = None if args.saida == "-" else Path(args.saida or f"candidaturas-{args.secao}.{formato}")
+
+    if not args.base.exists():
+        print(f"❌ Base {args.base} não encontrada.", file=sys.stderr)
+        return 1
+    try:
+        regras = regras_do_formulario(args.esquema)
+        linhas, ultimo_id = exportar(args.secao, formato, destino, args.base, regras,
+                                     novas=args.novas, com_basicas=not args.sem_basicas)
+    except (OSError, ValueError, RuntimeError, sqlite3.Error) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    if destino is not None:
+        print(f"✅ {linhas} candidatura(s) {'nova(s) ' if args.novas else ''}exportada(s) para {destino} "
+              f"(até à #{ultimo_id}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,17 +4,47 @@
 ║  Compatível com o novo sistema de páginas individuais        ║
 ║                                                              ║
 ║  Ficheiros geridos:                                          ║
+║    atividades.json        — dados de todas as atividades     ║
+║    .diario-operacoes.jsonl — histórico p/ desfazer/refazer   ║
 ║    activities.html        — lista de atividades              ║
 ║    atividade-<id>.html    — página de cada atividade         ║
+║    arquivo-<ano>.html     — passadas dos anos anteriores     ║
+║    activities(-index).json — feed e índice da pesquisa       ║
+║    atividade-template.html — template das páginas (leitura)  ║
 ║    css/activity-page.css  — (não alterado pelo script)       ║
 ╚══════════════════════════════════════════════════════════════╝
 """
 
+import argparse
+import csv
+import hashlib
+import json
+import os
 import re
-import shutil
+import sys
+import threading
+import time
+import unicodedata
+import urllib.error
+import urllib.request
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime
-from turtle import pos
+from datetime import date, datetime
+from html import unescape
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import fcntl
+except ImportError:         # Windows
+    fcntl = None
+    import msvcrt
+
+import comprimir_estaticos
+import instrumentacao
+import minificar_html
+import versionar_assets
 
 
 # ──────────────────────────────────────────────────────────────
@@ -22,38 +52,45 @@ from turtle import pos
 # ──────────────────────────────────────────────────────────────
 ACTIVITIES_HTML   = "activities.html"        # ficheiro da lista
 TEMPLATE_HTML     = "atividade-template.html" # template de cada atividade
+DADOS_JSON        = "atividades.json"        # fonte de verdade das atividades
+ASSETS_MANIFESTO  = "assets-manifest.json"   # gerado por versionar_assets.py
+FEED_JSON         = "activities.json"        # feed público usado pela pesquisa
+INDICE_PESQUISA   = "activities-index.json"  # índice invertido da pesquisa
+
+# Os HTML escritos pelo gestor saem minificados (NUAR_SEM_MINIFICAR=1 ou --sem-minificar para desligar)
+MINIFICAR_HTML    = os.environ.get("NUAR_SEM_MINIFICAR") != "1"
 
 # Marcadores no activities.html
 MARKER_UPCOMING  = "<!-- ATIVIDADES_POR_VIR_MARKER -->"
 MARKER_PAST      = "<!-- ATIVIDADES_PASSADAS_MARKER -->"
 
-# SVGs reutilizáveis (mesmos do HTML)
-SVG_CALENDAR = """<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                                    <rect x="3" y="4" width="18" height="18" rx="2" ry="2"/>
-                                    <line x1="16" y1="2" x2="16" y2="6"/><line x1="8" y1="2" x2="8" y2="6"/><line x1="3" y1="10" x2="21" y2="10"/>
-                                </svg>"""
+# Fim de cada zona gerada (tudo entre MARKER e FIM é reescrito a partir dos dados)
+FIM_UPCOMING     = "<!-- ATIVIDADES_POR_VIR_FIM -->"
+FIM_PAST         = "<!-- ATIVIDADES_PASSADAS_FIM -->"
 
-SVG_CLOCK = """<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                                    <circle cx="12" cy="12" r="10"/><polyline points="12 6 12 12 16 14"/>
-                                </svg>"""
+SECOES = {
+    "upcoming": (MARKER_UPCOMING, FIM_UPCOMING),
+    "past":     (MARKER_PAST, FIM_PAST),
+}
 
-SVG_PIN = """<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                                    <path d="M21 10c0 7-9 13-9 13s-9-6-9-13a9 9 0 0 1 18 0z"/><circle cx="12" cy="10" r="3"/>
-                                </svg>"""
+# Arquivo das passadas: activities.html só mostra as do ano mais recente,
+# as dos anos anteriores vão para uma página por ano
+ARQUIVO_HTML     = "arquivo-{ano}.html"
+MARKER_OMITIR    = "<!-- ARQUIVO_OMITIR -->"        # bloco "por vir", que o arquivo não tem
+FIM_OMITIR       = "<!-- ARQUIVO_OMITIR_FIM -->"
+MARKER_PAGINACAO = "<!-- ARQUIVO_PAGINACAO -->"     # links para os outros anos
+FIM_PAGINACAO    = "<!-- ARQUIVO_PAGINACAO_FIM -->"
 
-SVG_PEOPLE = """<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                                    <path d="M17 21v-2a4 4 0 0 0-4-4H5a4 4 0 0 0-4 4v2"/>
-                                    <circle cx="9" cy="7" r="4"/>
-                                    <path d="M23 21v-2a4 4 0 0 0-3-3.87"/><path d="M16 3.13a4 4 0 0 1 0 7.75"/>
-                                </svg>"""
+# Ícones: um só sprite (images/icones.svg, em cache no browser) referenciado
+# com <use>, em vez de repetir o SVG completo em cada card
+ICONES_SVG = "images/icones.svg"
 
-SVG_ARROW_LEFT = """<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2.5" stroke-linecap="round" stroke-linejoin="round">
-                    <line x1="19" y1="12" x2="5" y2="12"/><polyline points="12 19 5 12 12 5"/>
-                </svg>"""
-
-SVG_ARROW_RIGHT = """<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2.5" stroke-linecap="round" stroke-linejoin="round">
-                        <line x1="5" y1="12" x2="19" y2="12"/><polyline points="12 5 19 12 12 19"/>
-                    </svg>"""
+SVG_CALENDAR    = f'<svg viewBox="0 0 24 24" aria-hidden="true"><use href="{ICONES_SVG}#icon-calendar"/></svg>'
+SVG_CLOCK       = f'<svg viewBox="0 0 24 24" aria-hidden="true"><use href="{ICONES_SVG}#icon-clock"/></svg>'
+SVG_PIN         = f'<svg viewBox="0 0 24 24" aria-hidden="true"><use href="{ICONES_SVG}#icon-pin"/></svg>'
+SVG_PEOPLE      = f'<svg viewBox="0 0 24 24" aria-hidden="true"><use href="{ICONES_SVG}#icon-people"/></svg>'
+SVG_ARROW_LEFT  = f'<svg viewBox="0 0 24 24" aria-hidden="true"><use href="{ICONES_SVG}#icon-arrow-left"/></svg>'
+SVG_ARROW_RIGHT = f'<svg viewBox="0 0 24 24" aria-hidden="true"><use href="{ICONES_SVG}#icon-arrow-right"/></svg>'
 
 
 # ──────────────────────────────────────────────────────────────
@@ -79,6 +116,11 @@ def drive_url_para_thumbnail(url: str, tamanho: str = "w1000") -> str:
     return url
 
 
+def foto_da_url(url: str) -> dict:
+    """Entrada da galeria a partir de um link/ID do Google Drive."""
+    return {"url": url, "thumbnail": drive_url_para_thumbnail(url, "w800")}
+
+
 def ler_ficheiro(caminho: str) -> str | None:
     try:
         return Path(caminho).read_text(encoding='utf-8')
@@ -87,20 +129,333 @@ def ler_ficheiro(caminho: str) -> str | None:
         return None
 
 
-def escrever_ficheiro(caminho: str, conteudo: str) -> bool:
-    try:
-        Path(caminho).write_text(conteudo, encoding='utf-8')
+def conteudo_final(caminho: str, conteudo: str) -> str:
+    """O que vai efetivamente para o disco (HTML minificado)."""
+    if MINIFICAR_HTML and caminho.endswith(".html"):
+        return minificar_html.minificar(conteudo)
+    return conteudo
+
+
+def escrever_ficheiro(caminho: str, conteudo: str, entradas: str | None = None) -> bool:
+    """
+    Escreve o ficheiro só se o conteúdo mudou (o mtime dos ficheiros iguais
+    mantém-se). `entradas` é o hash dos dados que o geraram, guardado no
+    manifesto para que render futuros possam ser saltados.
+    """
+    conteudo = conteudo_final(caminho, conteudo)
+    h = hash_texto(conteudo)
+    if ficheiro_tem_hash(caminho, h):
+        registar_no_manifesto(caminho, h, entradas)
+        RELATORIO_BUILD["inalterados"].append(caminho)
         return True
+    try:
+        escrever_atomico(caminho, conteudo)
     except Exception as e:
         print(f"\n❌ Erro ao escrever '{caminho}': {e}")
         return False
+    registar_no_manifesto(caminho, h, entradas)
+    RELATORIO_BUILD["escritos"].append(caminho)
+    return True
+
+
+def escrever_atomico(caminho: str, conteudo: str):
+    """
+    Escreve num ficheiro temporário ao lado e troca-lhe o nome: quem lê vê
+    o ficheiro antigo ou o novo, nunca um a meio (mesmo que o script morra).
+    """
+    destino = Path(caminho)
+    temporario = destino.with_name(f".{destino.name}.{os.getpid()}.tmp")
+    try:
+        with open(temporario, "w", encoding="utf-8") as f:
+            f.write(conteudo)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, destino)
+    except BaseException:
+        temporario.unlink(missing_ok=True)
+        raise
+
+
+def apagar_pagina(pagina: str) -> bool:
+    """Apaga uma página gerada (e o que o build sabe dela); False se não existia."""
+    esquecer_no_manifesto(pagina)
+    comprimir_estaticos.apagar_variantes(pagina)
+    p = Path(pagina)
+    if not p.exists():
+        return False
+    p.unlink()
+    return True
+
+
+# ──────────────────────────────────────────────────────────────
+# TRINCO DO EDITOR (um gestor a alterar o site de cada vez)
+# ──────────────────────────────────────────────────────────────
+# Trinco consultivo num ficheiro ao lado dos dados: se dois membros
+# correrem o script ao mesmo tempo, o segundo espera que o primeiro acabe
+# em vez de gravar por cima. O sistema liberta-o se o processo morrer.
+
+TRINCO = ".gestor.lock"
+_trinco = {"ficheiro": None, "nivel": 0}
+
+
+def _trancar(f, esperar: bool) -> bool:
+    try:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX | (0 if esperar else fcntl.LOCK_NB))
+            return True
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                return True
+            except OSError:
+                if not esperar:
+                    raise
+                time.sleep(0.2)
+    except OSError:
+        return False
+
+
+def _destrancar(f):
+    if fcntl:
+        fcntl.flock(f, fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def trinco_do_editor():
+    """Reentrante: só o bloco mais exterior tranca e destranca."""
+    global _manifesto, _manifesto_alterado
+    if _trinco["nivel"] == 0:
+        f = open(TRINCO, "a+")
+        if not _trancar(f, esperar=False):
+            print("\n⏳ Outro gestor está a alterar o site — à espera que termine…")
+            _trancar(f, esperar=True)
+        _trinco["ficheiro"] = f
+        # o outro gestor pode ter mudado o manifesto entretanto
+        _manifesto, _manifesto_alterado = None, False
+    _trinco["nivel"] += 1
+    try:
+        yield
+    finally:
+        _trinco["nivel"] -= 1
+        if _trinco["nivel"] == 0:
+            f = _trinco["ficheiro"]
+            _trinco["ficheiro"] = None
+            _destrancar(f)
+            f.close()
+
+
+# ──────────────────────────────────────────────────────────────
+# CACHE DE BUILD (manifesto de hashes)
+# ──────────────────────────────────────────────────────────────
+# Para cada ficheiro gerado guarda o hash do conteúdo, o hash das entradas
+# (registo da atividade + versão do gerador) e o mtime/tamanho com que
+# ficou no disco. Se o ficheiro não foi mexido desde então, o manifesto
+# basta para saber que está atualizado, sem o ler.
+
+MANIFESTO_JSON = ".build-manifest.json"
+
+_manifesto: dict | None = None
+_manifesto_alterado = False
+_assinatura_gerador: str | None = None
+
+RELATORIO_BUILD = {"escritos": [], "inalterados": [], "saltados": []}
 
 
-def fazer_backup(caminho: str):
-    """Cria um backup .bak antes de qualquer alteração."""
-    src = Path(caminho)
-    if src.exists():
-        shutil.copy2(src, src.with_suffix('.bak'))
+def hash_texto(texto: str) -> str:
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+def assinatura_gerador() -> str:
+    """
+    Hash do próprio script e do minificador, mais as opções que mudam o HTML
+    escrito: mudar qualquer um deles invalida todas as páginas.
+    """
+    global _assinatura_gerador
+    if _assinatura_gerador is None:
+        fontes = Path(__file__).read_bytes() + Path(minificar_html.__file__).read_bytes()
+        _assinatura_gerador = hashlib.sha256(fontes).hexdigest()
+    # as opções leem-se a cada chamada: o main() só as acerta depois do import
+    return f"{_assinatura_gerador}|minificar={MINIFICAR_HTML}|espelhar={ESPELHAR_DRIVE}|drive={DRIVE_BASE_URL}"
+
+
+def hash_entradas(atividade: dict) -> str:
+    return hash_texto(assinatura_gerador() + hash_template() + hash_mapa_assets()
+                      + json.dumps(atividade, sort_keys=True, ensure_ascii=False))
+
+
+def carregar_manifesto() -> dict:
+    global _manifesto
+    if _manifesto is None:
+        try:
+            _manifesto = json.loads(Path(MANIFESTO_JSON).read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            _manifesto = {}
+    return _manifesto
+
+
+def _stat_igual(caminho: str, registo: dict) -> bool:
+    try:
+        st = Path(caminho).stat()
+    except FileNotFoundError:
+        return False
+    return st.st_mtime_ns == registo.get("mtime_ns") and st.st_size == registo.get("tamanho")
+
+
+def ficheiro_tem_hash(caminho: str, h: str) -> bool:
+    """O ficheiro no disco tem exatamente este conteúdo?"""
+    registo = carregar_manifesto().get(caminho)
+    if registo and _stat_igual(caminho, registo):
+        return registo["hash"] == h
+    try:
+        return hash_texto(Path(caminho).read_text(encoding='utf-8')) == h
+    except (FileNotFoundError, UnicodeDecodeError):
+        return False
+
+
+def atualizado_para(caminho: str, entradas: str) -> bool:
+    """O ficheiro foi gerado a partir destas entradas e não mudou desde então?"""
+    registo = carregar_manifesto().get(caminho)
+    return bool(registo) and registo.get("entradas") == entradas and _stat_igual(caminho, registo)
+
+
+def registar_no_manifesto(caminho: str, h: str, entradas: str | None = None):
+    global _manifesto_alterado
+    st = Path(caminho).stat()
+    novo = {"hash": h, "entradas": entradas, "mtime_ns": st.st_mtime_ns, "tamanho": st.st_size}
+    manifesto = carregar_manifesto()
+    if manifesto.get(caminho) != novo:
+        manifesto[caminho] = novo
+        _manifesto_alterado = True
+
+
+def esquecer_no_manifesto(caminho: str):
+    global _manifesto_alterado
+    if carregar_manifesto().pop(caminho, None) is not None:
+        _manifesto_alterado = True
+
+
+def concluir_build(mostrar: bool = True):
+    """Grava o manifesto (se mudou) e mostra o que foi realmente escrito."""
+    global _manifesto_alterado
+    if _manifesto_alterado:
+        escrever_atomico(MANIFESTO_JSON, json.dumps(_manifesto, ensure_ascii=False, indent=1, sort_keys=True) + "\n")
+        _manifesto_alterado = False
+
+    escritos, inalterados, saltados = (RELATORIO_BUILD[k] for k in ("escritos", "inalterados", "saltados"))
+    # se o site já tem versões .gz/.br, as dos ficheiros escritos não podem ficar desatualizadas
+    if escritos and comprimir_estaticos.CACHE.exists():
+        comprimir_estaticos.comprimir(escritos, mostrar=False)
+    if mostrar and (escritos or inalterados or saltados):
+        print(f"\n📦 Build: {len(escritos)} escrito(s), "
+              f"{len(inalterados) + len(saltados)} sem alterações")
+        for caminho in escritos:
+            print(f"   ✎ {caminho}")
+    for lista in RELATORIO_BUILD.values():
+        lista.clear()
+
+
+# ──────────────────────────────────────────────────────────────
+# ESPELHO LOCAL DAS THUMBNAILS DO GOOGLE DRIVE (opcional)
+# ──────────────────────────────────────────────────────────────
+# Com o espelho ativo, cada thumbnail do Drive é descarregada uma vez para
+# images/drive/<hash do conteúdo>.<ext> e os cards/galerias passam a usar a
+# cópia local. indice.json liga "<id do Drive>|<tamanho>" ao ficheiro local,
+# por isso IDs já espelhados nunca voltam a ser pedidos.
+
+ESPELHO_DIR     = "images/drive"
+ESPELHO_INDICE  = "images/drive/indice.json"
+ESPELHAR_DRIVE  = os.environ.get("NUAR_ESPELHAR_DRIVE") == "1"
+DRIVE_BASE_URL  = os.environ.get("NUAR_DRIVE_BASE_URL", "https://drive.google.com")
+
+_RE_THUMB_DRIVE = re.compile(r'^https://drive\.google\.com/thumbnail\?id=([^&]+)&sz=(\w+)$')
+_EXT_IMAGEM     = {"image/jpeg": ".jpg", "image/png": ".png", "image/webp": ".webp", "image/gif": ".gif"}
+
+_indice_espelho: dict | None = None
+
+
+def carregar_indice_espelho() -> dict:
+    global _indice_espelho
+    if _indice_espelho is None:
+        try:
+            _indice_espelho = json.loads(Path(ESPELHO_INDICE).read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            _indice_espelho = {}
+    return _indice_espelho
+
+
+def _chave_espelho(url: str) -> str | None:
+    m = _RE_THUMB_DRIVE.match(url or "")
+    return f"{m.group(1)}|{m.group(2)}" if m else None
+
+
+def descarregar_thumbnail(chave: str) -> str | None:
+    """Descarrega uma thumbnail e grava-a pelo hash do conteúdo; devolve o caminho local."""
+    drive_id, tamanho = chave.split("|")
+    url = f"{DRIVE_BASE_URL}/thumbnail?id={drive_id}&sz={tamanho}"
+    try:
+        with urllib.request.urlopen(url, timeout=20) as resposta:
+            tipo = resposta.headers.get_content_type()
+            corpo = resposta.read()
+    except (urllib.error.URLError, OSError) as e:
+        print(f"⚠️  Não foi possível descarregar '{drive_id}': {e}")
+        return None
+    if not tipo.startswith("image/"):
+        print(f"⚠️  '{drive_id}' não devolveu uma imagem ({tipo}) — fica o link do Drive.")
+        return None
+
+    destino = Path(ESPELHO_DIR) / (hashlib.sha256(corpo).hexdigest()[:20] + _EXT_IMAGEM.get(tipo, ".jpg"))
+    if not destino.exists():
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        destino.write_bytes(corpo)
+    return destino.as_posix()
+
+
+def preparar_espelho(atividades) -> int:
+    """Descarrega (em paralelo) as thumbnails ainda não espelhadas destas atividades."""
+    if not ESPELHAR_DRIVE:
+        return 0
+    indice = carregar_indice_espelho()
+    em_falta = {
+        chave
+        for a in atividades
+        for url in [a.get("thumb", "")] + [f.get("thumbnail", "") for f in a.get("fotos", [])]
+        if (chave := _chave_espelho(url)) and not Path(indice.get(chave, "")).is_file()
+    }
+    if not em_falta:
+        return 0
+
+    novas = 0
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for chave, local in zip(em_falta, pool.map(descarregar_thumbnail, em_falta)):
+            if local:
+                indice[chave] = local
+                novas += 1
+    if novas:
+        escrever_atomico(ESPELHO_INDICE, json.dumps(indice, indent=1, sort_keys=True) + "\n")
+        print(f"🪞 {novas} thumbnail(s) do Drive espelhada(s) em {ESPELHO_DIR}/")
+    return novas
+
+
+def url_espelhada(url: str) -> str:
+    chave = _chave_espelho(url)
+    if chave is None:
+        return url
+    local = carregar_indice_espelho().get(chave)
+    return local if local and Path(local).is_file() else url
+
+
+def atividade_para_render(atividade: dict) -> dict:
+    """Cópia do registo com as thumbnails trocadas pelas cópias locais (se ativo)."""
+    if not ESPELHAR_DRIVE:
+        return atividade
+    return dict(
+        atividade,
+        thumb=url_espelhada(atividade.get("thumb", "")),
+        fotos=[dict(f, thumbnail=url_espelhada(f.get("thumbnail", ""))) for f in atividade.get("fotos", [])],
+    )
 
 
 # ──────────────────────────────────────────────────────────────
@@ -116,7 +471,7 @@ def obter_fotos() -> list[dict]:
         url = input(f"\n   Foto {len(fotos) + 1} — URL: ").strip()
         if not url:
             break
-        fotos.append({"url": url, "thumbnail": drive_url_para_thumbnail(url, "w800")})
+        fotos.append(foto_da_url(url))
     return fotos
 
 
@@ -188,11 +543,86 @@ def gerar_card_passado_html(atividade: dict) -> str:
             </div>"""
 
 
-def gerar_pagina_atividade(atividade: dict, template: str) -> str:
+# ──────────────────────────────────────────────────────────────
+# TEMPLATE DAS PÁGINAS (atividade-template.html)
+# ──────────────────────────────────────────────────────────────
+# O template é lido e compilado uma vez: fica como lista alternada
+# [texto, slot, texto, slot, …, texto]. Gerar uma página é só trocar
+# os slots pelos valores e juntar tudo.
+
+SLOTS_TEMPLATE = ("titulo", "thumb", "data", "hora", "local",
+                  "paragrafos", "galeria", "vagas", "cta")
+
+_RE_SLOT = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+_template_cache: tuple[int, list[str], str] | None = None   # (mtime_ns, compilado, hash)
+_mapa_assets_cache: tuple[int, dict, str] | None = None
+
+
+def compilar_template(texto: str) -> list[str]:
+    partes = _RE_SLOT.split(texto)
+    desconhecidos = set(partes[1::2]) - set(SLOTS_TEMPLATE)
+    if desconhecidos:
+        raise ValueError(f"Slots desconhecidos no template: {', '.join(sorted(desconhecidos))}")
+    return partes
+
+
+def carregar_template() -> list[str]:
+    """Template compilado; volta a compilar só se o ficheiro mudou."""
+    global _template_cache
+    mtime = Path(TEMPLATE_HTML).stat().st_mtime_ns
+    if _template_cache is None or _template_cache[0] != mtime:
+        texto = Path(TEMPLATE_HTML).read_text(encoding='utf-8')
+        _template_cache = (mtime, compilar_template(texto), hash_texto(texto))
+    return _template_cache[1]
+
+
+def hash_template() -> str:
+    carregar_template()
+    return _template_cache[2]
+
+
+def carregar_mapa_assets() -> dict:
+    """Mapa original → versão com hash gerado por versionar_assets.py (se existir)."""
+    global _mapa_assets_cache
+    try:
+        mtime = Path(ASSETS_MANIFESTO).stat().st_mtime_ns
+    except FileNotFoundError:
+        _mapa_assets_cache = (0, {}, "")
+        return {}
+    if _mapa_assets_cache is None or _mapa_assets_cache[0] != mtime:
+        texto = Path(ASSETS_MANIFESTO).read_text(encoding='utf-8')
+        _mapa_assets_cache = (mtime, json.loads(texto), hash_texto(texto))
+    return _mapa_assets_cache[1]
+
+
+def com_assets_versionados(html: str) -> str:
+    """css/… e images/… apontam para as versões com hash, se já existirem."""
+    mapa = carregar_mapa_assets()
+    return versionar_assets.reescrever_html(html, mapa) if mapa else html
+
+
+def hash_mapa_assets() -> str:
+    carregar_mapa_assets()
+    return _mapa_assets_cache[2]
+
+
+def preencher_template(compilado: list[str], valores: dict) -> str:
+    partes = compilado[:]
+    partes[1::2] = [valores[nome] for nome in compilado[1::2]]
+    return "".join(partes)
+
+
+def gerar_pagina_atividade(atividade: dict, template: list[str] | str | None = None) -> str:
     """
     Gera o HTML completo da página individual da atividade,
-    substituindo os placeholders do template.
+    preenchendo os slots do template (por omissão, atividade-template.html).
     """
+    if not template:
+        template = carregar_template()
+    elif isinstance(template, str):
+        template = compilar_template(template)
+
     # Parágrafos de descrição
     paragrafos_html = "\n                    ".join(
         f"<p>{p}</p>" for p in atividade.get('paragrafos', ["Descrição em breve."])
@@ -208,31 +638,27 @@ def gerar_pagina_atividade(atividade: dict, template: str) -> str:
         )
         botao_galeria = ""
         if atividade.get('link_galeria'):
-            botao_galeria = f"""
-                        <a href="{atividade['link_galeria']}" class="gallery-all-btn" target="_blank">
-                            Ver todas as fotos
-                            <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                                <path d="M18 13v6a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2V8a2 2 0 0 1 2-2h6"/>
-                                <polyline points="15 3 21 3 21 9"/>
-                                <line x1="10" y1="14" x2="21" y2="3"/>
-                            </svg>
-                        </a>"""
-        secao_galeria = f"""
-                    <!-- Galeria -->
-                    <section class="activity-section">
-                        <h2 class="activity-section-title">Galeria</h2>
-                        <div class="activity-gallery">
-                            {items_galeria}
-                        </div>
-                        {botao_galeria}
-                    </section>"""
+            botao_galeria = f"""<a href="{atividade['link_galeria']}" class="gallery-all-btn" target="_blank">
+                        Ver todas as fotos
+                        <svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
+                            <path d="M18 13v6a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2V8a2 2 0 0 1 2-2h6"/>
+                            <polyline points="15 3 21 3 21 9"/>
+                            <line x1="10" y1="14" x2="21" y2="3"/>
+                        </svg>
+                    </a>"""
+        secao_galeria = f"""<section class="activity-section">
+                    <h2 class="activity-section-title">Galeria</h2>
+                    <div class="activity-gallery">
+                        {items_galeria}
+                    </div>
+                    {botao_galeria}
+                </section>"""
     else:
         secao_galeria = ""
 
     # Vagas (opcional)
     if atividade.get('vagas'):
-        sidebar_vagas = f"""
-                        <div class="sidebar-detail-item">
+        sidebar_vagas = f"""<div class="sidebar-detail-item">
                             <span class="detail-icon">{SVG_PEOPLE}</span>
                             <div>
                                 <span class="sidebar-detail-label">Vagas</span>
@@ -245,395 +671,888 @@ def gerar_pagina_atividade(atividade: dict, template: str) -> str:
     # Botão de inscrição (só para atividades futuras)
     if atividade.get('inscricao_email'):
         assunto = f"Inscrição — {atividade['titulo']}"
-        sidebar_cta = f"""
-                    <a href="mailto:{atividade['inscricao_email']}?subject={assunto}" class="sidebar-cta">
+        sidebar_cta = f"""<a href="mailto:{atividade['inscricao_email']}?subject={assunto}" class="sidebar-cta">
                         Confirmar presença
                         {SVG_ARROW_RIGHT}
                     </a>"""
     else:
         sidebar_cta = ""
 
-    html = f"""<!DOCTYPE html>
-<html lang="pt">
-<head>
-    <link rel="icon" type="image/png" href="images/LogoPequeno_2.png" sizes="45x45">
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>NuAr - {atividade['titulo']}</title>
-    <link rel="stylesheet" href="css/style.css">
-    <link rel="stylesheet" href="css/activity-page.css">
-    <link href="https://fonts.googleapis.com/css2?family=Montserrat:wght@300;400;500;600;700;800&display=swap" rel="stylesheet">
-</head>
-
-<body>
-
-    <!-- ===================== NAVBAR ===================== -->
-    <nav class="navbar" role="navigation" aria-label="Navegação principal">
-        <div class="nav-container">
-            <a href="index.html" class="logo" aria-label="NuAr - Página Inicial">
-                <img src="images/logo_cor.png" alt="NuAr Logo">
-            </a>
-            <button class="hamburger" id="hamburger" aria-label="Abrir menu" aria-expanded="false">
-                <span></span><span></span><span></span>
-            </button>
-            <ul class="nav-menu" id="nav-menu">
-                <li class="nav-item"><a href="index.html" class="nav-link">Início</a></li>
-                <li class="nav-item"><a href="about.html" class="nav-link">Sobre Nós</a></li>
-                <li class="nav-item dropdown" id="dropdown">
-                    <a href="projects.html" class="nav-link dropdown-toggle">Projetos <span class="arrow-down">▼</span></a>
-                    <div class="dropdown-content">
-                        <a href="projeto_astro.html" class="dropdown-item">🚀 ASTRO</a>
-                        <a href="projeto_star.html" class="dropdown-item">🔭 STAR</a>
-                        <a href="projeto_nss.html" class="dropdown-item">🎯 NSS</a>
-                        <a href="projects.html" class="dropdown-item">Ver Todos →</a>
-                    </div>
-                </li>
-                <li class="nav-item"><a href="activities.html" class="nav-link">Atividades</a></li>
-                <li class="nav-item"><a href="educativa.html" class="nav-link">Programa Educativo</a></li>
-                <li class="nav-item"><a href="contacts.html" class="nav-link">Contactos</a></li>
-            </ul>
-            <div class="language-switcher language-switcher-desktop">
-                <svg xmlns="http://www.w3.org/2000/svg" width="18" height="18" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                    <circle cx="12" cy="12" r="10"/><line x1="2" y1="12" x2="22" y2="12"/>
-                    <path d="M12 2a15.3 15.3 0 0 1 4 10 15.3 15.3 0 0 1-4 10 15.3 15.3 0 0 1-4-10 15.3 15.3 0 0 1 4-10z"/>
-                </svg>
-                <span class="lang-divider-mobile"></span>
-                <a href="#" class="lang-link" aria-label="English">EN</a>
-            </div>
-        </div>
-    </nav>
-
-
-    <!-- Hero -->
-    <section class="activity-hero">
-        <img src="{atividade['thumb']}" alt="{atividade['titulo']}" class="activity-hero-img">
-        <div class="activity-hero-overlay"></div>
-        <div class="activity-hero-content">
-            <a href="activities.html" class="activity-back-link">
-                {SVG_ARROW_LEFT}
-                Voltar às atividades
-            </a>
-            <h1 class="activity-hero-title">{atividade['titulo']}</h1>
-        </div>
-    </section>
-
-
-    <!-- Conteúdo -->
-    <main class="activity-main">
-        <div class="activity-container">
-
-            <!-- Corpo -->
-            <div class="activity-body">
-                <section class="activity-section">
-                    <h2 class="activity-section-title">Sobre a atividade</h2>
-                    {paragrafos_html}
-                </section>
-                {secao_galeria}
-            </div>
-
-            <!-- Sidebar -->
-            <aside class="activity-sidebar">
-                <div class="sidebar-card">
-                    <h3 class="sidebar-title">Detalhes</h3>
-                    <div class="sidebar-details">
-                        <div class="sidebar-detail-item">
-                            <span class="detail-icon">{SVG_CALENDAR}</span>
-                            <div>
-                                <span class="sidebar-detail-label">Data</span>
-                                <span class="sidebar-detail-value">{atividade['data']}</span>
-                            </div>
-                        </div>
-                        <div class="sidebar-detail-item">
-                            <span class="detail-icon">{SVG_CLOCK}</span>
-                            <div>
-                                <span class="sidebar-detail-label">Hora</span>
-                                <span class="sidebar-detail-value">{atividade['hora']}</span>
-                            </div>
-                        </div>
-                        <div class="sidebar-detail-item">
-                            <span class="detail-icon">{SVG_PIN}</span>
-                            <div>
-                                <span class="sidebar-detail-label">Local</span>
-                                <span class="sidebar-detail-value">{atividade['local']}</span>
-                            </div>
-                        </div>
-                        {sidebar_vagas}
-                    </div>
-                    {sidebar_cta}
-                </div>
-            </aside>
-
-        </div>
-    </main>
-
-
-    <!-- Lightbox -->
-    <div id="lightbox" class="lightbox" onclick="closeLightbox()">
-        <span class="lightbox-close">&times;</span>
-        <span class="lightbox-arrow lightbox-arrow-left" onclick="event.stopPropagation(); navigateLightbox(-1)">&#10094;</span>
-        <span class="lightbox-arrow lightbox-arrow-right" onclick="event.stopPropagation(); navigateLightbox(1)">&#10095;</span>
-        <div class="lightbox-content" onclick="event.stopPropagation()">
-            <img id="lightbox-img" src="" alt="">
-        </div>
-        <div class="lightbox-counter" id="lightbox-counter"></div>
-    </div>
-
-
-    <script>
-        // Navbar
-        const hamburger = document.getElementById('hamburger');
-        const navMenu   = document.getElementById('nav-menu');
-        const dropdown  = document.getElementById('dropdown');
-        const dropdownToggle = document.querySelector('.dropdown-toggle');
-        hamburger.addEventListener('click', (e) => {{
-            e.stopPropagation();
-            const isOpen = navMenu.classList.toggle('active');
-            hamburger.classList.toggle('active');
-            hamburger.setAttribute('aria-expanded', isOpen);
-        }});
-        if (dropdownToggle) {{
-            dropdownToggle.addEventListener('click', (e) => {{
-                if (window.innerWidth <= 900) {{ e.preventDefault(); dropdown.classList.toggle('active'); }}
-            }});
-        }}
-        document.querySelectorAll('.nav-link:not(.dropdown-toggle)').forEach(n => {{
-            n.addEventListener('click', () => {{
-                hamburger.classList.remove('active');
-                navMenu.classList.remove('active');
-                if (dropdown) dropdown.classList.remove('active');
-            }});
-        }});
-        window.addEventListener('resize', () => {{
-            if (window.innerWidth > 900) {{
-                navMenu.classList.remove('active');
-                hamburger.classList.remove('active');
-                if (dropdown) dropdown.classList.remove('active');
-            }}
-        }});
-        document.addEventListener('click', (e) => {{
-            if (!navMenu.contains(e.target) && !hamburger.contains(e.target)) {{
-                hamburger.classList.remove('active');
-                navMenu.classList.remove('active');
-                if (dropdown) dropdown.classList.remove('active');
-            }}
-        }});
-
-        // Galeria / Lightbox
-        let currentIndex = 0;
-        const galleryItems = document.querySelectorAll('.gallery-item img');
-        galleryItems.forEach((img, i) => img.addEventListener('click', () => openLightbox(i)));
-
-        function openLightbox(index) {{
-            currentIndex = index;
-            const lb = document.getElementById('lightbox');
-            document.getElementById('lightbox-img').src = galleryItems[index].src;
-            document.getElementById('lightbox-counter').textContent = `${{index + 1}} / ${{galleryItems.length}}`;
-            lb.classList.add('active');
-            document.body.style.overflow = 'hidden';
-        }}
-        function closeLightbox() {{
-            document.getElementById('lightbox').classList.remove('active');
-            document.body.style.overflow = '';
-        }}
-        function navigateLightbox(dir) {{
-            currentIndex = (currentIndex + dir + galleryItems.length) % galleryItems.length;
-            openLightbox(currentIndex);
-        }}
-        document.addEventListener('keydown', (e) => {{
-            const lb = document.getElementById('lightbox');
-            if (!lb.classList.contains('active')) return;
-            if (e.key === 'Escape')     closeLightbox();
-            if (e.key === 'ArrowRight') navigateLightbox(1);
-            if (e.key === 'ArrowLeft')  navigateLightbox(-1);
-        }});
-    </script>
-
-</body>
-
-<footer class="footer">
-    <div class="footer-container">
-        <div class="footer-content">
-            <div class="footer-brand">
-                <div class="footer-logo">
-                    <img src="images/logo_branco.png" alt="NuAr Logo">
-                    <img src="images/Logo_AEFCT_CMYK_PNG_horizontal_monocromático.png" alt="AEFCT Logo">
-                </div>
-                <p class="footer-description">Tornamos Aeroespacial acessível a todos!</p>
-                <div class="footer-social">
-                    <a href="https://www.instagram.com/nuarfct/" class="footer-social-link" aria-label="Instagram" target="_blank">
-                        <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                            <rect x="2" y="2" width="20" height="20" rx="5" ry="5"/>
-                            <path d="m16 11.37A4 4 0 1 1 12.63 8 4 4 0 0 1 16 11.37z"/>
-                            <line x1="17.5" y1="6.5" x2="17.51" y2="6.5"/>
-                        </svg>
-                    </a>
-                    <a href="https://www.linkedin.com/company/nuarfct/" class="footer-social-link" aria-label="LinkedIn" target="_blank">
-                        <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round">
-                            <path d="M16 8a6 6 0 0 1 6 6v7h-4v-7a2 2 0 0 0-2-2 2 2 0 0 0-2 2v7h-4v-7a6 6 0 0 1 6-6z"/>
-                            <rect x="2" y="9" width="4" height="12"/>
-                            <circle cx="4" cy="4" r="2"/>
-                        </svg>
-                    </a>
-                </div>
-            </div>
-            <div class="footer-links">
-                <h3>Páginas</h3>
-                <ul>
-                    <li><a href="about.html">Sobre Nós</a></li>
-                    <li><a href="projects.html">Projetos</a></li>
-                    <li><a href="activities.html">Atividades</a></li>
-                    <li><a href="educativa.html">Programa Educativo</a></li>
-                </ul>
-            </div>
-            <div class="footer-links">
-                <h3>Legal</h3>
-                <ul>
-                    <li><a href="TermosServicos.html">Termos de Serviço</a></li>
-                    <li><a href="PoliticaPrivacidade.html">Política de Privacidade</a></li>
-                </ul>
-            </div>
-            <div class="footer-contact">
-                <h3>Contactos</h3>
-                <div class="contact-info">
-                    <p>FCT — Universidade NOVA de Lisboa</p>
-                    <p>2829-516 Caparica, Portugal</p>
-                    <p><a href="mailto:nuar@ae.fct.unl.pt">nuar@ae.fct.unl.pt</a></p>
-                </div>
-            </div>
-        </div>
-        <div class="footer-bottom">
-            <div class="footer-divider"></div>
-            <p class="copyright">© 2026 NuAr - Núcleo de Aeroespacial NOVA FCT. Todos os direitos reservados.</p>
-        </div>
-    </div>
-</footer>
+    html = preencher_template(template, {
+        "titulo":     atividade['titulo'],
+        "thumb":      atividade['thumb'],
+        "data":       atividade['data'],
+        "hora":       atividade['hora'],
+        "local":      atividade['local'],
+        "paragrafos": paragrafos_html,
+        "galeria":    secao_galeria,
+        "vagas":      sidebar_vagas,
+        "cta":        sidebar_cta,
+    })
 
-</html>"""
+    return com_assets_versionados(html)
 
-    return html
+
+# ──────────────────────────────────────────────────────────────
+# CARDS JÁ EXISTENTES NA LISTA (activities.html)
+# ──────────────────────────────────────────────────────────────
+# A lista é sempre regenerada a partir de atividades.json; o índice dos
+# cards só serve para migrar um activities.html antigo para os dados
+# (extrair_atividades_da_lista).
+
+# Tokens relevantes para indexar a lista numa só passagem
+_RE_TOKEN_LISTA = re.compile(
+    r'<div\b(?P<attrs>[^>]*)>|</div\s*>|' + re.escape(MARKER_PAST)
+)
+_RE_ATTR_CLASS = re.compile(r'\bclass="([^"]*)"')
+_RE_ATTR_ID    = re.compile(r'\bid="([^"]*)"')
+
+
+def indexar_cards(conteudo: str) -> dict[str, tuple[int, int, str]]:
+    """
+    Percorre activities.html uma única vez e devolve
+    {id do card: (início, fim, secção)}, com secção 'upcoming' ou 'past'
+    conforme o card esteja antes ou depois de MARKER_PAST.
+    """
+    indice = {}
+    pilha = []          # (id do card ou None, início, secção) por cada <div> aberto
+    secao = "upcoming"
+
+    for m in _RE_TOKEN_LISTA.finditer(conteudo):
+        token = m.group(0)
+        if token == MARKER_PAST:
+            secao = "past"
+        elif token.startswith("</"):
+            if pilha:
+                card_id, inicio, sec = pilha.pop()
+                if card_id is not None:
+                    indice[card_id] = (inicio, m.end(), sec)
+        else:
+            attrs = m.group("attrs")
+            classe = _RE_ATTR_CLASS.search(attrs)
+            card_id = None
+            if classe and "activity-card" in classe.group(1).split():
+                id_attr = _RE_ATTR_ID.search(attrs)
+                card_id = id_attr.group(1) if id_attr else None
+            pilha.append((card_id, m.start(), secao))
+
+    return indice
 
 
 # ──────────────────────────────────────────────────────────────
-# OPERAÇÕES NA LISTA (activities.html)
+# DADOS (atividades.json) — fonte de verdade
 # ──────────────────────────────────────────────────────────────
+# Cada registo guarda as mesmas chaves do dict criado em criar_atividade(),
+# mais "secao" ('upcoming' | 'past'). A ordem do dict é a ordem de inserção:
+# o último registo de cada secção é o primeiro card da lista.
+
+_RE_IMG       = re.compile(r'<img src="([^"]*)"')
+_RE_TITULO    = re.compile(r'<h3 class="activity-title">(.*?)</h3>', re.S)
+_RE_DETALHE   = re.compile(r'<span class="detail-icon">.*?</svg></span>\s*<span>(.*?)</span>', re.S)
+_RE_PARAGRAFO = re.compile(r'<p>(.*?)</p>', re.S)
+_RE_FOTO      = re.compile(r'<div class="gallery-item">\s*<img src="([^"]*)"')
+_RE_GALERIA   = re.compile(r'<a href="([^"]*)" class="gallery-all-btn"')
+_RE_EMAIL     = re.compile(r'<a href="mailto:([^"?]*)\?[^"]*" class="sidebar-cta"')
+
+
+def _valor_sidebar(html: str, label: str) -> str:
+    m = re.search(
+        rf'<span class="sidebar-detail-label">{label}</span>\s*'
+        r'<span class="sidebar-detail-value">(.*?)</span>', html, re.S)
+    return m.group(1).strip() if m else ""
+
+
+def id_da_pagina(pagina: str) -> str:
+    """Aceita 'atividade-<id>.html' ou apenas '<id>' e devolve o id."""
+    nome = Path(pagina.strip()).name
+    if nome.endswith(".html"):
+        nome = nome[:-len(".html")]
+    if nome.startswith("atividade-"):
+        nome = nome[len("atividade-"):]
+    return nome
+
+
+def extrair_atividade_da_pagina(html: str) -> dict:
+    """Recupera descrição, galeria, vagas e inscrição de uma atividade-<id>.html."""
+    sobre = html.find("Sobre a atividade</h2>")
+    fim_sobre = html.find("</section>", sobre)
+    paragrafos = _RE_PARAGRAFO.findall(html[sobre:fim_sobre]) if sobre != -1 else []
+
+    galeria = _RE_GALERIA.search(html)
+    email = _RE_EMAIL.search(html)
+    return {
+        "hora":            _valor_sidebar(html, "Hora"),
+        "vagas":           _valor_sidebar(html, "Vagas"),
+        "paragrafos":      [p.strip() for p in paragrafos] or ["Descrição em breve."],
+        "fotos":           [{"url": f, "thumbnail": f} for f in _RE_FOTO.findall(html)],
+        "link_galeria":    galeria.group(1) if galeria else "",
+        "inscricao_email": email.group(1) if email else "",
+    }
 
-def adicionar_card_na_lista(atividade: dict, secao: str = "upcoming") -> bool:
+
+def extrair_atividades_da_lista(conteudo: str) -> list[dict]:
     """
-    Insere o card da atividade em activities.html.
-    secao: 'upcoming' → Atividades por vir | 'past' → Atividades Passadas
+    Converte os cards já existentes em activities.html em registos.
+    Se a página atividade-<id>.html existir, completa o registo com ela.
+    Devolve pela ordem da lista (primeiro card primeiro).
     """
-    conteudo = ler_ficheiro(ACTIVITIES_HTML)
-    if conteudo is None:
+    registos = []
+    for pagina, (start, end, secao) in sorted(indexar_cards(conteudo).items(),
+                                              key=lambda item: item[1][0]):
+        card = conteudo[start:end]
+        detalhes = [d.strip() for d in _RE_DETALHE.findall(card)]
+        passada = secao == "past" or "activity-card--past" in card[:card.find(">")]
+        img = _RE_IMG.search(card)
+        titulo = _RE_TITULO.search(card)
+
+        registo = {
+            "id":              id_da_pagina(pagina),
+            "titulo":          titulo.group(1).strip() if titulo else "",
+            "data":            detalhes[0] if detalhes else "",
+            "hora":            detalhes[1] if len(detalhes) == 3 else "",
+            "local":           detalhes[-1] if len(detalhes) > 1 else "",
+            "vagas":           "",
+            "thumb":           img.group(1) if img else "",
+            "paragrafos":      ["Descrição em breve."],
+            "fotos":           [],
+            "link_galeria":    "",
+            "inscricao_email": "",
+            "pagina":          pagina,
+        }
+        pagina_html = Path(pagina)
+        if pagina_html.exists():
+            hora_card = registo["hora"]
+            registo.update(extrair_atividade_da_pagina(pagina_html.read_text(encoding='utf-8')))
+            registo["hora"] = registo["hora"] or hora_card
+        registo["secao"] = "past" if passada else "upcoming"
+        registos.append(registo)
+    return registos
+
+
+def carregar_dados() -> dict:
+    """
+    Lê atividades.json. Na primeira execução (ficheiro ainda inexistente)
+    importa os cards que já estão em activities.html, para que a primeira
+    regeneração não perca nenhuma atividade.
+    """
+    caminho = Path(DADOS_JSON)
+    if caminho.exists():
+        return json.loads(caminho.read_text(encoding='utf-8'))
+
+    dados = {"atividades": {}}
+    if Path(ACTIVITIES_HTML).exists():
+        # activities.html e depois o arquivo, do ano mais recente para o mais antigo
+        arquivo = sorted(Path(".").glob(ARQUIVO_HTML.format(ano="*")), reverse=True)
+        registos = []
+        for pagina in [ACTIVITIES_HTML, *arquivo]:
+            registos += extrair_atividades_da_lista(ler_ficheiro(str(pagina)))
+        # a lista mostra o mais recente primeiro → inserir do fim para o início
+        for registo in reversed(registos):
+            dados["atividades"].setdefault(registo["id"], registo)
+        if dados["atividades"]:
+            print(f"\nℹ️  {len(dados['atividades'])} atividade(s) importada(s) de {ACTIVITIES_HTML}"
+                  + (f" e {len(arquivo)} página(s) do arquivo." if arquivo else "."))
+    return dados
+
+
+def gravar_dados(dados: dict, operacao: str | None = "editar") -> bool:
+    """
+    Grava atividades.json. Com `operacao`, regista no diário o que mudou em
+    relação ao ficheiro anterior, para poder ser desfeito.
+    """
+    caminho = Path(DADOS_JSON)
+    anterior = json.loads(caminho.read_text(encoding='utf-8')) if operacao and caminho.exists() else None
+    if not escrever_ficheiro(DADOS_JSON, json.dumps(dados, ensure_ascii=False, indent=2) + "\n"):
         return False
+    if anterior is not None:
+        registar_operacao(operacao, anterior["atividades"], dados["atividades"])
+    return True
+
+
+def guardar_atividade(dados: dict, atividade: dict, secao: str = "upcoming") -> dict:
+    """Insere (ou substitui) o registo, que passa a ser o primeiro da secção."""
+    registo = dict(atividade, secao=secao)
+    dados["atividades"].pop(registo["id"], None)
+    dados["atividades"][registo["id"]] = registo
+    return registo
 
-    marker = MARKER_UPCOMING if secao == "upcoming" else MARKER_PAST
-    if marker not in conteudo:
-        print(f"\n❌ Marcador '{marker}' não encontrado em {ACTIVITIES_HTML}.")
-        return False
 
-    card = gerar_card_html(atividade) if secao == "upcoming" else gerar_card_passado_html(atividade)
+def atividades_da_secao(dados: dict, secao: str) -> list[dict]:
+    """Registos de uma secção, do mais recente para o mais antigo."""
+    return [a for a in reversed(dados["atividades"].values()) if a.get("secao") == secao]
 
-    fazer_backup(ACTIVITIES_HTML)
-    novo = conteudo.replace(marker, marker + card)
-    return escrever_ficheiro(ACTIVITIES_HTML, novo)
 
+# ──────────────────────────────────────────────────────────────
+# DIÁRIO DE OPERAÇÕES (desfazer / refazer)
+# ──────────────────────────────────────────────────────────────
+# Cada gravação de atividades.json acrescenta uma linha ao diário com o
+# estado anterior e o novo das atividades afetadas, e a posição de cada
+# uma na ordem dos dados (a ordem é a ordem da lista). Desfazer e refazer
+# também ficam no diário, que nunca é reescrito: a pilha de operações
+# que se podem desfazer/refazer resulta de o ler do princípio ao fim.
+
+DIARIO_JSONL = ".diario-operacoes.jsonl"
+OPERACOES_HISTORICO = ("desfazer", "refazer")
+
+
+def ler_diario() -> list[dict]:
+    try:
+        with open(DIARIO_JSONL, encoding='utf-8') as f:
+            return [json.loads(linha) for linha in f if linha.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def acrescentar_ao_diario(entradas: list[dict]):
+    n = len(ler_diario())
+    with open(DIARIO_JSONL, "a", encoding='utf-8') as f:
+        for entrada in entradas:
+            n += 1
+            linha = {"n": n, "quando": datetime.now().isoformat(timespec="seconds"), **entrada}
+            f.write(json.dumps(linha, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _ordem_mantida(ids: list[str], posicao: dict) -> set[str]:
+    """Maior subsequência de `ids` que já estava por esta ordem (posições crescentes)."""
+    pontas, fins, anterior = [], [], [None] * len(ids)
+    for k, i in enumerate(ids):
+        j = bisect_left(pontas, posicao[i])
+        if j == len(pontas):
+            pontas.append(posicao[i])
+            fins.append(k)
+        else:
+            pontas[j] = posicao[i]
+            fins[j] = k
+        anterior[k] = fins[j - 1] if j else None
+    mantidos = set()
+    k = fins[-1] if fins else None
+    while k is not None:
+        mantidos.add(ids[k])
+        k = anterior[k]
+    return mantidos
 
-def encontrar_card_na_lista(conteudo: str, pagina: str):
-    marker = f'id="{pagina}"'
-    pos = conteudo.find(marker)
-    if pos == -1:
-        return None, None
 
-    start = conteudo.rfind('<div', 0, pos)
-    if start == -1:
-        return None, None
+def ids_afetados(antes: dict, depois: dict) -> set[str]:
+    """Atividades criadas, apagadas, alteradas ou que mudaram de lugar na ordem."""
+    alterados = {i for i in antes.keys() | depois.keys() if antes.get(i) != depois.get(i)}
+    comuns = [i for i in depois if i in antes and i not in alterados]
+    posicao = {i: k for k, i in enumerate(antes)}
+    return alterados | (set(comuns) - _ordem_mantida(comuns, posicao))
 
-    depth = 0
-    i = start
-    n = len(conteudo)
 
-    while i < n:
-        next_open  = conteudo.find('<div', i)
-        next_close = conteudo.find('</div>', i)
+def estado_de(atividades: dict, ids) -> dict:
+    """{id: [posição na ordem, registo]} (registo None se não existir)."""
+    posicao = {i: k for k, i in enumerate(atividades)}
+    return {i: [posicao.get(i), atividades.get(i)] for i in sorted(ids)}
 
-        if next_open == -1 and next_close == -1:
+
+def repor_estado(atividades: dict, estado: dict) -> dict:
+    """
+    Volta a pôr as atividades de `estado` como estavam. As restantes não
+    mudaram de ordem entre si, por isso basta inseri-las nas posições antigas.
+    """
+    itens = [(i, r) for i, r in atividades.items() if i not in estado]
+    for i, (pos, registo) in sorted(((i, v) for i, v in estado.items() if v[1] is not None),
+                                    key=lambda e: e[1][0]):
+        itens.insert(pos, (i, registo))
+    return dict(itens)
+
+
+def registar_operacao(operacao: str, antes: dict, depois: dict):
+    afetados = ids_afetados(antes, depois)
+    if afetados:
+        acrescentar_ao_diario([{"operacao": operacao, "antes": estado_de(antes, afetados),
+                                "depois": estado_de(depois, afetados)}])
+
+
+def pilhas_do_diario(diario: list[dict]) -> tuple[list[dict], list[dict]]:
+    """(feitas, desfeitas), cada uma com a operação mais recente no fim."""
+    feitas, desfeitas = [], []
+    for entrada in diario:
+        if entrada["operacao"] == "desfazer" and feitas:
+            desfeitas.append(feitas.pop())
+        elif entrada["operacao"] == "refazer" and desfeitas:
+            feitas.append(desfeitas.pop())
+        elif entrada["operacao"] not in OPERACOES_HISTORICO:
+            feitas.append(entrada)
+            desfeitas.clear()
+    return feitas, desfeitas
+
+
+def desfazer_operacoes(vezes: int = 1, refazer: bool = False) -> bool:
+    """Desfaz (ou refaz) as últimas `vezes` operações e regenera o que mudou."""
+    verbo = "refazer" if refazer else "desfazer"
+    dados = carregar_dados()
+    feitas, desfeitas = pilhas_do_diario(ler_diario())
+    pilha = desfeitas if refazer else feitas
+    if not pilha:
+        print(f"\nℹ️  Nada para {verbo}.")
+        return True
+
+    registos = []
+    paginas = {}
+    for _ in range(min(vezes, len(pilha))):
+        entrada = pilha.pop()
+        atual, alvo = (entrada["antes"], entrada["depois"]) if refazer else (entrada["depois"], entrada["antes"])
+        if any(dados["atividades"].get(i) != registo for i, (_, registo) in atual.items()):
+            print(f"\n❌ {DADOS_JSON} foi alterado fora do gestor — não é possível {verbo} "
+                  f"#{entrada['n']} ({entrada['operacao']}).")
             break
+        dados["atividades"] = repor_estado(dados["atividades"], alvo)
+        for i in alvo:
+            paginas[i] = (alvo[i][1] or atual[i][1])["pagina"]
+        registos.append((entrada, {"operacao": verbo, "alvo": entrada["n"]}))
+
+    if not registos:
+        return False
+    if not gravar_dados(dados, operacao=None):
+        return False
+    acrescentar_ao_diario([r for _, r in registos])
 
-        if next_close == -1 or (next_open != -1 and next_open < next_close):
-            depth += 1
-            i = next_open + 4
+    ok = True
+    for i, pagina in paginas.items():
+        if i in dados["atividades"]:
+            ok = renderizar_pagina(dados["atividades"][i]) and ok
         else:
-            depth -= 1
-            i = next_close + 6
-            if depth == 0:
-                return start, i
+            apagar_pagina(pagina)
+    ok = renderizar_lista(dados) and ok
+    for entrada, _ in registos:
+        print(f"{'↪️' if refazer else '↩️'}  #{entrada['n']} {entrada['operacao']} ({entrada['quando']}): "
+              f"{', '.join(entrada['antes'])}")
+    return ok
 
-    return None, None
 
+def mostrar_historico(limite: int = 20):
+    feitas, desfeitas = pilhas_do_diario(ler_diario())
+    if not feitas and not desfeitas:
+        print("\nℹ️  O diário está vazio.")
+        return
+    print()
+    for entrada in (feitas + desfeitas[::-1])[-limite:]:
+        estado = "desfeita" if entrada in desfeitas else "        "
+        print(f"  #{entrada['n']:<4} {entrada['quando']}  {estado}  {entrada['operacao']:<10} "
+              f"{', '.join(entrada['antes'])}")
 
-def remover_card_da_lista(pagina: str) -> bool:
-    """Remove o card com href=pagina de activities.html."""
-    conteudo = ler_ficheiro(ACTIVITIES_HTML)
-    if conteudo is None:
-        return False
 
-    start, end = encontrar_card_na_lista(conteudo, pagina)
-    if start is None:
-        print(f"\n❌ Card '{pagina}' não encontrado na lista.")
-        return False
+# ──────────────────────────────────────────────────────────────
+# ARQUIVO DAS PASSADAS POR ANO (arquivo-<ano>.html)
+# ──────────────────────────────────────────────────────────────
+# Cada página do arquivo é feita a partir do próprio activities.html, sem o
+# bloco "por vir" (ARQUIVO_OMITIR…FIM) e com as passadas desse ano. O hash
+# das entradas de cada ano fica no manifesto de build: mover ou editar uma
+# atividade só reescreve a página do ano onde ela está. Os links entre anos
+# só mudam (em todas as páginas) quando aparece ou desaparece um ano.
+
+def ano_da_atividade(atividade: dict) -> int | None:
+    quando = interpretar_data(atividade.get("data", ""))
+    return quando.year if quando else None
+
+
+def passadas_por_ano(dados: dict) -> tuple[int | None, dict]:
+    """
+    Devolve (ano mais recente, {ano: registos do mais recente para o mais
+    antigo}). As datas que não se reconhecem ficam com o ano mais recente,
+    ou seja, em activities.html.
+    """
+    passadas = atividades_da_secao(dados, "past")
+    anos = {a["id"]: ano_da_atividade(a) for a in passadas}
+    atual = max((ano for ano in anos.values() if ano is not None), default=None)
+    por_ano = {}
+    for atividade in passadas:
+        por_ano.setdefault(anos[atividade["id"]] or atual, []).append(atividade)
+    return atual, por_ano
+
+
+def anos_do_arquivo(por_ano: dict) -> list[int]:
+    return sorted((ano for ano in por_ano if ano is not None), reverse=True)
 
-    fazer_backup(ACTIVITIES_HTML)
-    return escrever_ficheiro(ACTIVITIES_HTML, conteudo[:start] + conteudo[end:])
 
+def pagina_do_ano(ano: int, atual: int | None) -> str:
+    return ACTIVITIES_HTML if ano == atual else ARQUIVO_HTML.format(ano=ano)
 
-def mover_card_para_passadas(pagina: str) -> bool:
+
+def gerar_paginacao_html(anos: list[int], ano_pagina: int | None, atual: int | None) -> str:
+    """Links para as passadas de cada ano (vazio se só houver um ano)."""
+    if len(anos) < 2:
+        return ""
+    links = []
+    for ano in anos:
+        corrente = ' aria-current="page"' if ano == ano_pagina else ""
+        links.append(f"""
+            <a href="{pagina_do_ano(ano, atual)}#pastActivities" class="archive-page-link"{corrente}>{ano}</a>""")
+    return f"""
+        <nav class="archive-pagination" aria-label="Atividades passadas por ano">{"".join(links)}
+        </nav>"""
+
+
+def esqueleto_arquivo(conteudo_lista: str) -> str:
+    """activities.html sem o bloco "por vir" e com as zonas geradas vazias."""
+    a = conteudo_lista.find(MARKER_OMITIR)
+    b = conteudo_lista.find(FIM_OMITIR, a) if a != -1 else -1
+    if b != -1:
+        conteudo_lista = conteudo_lista[:a] + conteudo_lista[b + len(FIM_OMITIR):]
+    for inicio, fim in (SECOES["past"], (MARKER_PAGINACAO, FIM_PAGINACAO)):
+        conteudo_lista = substituir_zona(conteudo_lista, inicio, fim, "") or conteudo_lista
+    return conteudo_lista
+
+
+def gerar_arquivo_html(esqueleto: str, ano: int, cards_html: str, paginacao: str) -> str:
+    html = substituir_zona(esqueleto, MARKER_PAST, FIM_PAST, cards_html)
+    html = substituir_zona(html, MARKER_PAGINACAO, FIM_PAGINACAO, paginacao) or html
+    html = re.sub(r'<title>(.*?)</title>', lambda m: f"<title>{m.group(1)} — {ano}</title>", html, count=1)
+    return html.replace('<h2 class="activities-title">Atividades Passadas</h2>',
+                        f'<h2 class="activities-title">Atividades Passadas — {ano}</h2>', 1)
+
+
+def renderizar_arquivo(dados: dict, conteudo_lista: str, cards: dict | None = None) -> bool:
     """
-    Move o card de #upcomingActivities para #pastActivities em activities.html.
-    Substitui também a classe para activity-card--past.
+    Gera arquivo-<ano>.html para cada ano anterior ao mais recente (saltando
+    os que já estão feitos com estes dados) e apaga os de anos que ficaram vazios.
     """
+    atual, por_ano = passadas_por_ano(dados)
+    anos = anos_do_arquivo(por_ano)
+    esqueleto = esqueleto_arquivo(conteudo_lista)
+    if MARKER_PAST not in esqueleto:
+        return True     # activities.html sem marcadores — o erro já foi mostrado
+
+    base = assinatura_gerador() + hash_mapa_assets() + hash_texto(esqueleto) + json.dumps(anos)
+    ok = True
+    paginas = set()
+    for ano in anos:
+        if ano == atual:
+            continue
+        pagina = ARQUIVO_HTML.format(ano=ano)
+        paginas.add(pagina)
+        registos = por_ano[ano]
+        entradas = hash_texto(base + json.dumps([atividade_para_render(x) for x in registos],
+                                                ensure_ascii=False, sort_keys=True))
+        if atualizado_para(pagina, entradas):
+            RELATORIO_BUILD["saltados"].append(pagina)
+            continue
+        html = gerar_arquivo_html(esqueleto, ano, gerar_cards_html(registos, cards),
+                                  gerar_paginacao_html(anos, ano, atual))
+        ok = escrever_ficheiro(pagina, html, entradas) and ok
+
+    for antiga in Path(".").glob(ARQUIVO_HTML.format(ano="*")):
+        if antiga.name not in paginas:
+            apagar_pagina(antiga.name)
+            print(f"🗑  {antiga.name} removido (ano sem atividades no arquivo).")
+    return ok
+
+
+# ──────────────────────────────────────────────────────────────
+# FEED E ÍNDICE DE PESQUISA (activities.json, activities-index.json)
+# ──────────────────────────────────────────────────────────────
+# O feed tem só o que a pesquisa mostra, pela ordem da lista. O índice tem
+# os termos por ordem alfabética (a pesquisa procura por prefixo) e, para
+# cada termo, as posições no feed. Os termos de cada atividade ficam em
+# cache com o hash dos campos pesquisáveis: ao regenerar só se volta a
+# processar o texto das atividades que mudaram.
+
+CACHE_PESQUISA  = ".cache-pesquisa.json"
+CAMPOS_PESQUISA = ("titulo", "local", "data", "paragrafos")
+CAMPOS_FEED     = ("titulo", "data", "local", "pagina", "secao")
+PALAVRAS_VAZIAS = {"a", "o", "as", "os", "ao", "de", "da", "do", "das", "dos", "e", "em", "na", "no",
+                   "nas", "nos", "um", "uma", "para", "por", "com", "que", "se"}
+
+_RE_TAGS  = re.compile(r'<[^>]+>')
+_RE_TERMO = re.compile(r'[a-z0-9]+')
+
+
+def termos_do_texto(texto: str) -> set[str]:
+    """Palavras sem acentos, em minúsculas, sem HTML nem palavras vazias."""
+    texto = unicodedata.normalize("NFD", unescape(_RE_TAGS.sub(" ", texto)))
+    texto = "".join(c for c in texto if not unicodedata.combining(c)).lower()
+    return {t for t in _RE_TERMO.findall(texto) if len(t) > 1 and t not in PALAVRAS_VAZIAS}
+
+
+def carregar_cache_pesquisa() -> dict:
+    try:
+        return json.loads(Path(CACHE_PESQUISA).read_text(encoding='utf-8'))
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def termos_da_atividade(atividade: dict, cache: dict) -> tuple[list[str], bool]:
+    """Termos da atividade e se foi preciso (re)calculá-los."""
+    campos = {c: atividade.get(c, "") for c in CAMPOS_PESQUISA}
+    h = hash_texto(json.dumps(campos, ensure_ascii=False, sort_keys=True))
+    registo = cache.get(atividade["id"])
+    if registo and registo["hash"] == h:
+        return registo["termos"], False
+    texto = " ".join([campos["titulo"], campos["local"], campos["data"], *campos["paragrafos"]])
+    termos = sorted(termos_do_texto(texto))
+    cache[atividade["id"]] = {"hash": h, "termos": termos}
+    return termos, True
+
+
+def gerar_feed_e_indice(dados: dict) -> tuple[str, str]:
+    cache = carregar_cache_pesquisa()
+    atividades = atividades_da_secao(dados, "upcoming") + atividades_da_secao(dados, "past")
+
+    por_termo = {}
+    processadas = 0
+    for pos, atividade in enumerate(atividades):
+        termos, novo = termos_da_atividade(atividade, cache)
+        processadas += novo
+        for termo in termos:
+            por_termo.setdefault(termo, []).append(pos)
+
+    removidas = [i for i in cache if i not in dados["atividades"]]
+    for i in removidas:
+        del cache[i]
+    if processadas or removidas:
+        escrever_atomico(CACHE_PESQUISA, json.dumps(cache, ensure_ascii=False))
+
+    termos = sorted(por_termo)
+    feed = {"atividades": [{c: a.get(c, "") for c in CAMPOS_FEED} for a in atividades]}
+    # "vazias": a caixa de pesquisa ignora as mesmas palavras que o índice
+    indice = {"termos": termos, "docs": [por_termo[t] for t in termos], "vazias": sorted(PALAVRAS_VAZIAS)}
+    compacto = {"ensure_ascii": False, "separators": (",", ":")}
+    return json.dumps(feed, **compacto), json.dumps(indice, **compacto)
+
+
+def renderizar_pesquisa(dados: dict) -> bool:
+    """Reescreve o feed e o índice (só se mudaram)."""
+    feed, indice = gerar_feed_e_indice(dados)
+    ok = escrever_ficheiro(FEED_JSON, feed)
+    return escrever_ficheiro(INDICE_PESQUISA, indice) and ok
+
+
+# ──────────────────────────────────────────────────────────────
+# REGENERAÇÃO A PARTIR DOS DADOS
+# ──────────────────────────────────────────────────────────────
+
+def gerar_card(atividade: dict) -> str:
+    """Card da lista conforme a secção do registo."""
+    if atividade.get("secao") == "past":
+        return gerar_card_passado_html(atividade)
+    return gerar_card_html(atividade)
+
+
+def substituir_zona(conteudo: str, inicio: str, fim: str, html: str) -> str | None:
+    """Troca o que está entre os marcadores `inicio` e `fim`; None se faltar algum."""
+    a = conteudo.find(inicio)
+    b = conteudo.find(fim, a) if a != -1 else -1
+    if b == -1:
+        return None
+    return conteudo[:a + len(inicio)] + html + "\n            " + conteudo[b:]
+
+
+def gerar_cards_html(registos: list[dict], cards: dict | None = None) -> str:
+    """
+    Cards dos registos, pela ordem dada. `cards` (id → HTML) permite
+    reutilizar cards já gerados noutro processo. Os ícones dos cards usam o
+    mesmo sprite versionado que o resto da página.
+    """
+    return com_assets_versionados("".join(
+        cards[x["id"]] if cards and x["id"] in cards else gerar_card(atividade_para_render(x))
+        for x in registos
+    ))
+
+
+def gerar_lista_html(conteudo: str, dados: dict, cards: dict | None = None) -> str | None:
+    """
+    Reescreve as zonas MARKER…FIM de activities.html com os cards dos dados.
+    Das passadas só entram as do ano mais recente (as outras vão para o arquivo).
+    """
+    atual, por_ano = passadas_por_ano(dados)
+    registos = {
+        "upcoming": atividades_da_secao(dados, "upcoming"),
+        "past":     por_ano.get(atual, []),
+    }
+    for secao, (inicio, fim) in SECOES.items():
+        novo = substituir_zona(conteudo, inicio, fim, gerar_cards_html(registos[secao], cards))
+        if novo is None:
+            print(f"\n❌ Marcadores '{inicio}' / '{fim}' não encontrados em {ACTIVITIES_HTML}.")
+            return None
+        conteudo = novo
+    paginacao = gerar_paginacao_html(anos_do_arquivo(por_ano), atual, atual)
+    return substituir_zona(conteudo, MARKER_PAGINACAO, FIM_PAGINACAO, paginacao) or conteudo
+
+
+def renderizar_lista(dados: dict, cards: dict | None = None) -> bool:
+    if cards is None:
+        preparar_espelho(dados["atividades"].values())
     conteudo = ler_ficheiro(ACTIVITIES_HTML)
     if conteudo is None:
         return False
-
-    # verificar que o card está em upcoming
-    href_marker = f'href="{pagina}"'
-    pos = conteudo.find(href_marker)
-    if pos == -1:
-        print(f"\n❌ Card '{pagina}' não encontrado na lista.")
+    novo = gerar_lista_html(conteudo, dados, cards)
+    if novo is None:
         return False
+    novo = conteudo_final(ACTIVITIES_HTML, novo)
+    ok = renderizar_arquivo(dados, novo, cards)
+    ok = renderizar_pesquisa(dados) and ok
+    if novo == conteudo:
+        RELATORIO_BUILD["inalterados"].append(ACTIVITIES_HTML)
+        return ok
+    return escrever_ficheiro(ACTIVITIES_HTML, novo) and ok
+
+
+def renderizar_pagina(atividade: dict) -> bool:
+    """Gera a página da atividade, a não ser que já esteja feita com estes dados."""
+    preparar_espelho([atividade])
+    atividade = atividade_para_render(atividade)
+    entradas = hash_entradas(atividade)
+    if atualizado_para(atividade['pagina'], entradas):
+        RELATORIO_BUILD["saltados"].append(atividade['pagina'])
+        return True
+    return escrever_ficheiro(atividade['pagina'], gerar_pagina_atividade(atividade), entradas)
 
-    # verificar que está antes do marcador de passadas
-    pos_past_marker = conteudo.find(MARKER_PAST)
-    if pos_past_marker != -1 and pos > pos_past_marker:
-        print(f"\n⚠️  O card '{pagina}' já está em Atividades Passadas.")
-        return False
 
-    # extrair o card
-    start, end = encontrar_card_na_lista(conteudo, pagina)
-    if start is None:
+def regenerar_site() -> bool:
+    """Regenera activities.html e todas as atividade-<id>.html a partir de atividades.json."""
+    dados = carregar_dados()
+    ok = all([renderizar_pagina(a) for a in dados["atividades"].values()])
+    ok = renderizar_lista(dados) and ok
+    if not Path(DADOS_JSON).exists():
+        ok = gravar_dados(dados) and ok
+    return ok
+
+
+# ──────────────────────────────────────────────────────────────
+# RECONSTRUÇÃO COMPLETA EM PARALELO
+# ──────────────────────────────────────────────────────────────
+# Para quando muda algo comum a todas as páginas (nav, footer, template):
+# as páginas e os cards são gerados num pool de processos; o processo
+# principal vai escrevendo os resultados à medida que chegam (saltando
+# ficheiros iguais) e monta activities.html com os cards já prontos.
+
+def _renderizar_atividade(atividade: dict) -> tuple[str, str, str]:
+    """Trabalho de cada processo: (id, HTML da página, HTML do card)."""
+    return atividade["id"], gerar_pagina_atividade(atividade), gerar_card(atividade)
+
+
+def reconstruir_site(processos: int | None = None) -> bool:
+    """Regenera todas as páginas e a lista, usando vários núcleos."""
+    inicio = time.perf_counter()
+    dados = carregar_dados()
+    preparar_espelho(dados["atividades"].values())
+    atividades = [atividade_para_render(a) for a in dados["atividades"].values()]
+    por_id = {a["id"]: a for a in atividades}
+    processos = processos or os.cpu_count() or 1
+
+    if processos > 1 and len(atividades) > 1:
+        lote = max(1, len(atividades) // (processos * 4))
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            resultados = pool.map(_renderizar_atividade, atividades, chunksize=lote)
+            ok, cards = _escrever_resultados(por_id, resultados)
+    else:
+        ok, cards = _escrever_resultados(por_id, map(_renderizar_atividade, atividades))
+
+    ok = renderizar_lista(dados, cards) and ok
+    if not Path(DADOS_JSON).exists():
+        ok = gravar_dados(dados) and ok
+
+    duracao = time.perf_counter() - inicio
+    ritmo = (len(atividades) + 1) / duracao if duracao > 0 else float("inf")
+    print(f"\n⚡ {len(atividades)} página(s) + {ACTIVITIES_HTML} em {duracao:.3f} s "
+          f"({ritmo:.0f} páginas/s, {processos} processo(s))")
+    return ok
+
+
+def _escrever_resultados(por_id: dict, resultados) -> tuple[bool, dict]:
+    ok = True
+    cards = {}
+    for activity_id, html, card in resultados:
+        atividade = por_id[activity_id]
+        ok = escrever_ficheiro(atividade["pagina"], html, hash_entradas(atividade)) and ok
+        cards[activity_id] = card
+    return ok, cards
+
+
+# ──────────────────────────────────────────────────────────────
+# ARQUIVO AUTOMÁTICO (datas em português)
+# ──────────────────────────────────────────────────────────────
+
+MESES = {
+    "jan": 1, "fev": 2, "mar": 3, "abr": 4, "mai": 5, "jun": 6,
+    "jul": 7, "ago": 8, "set": 9, "out": 10, "nov": 11, "dez": 12,
+}
+
+_RE_DATA_EXTENSO = re.compile(r'(\d{1,2})\D*?(?:de\s+)?([a-zç]{3,})\.?\s*(?:de\s+)?(\d{4})')
+_RE_DATA_NUMERICA = re.compile(r'(\d{1,2})[/.-](\d{1,2})[/.-](\d{4})')
+
+
+def interpretar_data(texto: str) -> date | None:
+    """
+    Converte "15 de Março de 2025" (ou "15 Mar 2025", "15/03/2025") numa date.
+    Em intervalos como "14 e 15 de Março de 2025" conta o último dia.
+    """
+    texto = texto.strip().lower()
+    m = _RE_DATA_NUMERICA.search(texto)
+    if m:
+        dia, mes, ano = (int(g) for g in m.groups())
+    else:
+        encontradas = list(_RE_DATA_EXTENSO.finditer(texto))
+        if not encontradas:
+            return None
+        m = encontradas[-1]
+        mes = MESES.get(m.group(2).replace("ç", "c")[:3])
+        if mes is None:
+            return None
+        dia, ano = int(m.group(1)), int(m.group(3))
+    try:
+        return date(ano, mes, dia)
+    except ValueError:
+        return None
+
+
+def arquivar_atividades_passadas(hoje: date | None = None) -> bool:
+    """
+    Move para 'Passadas' todas as atividades por vir cuja data já passou,
+    com uma única escrita dos dados e de activities.html. Sem nada para
+    mover não escreve nada (pensado para correr todas as noites via cron).
+    """
+    hoje = hoje or date.today()
+    dados = carregar_dados()
+
+    expiradas = []
+    for atividade in atividades_da_secao(dados, "upcoming"):
+        quando = interpretar_data(atividade.get("data", ""))
+        if quando is None:
+            print(f"⚠️  Data '{atividade.get('data', '')}' de '{atividade['pagina']}' não reconhecida — ignorada.")
+        elif quando < hoje:
+            expiradas.append((quando, atividade))
+
+    if not expiradas:
+        print("\nℹ️  Nenhuma atividade para arquivar.")
+        return True
+
+    # a mais recente fica no topo de 'Passadas'
+    for _, atividade in sorted(expiradas, key=lambda e: e[0]):
+        guardar_atividade(dados, atividade, secao="past")
+    if not (gravar_dados(dados, "arquivar") and renderizar_lista(dados)):
         return False
 
-    card_html = conteudo[start:end]
+    for quando, atividade in expiradas:
+        print(f"✅ '{atividade['pagina']}' ({quando:%d/%m/%Y}) movida para Atividades Passadas.")
+    return True
 
-    # alterar classe para passada (remove hora do card na lista)
-    card_html = card_html.replace(
-        'class="activity-card"',
-        'class="activity-card activity-card--past"'
+
+# ──────────────────────────────────────────────────────────────
+# IMPORTAÇÃO EM LOTE (sem perguntas)
+# ──────────────────────────────────────────────────────────────
+# Formatos aceites (mesmos campos do formulário):
+#   JSON / YAML — lista de objetos (ou {"atividades": [...]}) com
+#                 titulo, data, hora, local, vagas, foto, paragrafos (lista),
+#                 fotos (lista de links/IDs), link_galeria, inscricao_email, secao
+#   CSV         — uma linha por atividade, mesmas colunas; em "paragrafos"
+#                 e "fotos" os vários valores separam-se por "|"
+# "secao" é 'upcoming' (por omissão) ou 'past'.
+
+CAMPOS_OBRIGATORIOS = ("titulo", "data")
+
+
+def _lista(valor) -> list[str]:
+    if not valor:
+        return []
+    if isinstance(valor, str):
+        valor = valor.split("|")
+    return [str(v).strip() for v in valor if str(v).strip()]
+
+
+def ler_entradas_lote(caminho: str) -> list[dict]:
+    """Lê o ficheiro de importação e devolve uma lista de dicts 'crus'."""
+    path = Path(caminho)
+    sufixo = path.suffix.lower()
+    texto = path.read_text(encoding='utf-8')
+
+    if sufixo == ".csv":
+        return list(csv.DictReader(texto.splitlines()))
+    if sufixo in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise RuntimeError("Para importar YAML instala o PyYAML (pip install pyyaml).")
+        try:
+            entradas = yaml.safe_load(texto)
+        except yaml.YAMLError as e:
+            raise ValueError(f"YAML inválido: {e}")
+    elif sufixo == ".json":
+        entradas = json.loads(texto)
+    else:
+        raise ValueError(f"Formato '{sufixo}' não suportado (usa .csv, .json ou .yaml).")
+
+    if isinstance(entradas, dict):
+        entradas = entradas.get("atividades", [])
+    if entradas and not isinstance(entradas, list):
+        raise ValueError("esperava-se uma lista de atividades (ou {\"atividades\": [...]})")
+    return entradas or []
+
+
+def atividade_da_entrada(entrada: dict) -> tuple[dict, str]:
+    """Converte uma entrada do ficheiro no dict de criar_atividade() + secção."""
+    if not isinstance(entrada, dict):
+        raise ValueError(f"esperava-se um objeto com os campos da atividade, não {type(entrada).__name__}")
+
+    def campo(nome):
+        return str(entrada.get(nome) or "").strip()
+
+    secao = campo("secao") or "upcoming"
+    if secao not in SECOES:
+        raise ValueError(f"secao '{secao}' inválida (usa 'upcoming' ou 'past')")
+    for nome in CAMPOS_OBRIGATORIOS:
+        if not campo(nome):
+            raise ValueError(f"campo '{nome}' em falta")
+
+    atividade = montar_atividade(
+        titulo=campo("titulo"),
+        data=campo("data"),
+        hora=campo("hora"),
+        local=campo("local"),
+        vagas=campo("vagas"),
+        thumb=drive_url_para_thumbnail(campo("foto")),
+        paragrafos=_lista(entrada.get("paragrafos")),
+        fotos=[foto_da_url(url) for url in _lista(entrada.get("fotos"))],
+        link_galeria=campo("link_galeria"),
+        inscricao_email=campo("inscricao_email"),
     )
+    return atividade, secao
+
+
+def importar_lote(caminho: str) -> bool:
+    """
+    Importa todas as atividades do ficheiro de uma só vez: valida tudo primeiro,
+    depois uma escrita de atividades.json, uma página por atividade e uma única
+    leitura / escrita de activities.html.
+    """
+    try:
+        entradas = ler_entradas_lote(caminho)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"\n❌ Não foi possível ler '{caminho}': {e}")
+        return False
 
-    # remover do sítio atual
-    sem_card = conteudo[:start] + conteudo[end:]
+    novas, erros = [], []
+    vistas = {}     # id → nº da entrada: duas entradas com o mesmo id seriam a mesma página
+    for n, entrada in enumerate(entradas, start=1):
+        try:
+            atividade, secao = atividade_da_entrada(entrada)
+        except ValueError as e:
+            erros.append(f"   entrada {n}: {e}")
+            continue
+        if atividade["id"] in vistas:
+            erros.append(f"   entrada {n}: id '{atividade['id']}' repetido (igual ao da entrada {vistas[atividade['id']]})")
+            continue
+        vistas[atividade["id"]] = n
+        novas.append((atividade, secao))
+    if erros:
+        print(f"\n❌ {len(erros)} entrada(s) inválida(s) em '{caminho}' — nada foi alterado:")
+        print("\n".join(erros))
+        return False
 
-    # inserir em passadas
-    if MARKER_PAST not in sem_card:
-        print(f"\n❌ Marcador '{MARKER_PAST}' não encontrado.")
+    dados = carregar_dados()
+    for atividade, secao in novas:
+        guardar_atividade(dados, atividade, secao)
+    if not gravar_dados(dados, "importar"):
         return False
 
-    fazer_backup(ACTIVITIES_HTML)
-    novo = sem_card.replace(MARKER_PAST, MARKER_PAST + "\n" + card_html)
-    ok = escrever_ficheiro(ACTIVITIES_HTML, novo)
+    ok = all([renderizar_pagina(atividade) for atividade, _ in novas])
+    ok = renderizar_lista(dados) and ok
     if ok:
-        print(f"\n✅ Card '{pagina}' movido para Atividades Passadas.")
+        print(f"\n✅ {len(novas)} atividade(s) importada(s) de '{caminho}'.")
     return ok
 
 
@@ -641,6 +1560,29 @@ def mover_card_para_passadas(pagina: str) -> bool:
 # FLUXOS PRINCIPAIS
 # ──────────────────────────────────────────────────────────────
 
+def montar_atividade(titulo: str, data: str, hora: str, local: str, vagas: str,
+                     thumb: str, paragrafos: list[str], fotos: list[dict],
+                     link_galeria: str, inscricao_email: str) -> dict:
+    """Constrói o dict da atividade (usado pelo formulário e pela importação)."""
+    activity_id = criar_id(titulo, data)
+    pagina = f"atividade-{activity_id}.html"
+
+    return {
+        "id":              activity_id,
+        "titulo":          titulo,
+        "data":            data,
+        "hora":            hora,
+        "local":           local,
+        "vagas":           vagas,
+        "thumb":           thumb,
+        "paragrafos":      paragrafos if paragrafos else ["Descrição em breve."],
+        "fotos":           fotos,
+        "link_galeria":    link_galeria,
+        "inscricao_email": inscricao_email,
+        "pagina":          pagina,
+    }
+
+
 def criar_atividade():
     """Formulário interativo para criar uma nova atividade."""
     print("=" * 60)
@@ -670,25 +1612,20 @@ def criar_atividade():
         "\n📧 Email de inscrição (Enter para omitir botão de inscrição): "
     ).strip()
 
-    activity_id = criar_id(titulo, data)
-    pagina = f"atividade-{activity_id}.html"
+    return montar_atividade(titulo, data, hora, local, vagas, thumb,
+                            paragrafos, fotos, link_galeria, email_inscricao)
 
-    atividade = {
-        "id":              activity_id,
-        "titulo":          titulo,
-        "data":            data,
-        "hora":            hora,
-        "local":           local,
-        "vagas":           vagas,
-        "thumb":           thumb,
-        "paragrafos":      paragrafos if paragrafos else ["Descrição em breve."],
-        "fotos":           fotos,
-        "link_galeria": link_galeria,
-        "inscricao_email": email_inscricao,
-        "pagina":          pagina,
-    }
 
-    return atividade
+def alterar_site(operacao, *args):
+    """
+    Corre `operacao` com o trinco e conclui o build. As perguntas ao
+    utilizador ficam de fora: quem está a escrever no menu não faz esperar
+    o cron nem os lotes, só a escrita e o build é que são exclusivos.
+    """
+    with trinco_do_editor():
+        resultado = operacao(*args)
+        concluir_build()
+    return resultado
 
 
 def adicionar_atividade():
@@ -709,15 +1646,23 @@ def adicionar_atividade():
     if confirmar != 's':
         print("Operação cancelada.")
         return
+    alterar_site(gravar_nova_atividade, atividade)
+
 
-    # 1. Criar ficheiro HTML da atividade
-    html = gerar_pagina_atividade(atividade, "")
-    if not escrever_ficheiro(atividade['pagina'], html):
+def gravar_nova_atividade(atividade: dict):
+    # 1. Guardar nos dados
+    dados = carregar_dados()
+    guardar_atividade(dados, atividade, secao="upcoming")
+    if not gravar_dados(dados, "adicionar"):
+        return
+
+    # 2. Criar ficheiro HTML da atividade
+    if not renderizar_pagina(atividade):
         return
     print(f"\n✅ Página criada: {atividade['pagina']}")
 
-    # 2. Adicionar card à lista
-    if adicionar_card_na_lista(atividade, secao="upcoming"):
+    # 3. Regenerar a lista
+    if renderizar_lista(dados):
         print(f"✅ Card adicionado a {ACTIVITIES_HTML}")
     else:
         print(f"⚠️  Não foi possível adicionar o card à lista. Verifica os marcadores em {ACTIVITIES_HTML}.")
@@ -734,8 +1679,22 @@ def mover_para_passadas():
         print(f"\n⚠️  O ficheiro '{pagina}' não existe. Continuas mesmo assim? (s/n): ", end="")
         if input().strip().lower() != 's':
             return
+    alterar_site(mover_atividade, pagina)
+
+
+def mover_atividade(pagina: str):
+    dados = carregar_dados()
+    atividade = dados["atividades"].get(id_da_pagina(pagina))
+    if atividade is None:
+        print(f"\n❌ Atividade '{pagina}' não encontrada em {DADOS_JSON}.")
+        return
+    if atividade["secao"] == "past":
+        print(f"\n⚠️  A atividade '{pagina}' já está em Atividades Passadas.")
+        return
 
-    mover_card_para_passadas(pagina)
+    guardar_atividade(dados, atividade, secao="past")
+    if gravar_dados(dados, "mover") and renderizar_lista(dados):
+        print(f"\n✅ Card '{atividade['pagina']}' movido para Atividades Passadas.")
 
 
 def eliminar_atividade():
@@ -749,22 +1708,191 @@ def eliminar_atividade():
     if confirmar != 's':
         print("Operação cancelada.")
         return
+    alterar_site(apagar_atividade, pagina)
+
 
-    # remover card da lista
-    if remover_card_da_lista(pagina):
-        print(f"✅ Card removido de {ACTIVITIES_HTML}")
+def apagar_atividade(pagina: str):
+    # remover dos dados e regenerar a lista
+    dados = carregar_dados()
+    if dados["atividades"].pop(id_da_pagina(pagina), None) is not None:
+        if gravar_dados(dados, "eliminar") and renderizar_lista(dados):
+            print(f"✅ Card removido de {ACTIVITIES_HTML}")
     else:
-        print(f"⚠️  Card não encontrado em {ACTIVITIES_HTML}. Continuando...")
+        print(f"⚠️  Atividade não encontrada em {DADOS_JSON}. Continuando...")
 
     # apagar ficheiro da atividade
-    p = Path(pagina)
-    if p.exists():
-        p.unlink()
+    if apagar_pagina(pagina):
         print(f"✅ Ficheiro '{pagina}' eliminado.")
     else:
         print(f"⚠️  Ficheiro '{pagina}' não encontrado.")
 
 
+# ──────────────────────────────────────────────────────────────
+# PRÉ-VISUALIZAÇÃO LOCAL (serve --watch)
+# ──────────────────────────────────────────────────────────────
+# Servidor HTTP local com o site. Com --watch, as entradas são observadas
+# (poll do mtime): mudar atividades.json regenera só as atividades
+# afetadas e a lista, mudar o template regenera as páginas, e mudar css/
+# ou images/ não regenera nada. No fim o browser recarrega sozinho: cada
+# HTML servido leva um script que escuta /__recarregar (Server-Sent
+# Events). Em CSS basta trocar as folhas de estilo, sem recarregar a página.
+
+ENTRADAS_OBSERVADAS  = (DADOS_JSON, TEMPLATE_HTML, ASSETS_MANIFESTO, "css", "images")
+INTERVALO_OBSERVACAO = 0.1          # segundos entre cada verificação
+URL_RECARREGAR       = "/__recarregar"
+
+SCRIPT_RECARREGAR = f"""<script>
+new EventSource("{URL_RECARREGAR}").onmessage = (e) => {{
+    if (e.data !== "css") return location.reload();
+    for (const link of document.querySelectorAll('link[rel="stylesheet"]')) {{
+        const url = new URL(link.href);
+        url.searchParams.set("v", Date.now());
+        link.href = url;
+    }}
+}};
+</script>
+"""
+
+_recarregar = {"versao": 0, "tipo": "pagina", "condicao": threading.Condition()}
+
+
+def avisar_browsers(tipo: str):
+    with _recarregar["condicao"]:
+        _recarregar["versao"] += 1
+        _recarregar["tipo"] = tipo
+        _recarregar["condicao"].notify_all()
+
+
+class _PedidosPreVisualizacao(SimpleHTTPRequestHandler):
+    """Serve a pasta do site; os HTML levam o SCRIPT_RECARREGAR antes do </body>."""
+
+    def do_GET(self):
+        caminho = self.path.split("?", 1)[0]
+        if caminho == URL_RECARREGAR:
+            return self._eventos()
+        ficheiro = self.translate_path(caminho)
+        if os.path.isdir(ficheiro):
+            ficheiro = os.path.join(ficheiro, "index.html")
+        if not ficheiro.endswith(".html") or not os.path.isfile(ficheiro):
+            return super().do_GET()
+        conteudo = Path(ficheiro).read_text(encoding='utf-8')
+        corpo = conteudo.replace("</body>", SCRIPT_RECARREGAR + "</body>", 1).encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _eventos(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        condicao = _recarregar["condicao"]
+        with condicao:
+            visto = _recarregar["versao"]
+        try:
+            while True:
+                with condicao:
+                    condicao.wait_for(lambda: _recarregar["versao"] != visto, timeout=15)
+                    versao, tipo = _recarregar["versao"], _recarregar["tipo"]
+                # sem alterações, um comentário mantém a ligação viva (e deteta o fecho)
+                self.wfile.write(f"data: {tipo}\n\n".encode() if versao != visto else b": .\n\n")
+                self.wfile.flush()
+                visto = versao
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def end_headers(self):
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def estado_das_entradas() -> dict[str, int]:
+    """{ficheiro: mtime_ns} de tudo o que é observado (menos o que o próprio build escreve)."""
+    estado = {}
+    for entrada in ENTRADAS_OBSERVADAS:
+        p = Path(entrada)
+        ficheiros = [f for f in p.rglob("*") if f.is_file()] if p.is_dir() else [p]
+        for f in ficheiros:
+            if f.suffix in (".gz", ".br", ".tmp") or f.as_posix().startswith(ESPELHO_DIR + "/"):
+                continue
+            try:
+                estado[f.as_posix()] = f.stat().st_mtime_ns
+            except FileNotFoundError:
+                pass
+    return estado
+
+
+def reconstruir_alteracoes(alterados: set[str], atividades: dict) -> tuple[dict, str]:
+    """
+    Regenera só o que depende dos ficheiros alterados. Recebe as atividades
+    do build anterior e devolve (atividades atuais, tipo de recarregamento).
+    """
+    dados = {"atividades": atividades}
+    if DADOS_JSON in alterados:
+        try:
+            dados = carregar_dados()
+        except ValueError as e:
+            # um editor a meio de gravar, ou um erro de sintaxe: espera pela próxima gravação
+            print(f"⚠️  {DADOS_JSON} inválido ({e}) — à espera de nova gravação.")
+            return atividades, ""
+        for i in ids_afetados(atividades, dados["atividades"]):
+            if i in dados["atividades"]:
+                renderizar_pagina(dados["atividades"][i])
+            elif apagar_pagina(atividades[i]["pagina"]):
+                print(f"🗑  {atividades[i]['pagina']} removida.")
+    if alterados & {TEMPLATE_HTML, ASSETS_MANIFESTO}:
+        for atividade in dados["atividades"].values():
+            renderizar_pagina(atividade)
+    if alterados & {DADOS_JSON, ASSETS_MANIFESTO}:
+        renderizar_lista(dados)
+    tipo = "css" if all(a.endswith(".css") for a in alterados) else "pagina"
+    return dados["atividades"], tipo
+
+
+def servir(porta: int = 8000, endereco: str = "127.0.0.1", observar: bool = False) -> bool:
+    with trinco_do_editor():
+        if not regenerar_site():
+            return False
+        concluir_build()
+    atividades = carregar_dados()["atividades"]
+
+    servidor = ThreadingHTTPServer((endereco, porta), _PedidosPreVisualizacao)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    print(f"\n🌐 Pré-visualização em http://{endereco}:{porta}/{ACTIVITIES_HTML}"
+          + (" — a observar alterações" if observar else "") + " (Ctrl+C para sair)")
+
+    try:
+        estado = estado_das_entradas()
+        while True:
+            time.sleep(INTERVALO_OBSERVACAO if observar else 3600)
+            if not observar:
+                continue
+            novo = estado_das_entradas()
+            alterados = {f for f in novo.keys() | estado.keys() if novo.get(f) != estado.get(f)}
+            estado = novo
+            if not alterados:
+                continue
+            inicio = time.perf_counter()
+            with trinco_do_editor():
+                atividades, tipo = reconstruir_alteracoes(alterados, atividades)
+                escritos = list(RELATORIO_BUILD["escritos"])
+                concluir_build(mostrar=False)
+            if not tipo:
+                continue
+            avisar_browsers(tipo)
+            duracao = (time.perf_counter() - inicio) * 1000
+            print(f"⚡ {', '.join(sorted(alterados))} → {len(escritos)} ficheiro(s) em {duracao:.1f} ms"
+                  + (f" ({', '.join(escritos)})" if escritos else ""))
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+
 # ──────────────────────────────────────────────────────────────
 # MENU PRINCIPAL
 # ──────────────────────────────────────────────────────────────
@@ -777,10 +1905,20 @@ def menu():
         print("  1. ➕  Adicionar nova atividade")
         print("  2. 🔁  Mover atividade para 'Passadas'")
         print("  3. 🗑   Eliminar atividade")
-        print("  4. ❌  Sair")
+        print("  4. 🔄  Regenerar site a partir dos dados")
+        print("  5. 📅  Arquivar atividades já realizadas")
+        print("  6. ↩️   Desfazer a última operação")
+        print("  7. ↪️   Refazer a operação desfeita")
+        print("  8. ❌  Sair")
 
-        opcao = input("\nOpção (1–4): ").strip()
+        opcao = input("\nOpção (1–8): ").strip()
 
+        if opcao == "8":
+            print("\n👋 Até breve!")
+            break
+        # O trinco fica até o build terminar, para outro gestor não escrever
+        # as mesmas páginas ao mesmo tempo; nas opções 1–3 só é apanhado
+        # depois das perguntas (ver alterar_site)
         if opcao == "1":
             adicionar_atividade()
         elif opcao == "2":
@@ -788,15 +1926,125 @@ def menu():
         elif opcao == "3":
             eliminar_atividade()
         elif opcao == "4":
-            print("\n👋 Até breve!")
-            break
+            if alterar_site(regenerar_site):
+                print(f"\n✅ {ACTIVITIES_HTML} e páginas regeneradas a partir de {DADOS_JSON}.")
+        elif opcao == "5":
+            alterar_site(arquivar_atividades_passadas)
+        elif opcao == "6":
+            alterar_site(desfazer_operacoes)
+        elif opcao == "7":
+            alterar_site(desfazer_operacoes, 1, True)
         else:
             print("\n❌ Opção inválida.")
 
 
-if __name__ == "__main__":
+# Etapas medidas com --timings / --profile: {função: (bytes lidos, bytes escritos)}.
+# Com -j > 1 o trabalho feito nos outros processos não é medido.
+ETAPAS_MEDIDAS = {
+    "ler_ficheiro":            (instrumentacao.bytes_do_resultado, None),
+    "escrever_ficheiro":       (None, None),
+    "escrever_atomico":        (None, instrumentacao.bytes_do_argumento(1, "conteudo")),
+    "conteudo_final":          (None, None),
+    "carregar_dados":          (None, None),
+    "gravar_dados":            (None, None),
+    "indexar_cards":           (None, None),
+    "gerar_pagina_atividade":  (None, None),
+    "gerar_card":              (None, None),
+    "renderizar_pagina":       (None, None),
+    "renderizar_lista":        (None, None),
+    "renderizar_arquivo":      (None, None),
+    "renderizar_pesquisa":     (None, None),
+    "preparar_espelho":        (None, None),
+    "concluir_build":          (None, None),
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Sem argumentos abre o menu interativo; com subcomando corre sem perguntas."""
+    global ESPELHAR_DRIVE, DRIVE_BASE_URL, MINIFICAR_HTML
+    parser = argparse.ArgumentParser(description="Gestor de atividades do site NuAr.")
+    parser.add_argument("--espelhar-drive", action="store_true",
+                        help=f"usa cópias locais das thumbnails do Google Drive (em {ESPELHO_DIR}/)")
+    parser.add_argument("--drive-base-url", default=None,
+                        help="servidor de onde descarregar as thumbnails (por omissão, o Google Drive)")
+    parser.add_argument("--sem-minificar", action="store_true",
+                        help="escreve o HTML gerado sem minificar (útil para depurar)")
+    parser.add_argument("--timings", action="store_true",
+                        help="mostra no fim o tempo, as chamadas e os bytes de cada etapa")
+    parser.add_argument("--profile", metavar="FICHEIRO", default=None,
+                        help="grava os tempos de cada etapa em JSON")
+    sub = parser.add_subparsers(dest="comando")
+
+    p_importar = sub.add_parser("importar", help="importa várias atividades de um ficheiro CSV/JSON/YAML")
+    p_importar.add_argument("ficheiro")
+
+    sub.add_parser("regenerar", help="regenera activities.html e as páginas a partir dos dados")
+
+    p_arquivar = sub.add_parser("arquivar", help="move para 'Passadas' as atividades cuja data já passou")
+    p_arquivar.add_argument("--hoje", type=date.fromisoformat, default=None,
+                            help="data de referência AAAA-MM-DD (por omissão, hoje)")
+
+    p_reconstruir = sub.add_parser("reconstruir", aliases=["rebuild-all"],
+                                   help="regenera todas as páginas e a lista em paralelo")
+    p_reconstruir.add_argument("-j", "--processos", type=int, default=None,
+                               help="número de processos (por omissão, um por núcleo)")
+
+    p_desfazer = sub.add_parser("desfazer", help="desfaz as últimas operações (ver 'historico')")
+    p_desfazer.add_argument("-n", type=int, default=1, help="quantas operações (por omissão, 1)")
+    p_refazer = sub.add_parser("refazer", help="refaz operações desfeitas")
+    p_refazer.add_argument("-n", type=int, default=1, help="quantas operações (por omissão, 1)")
+    sub.add_parser("historico", help=f"mostra as últimas operações registadas em {DIARIO_JSONL}")
+
+    p_serve = sub.add_parser("serve", help="servidor local de pré-visualização do site")
+    p_serve.add_argument("--watch", action="store_true",
+                         help="regenera o que mudou e recarrega o browser sozinho")
+    p_serve.add_argument("--porta", type=int, default=8000)
+    p_serve.add_argument("--endereco", default="127.0.0.1")
+
+    args = parser.parse_args(argv)
+    ESPELHAR_DRIVE = ESPELHAR_DRIVE or args.espelhar_drive
+    DRIVE_BASE_URL = (args.drive_base_url or DRIVE_BASE_URL).rstrip("/")
+    MINIFICAR_HTML = MINIFICAR_HTML and not args.sem_minificar
+
+    if args.timings or args.profile:
+        instrumentacao.instrumentar(sys.modules[__name__], ETAPAS_MEDIDAS)
     try:
+        return executar_comando(args, parser)
+    finally:
+        instrumentacao.concluir(args.timings, args.profile)
+
+
+def executar_comando(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    if args.comando is None:
         menu()
+        return 0
+    if args.comando == "historico":
+        mostrar_historico()
+        return 0
+    if args.comando == "serve":
+        # o trinco só é apanhado durante cada reconstrução: o menu pode
+        # continuar a ser usado noutro terminal enquanto se pré-visualiza
+        return 0 if servir(args.porta, args.endereco, args.watch) else 1
+    with trinco_do_editor():
+        if args.comando == "importar":
+            ok = importar_lote(args.ficheiro)
+        elif args.comando == "regenerar":
+            ok = regenerar_site()
+        elif args.comando == "arquivar":
+            ok = arquivar_atividades_passadas(args.hoje)
+        elif args.comando in ("reconstruir", "rebuild-all"):
+            ok = reconstruir_site(args.processos)
+        elif args.comando in ("desfazer", "refazer"):
+            ok = desfazer_operacoes(args.n, refazer=args.comando == "refazer")
+        else:
+            parser.error(f"comando desconhecido: {args.comando}")
+        concluir_build()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
     except KeyboardInterrupt:
         print("\n\n👋 Programa interrompido.")
     except Exception as e:
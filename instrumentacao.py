@@ -0,0 +1,130 @@
+"""
+╔══════════════════════════════════════════════════════════════╗
+║         INSTRUMENTAÇÃO POR ETAPA — NuAr                      ║
+║  Mede, por etapa (ler, escrever, gerar página, …), o tempo,  ║
+║  o número de chamadas e os bytes lidos / escritos, sem       ║
+║  profiler externo. Usado pelo gestor_atividades.py e pelo    ║
+║  recrutamento.py com --timings (resumo no fim) ou            ║
+║  --profile FICHEIRO.json (resultados em JSON).               ║
+║                                                              ║
+║  Desligada não custa nada: as funções só são embrulhadas     ║
+║  quando se chama instrumentar().                             ║
+╚══════════════════════════════════════════════════════════════╝
+"""
+
+import functools
+import json
+import time
+from pathlib import Path
+
+
+# ──────────────────────────────────────────────────────────────
+# REGISTO
+# ──────────────────────────────────────────────────────────────
+# ETAPAS[nome] = {"chamadas", "total", "proprio", "lidos", "escritos"}
+# "total" inclui as etapas chamadas lá dentro; "proprio" desconta-as
+# (o escrever_atomico dentro de escrever_ficheiro aparece nas duas
+# linhas, mas na coluna "próprio" só conta uma vez).
+
+ETAPAS: dict[str, dict] = {}
+_pilha: list[list[float]] = []          # tempo das etapas filhas de cada etapa aberta
+
+
+def _registo(etapa: str) -> dict:
+    return ETAPAS.setdefault(etapa, {"chamadas": 0, "total": 0.0, "proprio": 0.0, "lidos": 0, "escritos": 0})
+
+
+def tamanho(valor) -> int:
+    """Bytes de um str/bytes (0 para outros valores, por exemplo None)."""
+    if isinstance(valor, str):
+        return len(valor.encode('utf-8'))
+    if isinstance(valor, (bytes, bytearray)):
+        return len(valor)
+    return 0
+
+
+def bytes_do_resultado(args, kwargs, resultado) -> int:
+    return tamanho(resultado)
+
+
+def bytes_do_argumento(posicao: int, nome: str):
+    """Bytes do argumento `nome` (na posição `posicao` se for passado por ordem)."""
+    def contar(args, kwargs, resultado) -> int:
+        return tamanho(args[posicao] if len(args) > posicao else kwargs.get(nome))
+    return contar
+
+
+def embrulhar(funcao, etapa: str, lidos=None, escritos=None):
+    """Versão de `funcao` que regista cada chamada em ETAPAS[etapa]."""
+    @functools.wraps(funcao)
+    def medida(*args, **kwargs):
+        _pilha.append([0.0])
+        inicio = time.perf_counter()
+        resultado = None
+        try:
+            resultado = funcao(*args, **kwargs)
+            return resultado
+        finally:
+            duracao = time.perf_counter() - inicio
+            filhas = _pilha.pop()[0]
+            if _pilha:
+                _pilha[-1][0] += duracao
+            registo = _registo(etapa)
+            registo["chamadas"] += 1
+            registo["total"] += duracao
+            registo["proprio"] += duracao - filhas
+            if lidos:
+                registo["lidos"] += lidos(args, kwargs, resultado)
+            if escritos:
+                registo["escritos"] += escritos(args, kwargs, resultado)
+    medida.__wrapped_etapa__ = etapa
+    return medida
+
+
+def instrumentar(modulo, funcoes: dict[str, tuple]):
+    """
+    Troca as funções do módulo pelas versões medidas (cada uma é uma etapa
+    com o próprio nome). `funcoes` é {nome: (bytes lidos, bytes escritos)},
+    cada um None ou uma das funções bytes_do_*. As chamadas dentro do módulo
+    passam a usar as versões medidas, porque procuram o nome no módulo.
+    """
+    for nome, (lidos, escritos) in funcoes.items():
+        funcao = getattr(modulo, nome)
+        if not hasattr(funcao, "__wrapped_etapa__"):
+            setattr(modulo, nome, embrulhar(funcao, nome, lidos, escritos))
+
+
+# ──────────────────────────────────────────────────────────────
+# RELATÓRIO
+# ──────────────────────────────────────────────────────────────
+
+def _kb(n: int) -> str:
+    return f"{n / 1024:.1f} KB" if n else "—"
+
+
+def resumo(titulo: str = "Tempos por etapa") -> str:
+    linhas = [f"\n⏱  {titulo}",
+              f"   {'etapa':30} {'chamadas':>8} {'total ms':>10} {'próprio ms':>11} {'lidos':>10} {'escritos':>10}"]
+    for etapa, r in sorted(ETAPAS.items(), key=lambda e: -e[1]["total"]):
+        linhas.append(f"   {etapa:30} {r['chamadas']:8} {1000 * r['total']:10.1f} {1000 * r['proprio']:11.1f} "
+                      f"{_kb(r['lidos']):>10} {_kb(r['escritos']):>10}")
+    return "\n".join(linhas)
+
+
+def para_json() -> dict:
+    return {etapa: {"chamadas": r["chamadas"], "total_ms": round(1000 * r["total"], 3),
+                    "proprio_ms": round(1000 * r["proprio"], 3),
+                    "bytes_lidos": r["lidos"], "bytes_escritos": r["escritos"]}
+            for etapa, r in ETAPAS.items()}
+
+
+def concluir(mostrar: bool = False, ficheiro_json: str | None = None):
+    """Mostra o resumo e/ou grava o JSON; não faz nada se nada foi medido."""
+    if not ETAPAS:
+        return
+    if mostrar:
+        print(resumo())
+    if ficheiro_json:
+        Path(ficheiro_json).write_text(json.dumps(para_json(), ensure_ascii=False, indent=1) + "\n",
+                                       encoding='utf-8')
+        print(f"\n💾 Tempos gravados em {ficheiro_json}.")
@@ -0,0 +1,111 @@
+"""
+╔══════════════════════════════════════════════════════════════╗
+║         MINIFICADOR DE HTML — NuAr                           ║
+║  Tira a indentação, as linhas em branco e os comentários das ║
+║  páginas. O conteúdo de <script>, <style>, <pre> e           ║
+║  <textarea> fica intacto, tal como os marcadores usados      ║
+║  pelos scripts (<!-- ATIVIDADES_POR_VIR_MARKER --> …).       ║
+║                                                              ║
+║  O gestor_atividades.py usa minificar() em todos os HTML que ║
+║  escreve; correr este script minifica de uma vez as páginas  ║
+║  *.html da raiz.                                             ║
+╚══════════════════════════════════════════════════════════════╝
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+
+# ──────────────────────────────────────────────────────────────
+# CONFIGURAÇÃO
+# ──────────────────────────────────────────────────────────────
+
+# Páginas que são fonte de outras e ficam legíveis
+EXCLUIDAS = {"atividade-template.html"}
+
+# Blocos copiados tal como estão
+_RE_PRESERVAR = re.compile(
+    r'<(script|style|pre|textarea)\b[^>]*>.*?</\1\s*>'
+    r'|<!--\s*[A-Z][A-Z0-9_]*\s*-->'          # marcadores dos scripts
+    r'|<!--\[if.*?<!\[endif\]-->',            # comentários condicionais
+    re.S | re.I,
+)
+_RE_TAG        = re.compile(r'<[^>]*>')
+_RE_COMENTARIO = re.compile(r'<!--.*?-->', re.S)
+_RE_ESPACOS    = re.compile(r'\s+')
+
+
+# ──────────────────────────────────────────────────────────────
+# MINIFICAÇÃO
+# ──────────────────────────────────────────────────────────────
+
+def _espaco(m: re.Match) -> str:
+    # O browser trata qualquer sequência de espaços como um só;
+    # a quebra de linha fica para o HTML continuar legível num diff.
+    return "\n" if "\n" in m.group(0) else " "
+
+
+def _minificar_trecho(trecho: str) -> str:
+    """Texto e tags fora dos blocos preservados: só se mexe no texto."""
+    trecho = _RE_COMENTARIO.sub("", trecho)
+    partes = []
+    cursor = 0
+    for m in _RE_TAG.finditer(trecho):
+        partes.append(_RE_ESPACOS.sub(_espaco, trecho[cursor:m.start()]))
+        partes.append(m.group(0))
+        cursor = m.end()
+    partes.append(_RE_ESPACOS.sub(_espaco, trecho[cursor:]))
+    return "".join(partes)
+
+
+def minificar(conteudo: str) -> str:
+    """Minifica uma página HTML. Aplicar duas vezes dá o mesmo resultado."""
+    partes = []
+    cursor = 0
+    for m in _RE_PRESERVAR.finditer(conteudo):
+        partes.append(_minificar_trecho(conteudo[cursor:m.start()]))
+        partes.append(m.group(0))
+        cursor = m.end()
+    partes.append(_minificar_trecho(conteudo[cursor:]))
+    return "".join(partes).strip() + "\n"
+
+
+def minificar_paginas(paginas: list[Path]) -> tuple[int, int]:
+    """Minifica as páginas no sítio; devolve (bytes antes, bytes depois)."""
+    total_antes = total_depois = 0
+    for pagina in paginas:
+        conteudo = pagina.read_text(encoding='utf-8')
+        novo = minificar(conteudo)
+        antes, depois = len(conteudo.encode('utf-8')), len(novo.encode('utf-8'))
+        total_antes += antes
+        total_depois += depois
+        if novo != conteudo:
+            pagina.write_text(novo, encoding='utf-8')
+        print(f"🗜  {pagina.name:28} {antes / 1024:7.1f} KB → {depois / 1024:6.1f} KB"
+              f"  (-{antes - depois} B)")
+    return total_antes, total_depois
+
+
+# ──────────────────────────────────────────────────────────────
+# MAIN
+# ──────────────────────────────────────────────────────────────
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Minifica as páginas HTML do site NuAr.")
+    parser.add_argument("paginas", nargs="*", help="páginas a minificar (por omissão, todas as *.html da raiz)")
+    args = parser.parse_args(argv)
+
+    paginas = [Path(p) for p in args.paginas] or [
+        p for p in sorted(Path(".").glob("*.html")) if p.name not in EXCLUIDAS
+    ]
+    antes, depois = minificar_paginas(paginas)
+    if antes:
+        print(f"\n✅ {len(paginas)} página(s): {antes / 1024:.1f} KB → {depois / 1024:.1f} KB "
+              f"(-{100 * (1 - depois / antes):.0f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
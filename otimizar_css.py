@@ -0,0 +1,404 @@
+"""
+╔══════════════════════════════════════════════════════════════╗
+║         OTIMIZADOR DE CSS — NuAr                             ║
+║  Para cada página junta as folhas de estilo locais que ela   ║
+║  usa num só ficheiro, remove os seletores que não encontram  ║
+║  nada no HTML da página (nem no HTML gerado pelo             ║
+║  gestor_atividades.py) e minifica o resultado.               ║
+║                                                              ║
+║  Ficheiros gerados:                                          ║
+║    css/bundles/<página>.css                                  ║
+║                                                              ║
+║  Com --inline-critico, o CSS do topo da página (navbar +     ║
+║  primeira secção) vai inline no <head> e o bundle completo   ║
+║  carrega sem bloquear a renderização.                        ║
+║                                                              ║
+║  Correr antes do versionar_assets.py (os bundles também      ║
+║  levam hash no nome).                                        ║
+╚══════════════════════════════════════════════════════════════╝
+"""
+
+import argparse
+import os
+import re
+import sys
+from pathlib import Path
+
+import gestor_atividades
+from versionar_assets import sem_hash
+
+
+# ──────────────────────────────────────────────────────────────
+# CONFIGURAÇÃO
+# ──────────────────────────────────────────────────────────────
+BUNDLES_DIR = Path("css/bundles")
+
+# Tamanho máximo do "topo da página" usado para o CSS crítico
+CRITICO_MAX = 8000
+
+# At-rules cujo conteúdo são outras regras (filtradas recursivamente)
+AT_RULES_AGRUPADORAS = ("@media", "@supports", "@layer", "@container")
+
+# Tags que existem sempre, mesmo sem aparecerem no HTML
+TAGS_SEMPRE = {"html", "body", "head"}
+
+# Atividade de exemplo, com todos os campos opcionais preenchidos,
+# para saber que classes o gestor pode vir a gerar
+ATIVIDADE_EXEMPLO = {
+    "id": "exemplo", "titulo": "Exemplo", "data": "1 de Janeiro de 2025", "hora": "10h00",
+    "local": "FCT", "vagas": "30", "thumb": "x.jpg", "paragrafos": ["Exemplo."],
+    "fotos": [{"url": "x", "thumbnail": "x.jpg"}], "link_galeria": "x",
+    "inscricao_email": "x@x.pt", "pagina": "atividade-exemplo.html",
+}
+
+
+# ──────────────────────────────────────────────────────────────
+# HTML → classes / ids / tags usados
+# ──────────────────────────────────────────────────────────────
+
+_RE_TAG      = re.compile(r'<([a-zA-Z][\w-]*)([^>]*)>')
+_RE_CLASSE   = re.compile(r'\bclass\s*=\s*["\']([^"\']*)["\']')
+_RE_ID       = re.compile(r'\bid\s*=\s*["\']([^"\']*)["\']')
+_RE_SCRIPT   = re.compile(r'<script\b[^>]*>(.*?)</script>', re.S | re.I)
+_RE_STRING   = re.compile(r'(["\'`])((?:\\.|(?!\1).)*)\1', re.S)
+_RE_PALAVRA  = re.compile(r'[\w-]+')
+
+
+def tokens_do_html(html: str) -> dict[str, set]:
+    """
+    Conjuntos de tags, classes e ids presentes no HTML. As strings dentro de
+    <script> também contam (classList.add('active'), getElementById('x'), …),
+    para não se perderem estilos de classes acrescentadas por JavaScript.
+    """
+    tags, classes, ids = set(TAGS_SEMPRE), set(), set()
+    for m in _RE_TAG.finditer(html):
+        tags.add(m.group(1).lower())
+        attrs = m.group(2)
+        c = _RE_CLASSE.search(attrs)
+        if c:
+            classes.update(c.group(1).split())
+        i = _RE_ID.search(attrs)
+        if i:
+            ids.add(i.group(1).strip())
+
+    for script in _RE_SCRIPT.findall(html):
+        for s in _RE_STRING.finditer(script):
+            palavras = _RE_PALAVRA.findall(s.group(2))
+            classes.update(palavras)
+            ids.update(palavras)
+            tags.update(p.lower() for p in palavras)
+    return {"tags": tags, "classes": classes, "ids": ids}
+
+
+def juntar_tokens(*conjuntos: dict) -> dict[str, set]:
+    return {k: set().union(*(c[k] for c in conjuntos)) for k in ("tags", "classes", "ids")}
+
+
+def html_gerado_para(pagina: Path) -> str:
+    """HTML que o gestor_atividades.py pode inserir nesta página."""
+    if pagina.name == gestor_atividades.ACTIVITIES_HTML:
+        return (gestor_atividades.gerar_card_html(ATIVIDADE_EXEMPLO)
+                + gestor_atividades.gerar_card_passado_html(ATIVIDADE_EXEMPLO)
+                + gestor_atividades.gerar_paginacao_html([2025, 2024], 2025, 2025))
+    if pagina.name == gestor_atividades.TEMPLATE_HTML:
+        return gestor_atividades.gerar_pagina_atividade(
+            ATIVIDADE_EXEMPLO, pagina.read_text(encoding='utf-8'))
+    return ""
+
+
+# ──────────────────────────────────────────────────────────────
+# CSS: parser de regras
+# ──────────────────────────────────────────────────────────────
+# Cada regra é (prelúdio, corpo): corpo é None para "@import …;",
+# uma lista de regras para @media/@supports/…, ou o texto entre {}.
+
+_RE_CSS_TOKEN = re.compile(r'/\*.*?\*/|"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|[{};]', re.S)
+
+
+def _fim_do_bloco(css: str, abertura: int) -> int:
+    """Posição do } que fecha o { em `abertura`."""
+    nivel = 0
+    for m in _RE_CSS_TOKEN.finditer(css, abertura):
+        t = m.group(0)
+        if t == "{":
+            nivel += 1
+        elif t == "}":
+            nivel -= 1
+            if nivel == 0:
+                return m.start()
+    return len(css)
+
+
+def parse_css(css: str) -> list[tuple]:
+    regras = []
+    pos = 0
+    inicio = 0
+    while True:
+        m = _RE_CSS_TOKEN.search(css, pos)
+        if m is None:
+            break
+        t = m.group(0)
+        if t.startswith(("/*", '"', "'")):
+            pos = m.end()
+            continue
+        prelude = _sem_comentarios(css[inicio:m.start()]).strip()
+        if t == ";":
+            if prelude:
+                regras.append((prelude, None))
+            pos = inicio = m.end()
+        elif t == "{":
+            fim = _fim_do_bloco(css, m.start())
+            corpo = css[m.end():fim]
+            if prelude.lower().startswith(AT_RULES_AGRUPADORAS):
+                regras.append((prelude, parse_css(corpo)))
+            else:
+                regras.append((prelude, corpo))
+            pos = inicio = fim + 1
+        else:       # "}" solto
+            pos = inicio = m.end()
+    return regras
+
+
+def _sem_comentarios(texto: str) -> str:
+    return re.sub(r'/\*.*?\*/', '', texto, flags=re.S)
+
+
+_RE_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+
+def rebasear_urls(css: str, pasta_origem: str) -> str:
+    """url(../images/x.png) continua a apontar para o mesmo ficheiro a partir de css/bundles/."""
+    def trocar(m):
+        aspas, url = m.group(1), m.group(2)
+        if url.startswith(("data:", "http:", "https:", "//", "#", "/", "%23")):
+            return m.group(0)
+        alvo = os.path.normpath(os.path.join(pasta_origem, url))
+        novo = os.path.relpath(alvo, BUNDLES_DIR).replace(os.sep, "/")
+        return f"url({aspas}{novo}{aspas})"
+
+    return _RE_URL.sub(trocar, css)
+
+
+# ──────────────────────────────────────────────────────────────
+# Eliminação de regras não usadas
+# ──────────────────────────────────────────────────────────────
+
+_RE_PSEUDO   = re.compile(r'::?[\w-]+(\((?:[^()]|\([^()]*\))*\))?')
+_RE_ATRIB    = re.compile(r'\[[^\]]*\]')
+_RE_SEL_CLS  = re.compile(r'\.([\w-]+)')
+_RE_SEL_ID   = re.compile(r'#([\w-]+)')
+_RE_SEL_TAG  = re.compile(r'(?:^|[\s>+~])([a-zA-Z][\w-]*)')
+
+
+def seletor_usado(seletor: str, tokens: dict) -> bool:
+    """
+    Conservador: o seletor só é removido se referir uma classe, id ou tag
+    que não existe na página. Pseudo-classes e atributos são ignorados.
+    """
+    s = _RE_ATRIB.sub("", _RE_PSEUDO.sub("", seletor))
+    if any(c not in tokens["classes"] for c in _RE_SEL_CLS.findall(s)):
+        return False
+    if any(i not in tokens["ids"] for i in _RE_SEL_ID.findall(s)):
+        return False
+    s = _RE_SEL_CLS.sub("", _RE_SEL_ID.sub("", s))
+    return all(t.lower() in tokens["tags"] for t in _RE_SEL_TAG.findall(s))
+
+
+def filtrar_regras(regras: list[tuple], tokens: dict) -> list[tuple]:
+    filtradas = []
+    for prelude, corpo in regras:
+        if isinstance(corpo, list):
+            dentro = filtrar_regras(corpo, tokens)
+            if dentro:
+                filtradas.append((prelude, dentro))
+        elif corpo is None or prelude.startswith("@"):
+            filtradas.append((prelude, corpo))
+        else:
+            seletores = [s.strip() for s in _dividir_seletores(prelude) if seletor_usado(s, tokens)]
+            if seletores:
+                filtradas.append((", ".join(seletores), corpo))
+    return filtradas
+
+
+def _dividir_seletores(prelude: str) -> list[str]:
+    """Divide por vírgulas fora de parênteses (":is(a, b)" fica inteiro)."""
+    partes, nivel, atual = [], 0, []
+    for ch in prelude:
+        if ch == "(":
+            nivel += 1
+        elif ch == ")":
+            nivel -= 1
+        if ch == "," and nivel == 0:
+            partes.append("".join(atual))
+            atual = []
+        else:
+            atual.append(ch)
+    partes.append("".join(atual))
+    return partes
+
+
+# ──────────────────────────────────────────────────────────────
+# Serialização + minificação
+# ──────────────────────────────────────────────────────────────
+
+_RE_MINI = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/|\s+', re.S)
+
+
+def minificar(css: str) -> str:
+    """Tira comentários e espaços desnecessários, sem mexer em strings."""
+    def trocar(m):
+        if m.group(1):
+            return m.group(1)
+        return "" if m.group(0).startswith("/*") else " "
+
+    css = _RE_MINI.sub(trocar, css)
+    partes = re.split(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')', css)
+    for i in range(0, len(partes), 2):
+        p = re.sub(r'\s*([{};,>])\s*', r'\1', partes[i])
+        p = re.sub(r':\s+', ':', p)
+        partes[i] = p.replace(";}", "}")
+    return "".join(partes).strip()
+
+
+def serializar(regras: list[tuple]) -> str:
+    saida = []
+    for prelude, corpo in regras:
+        if corpo is None:
+            saida.append(f"{prelude};")
+        elif isinstance(corpo, list):
+            saida.append(f"{prelude}{{{serializar(corpo)}}}")
+        else:
+            saida.append(f"{prelude}{{{corpo}}}")
+    return minificar("".join(saida))
+
+
+# ──────────────────────────────────────────────────────────────
+# Páginas
+# ──────────────────────────────────────────────────────────────
+
+_RE_LINK     = re.compile(r'<link\b[^>]*>', re.I)
+_RE_HREF     = re.compile(r'\bhref\s*=\s*["\']([^"\']+)["\']')
+_RE_BUNDLE   = re.compile(r'\bdata-bundle\s*=\s*["\']([^"\']*)["\']')
+_RE_CRITICO  = re.compile(r'\s*<style data-critico>.*?</style>', re.S)
+_RE_NOSCRIPT = re.compile(r'\s*<noscript><link rel="stylesheet" href="[^"]*" data-bundle-noscript></noscript>')
+
+
+def folhas_da_pagina(html: str) -> tuple[list[str], list[re.Match]]:
+    """CSS locais ligados pela página (ou, se já tem bundle, os de origem)."""
+    folhas, links = [], []
+    for m in _RE_LINK.finditer(html):
+        tag = m.group(0)
+        bundle = _RE_BUNDLE.search(tag)
+        href = _RE_HREF.search(tag)
+        if bundle:
+            folhas += [sem_hash(f) for f in bundle.group(1).split()]
+            links.append(m)
+        elif href and "stylesheet" in tag and href.group(1).startswith("css/"):
+            folhas.append(sem_hash(href.group(1)))
+            links.append(m)
+    return list(dict.fromkeys(folhas)), links
+
+
+def topo_da_pagina(html: str) -> str:
+    """Cabeçalho + primeira secção do <body>: o que aparece sem scroll."""
+    inicio = html.find("<body")
+    fim = html.find("</section>", inicio)
+    if inicio == -1:
+        return html[:CRITICO_MAX]
+    if fim == -1 or fim - inicio > CRITICO_MAX:
+        fim = inicio + CRITICO_MAX
+    return html[:fim]
+
+
+def processar_pagina(pagina: Path, inline_critico: bool = False) -> tuple[int, int] | None:
+    original = pagina.read_text(encoding='utf-8')
+    # o CSS crítico e o <noscript> de uma execução anterior são refeitos
+    html = _RE_NOSCRIPT.sub("", _RE_CRITICO.sub("", original))
+    folhas, links = folhas_da_pagina(html)
+    if not folhas:
+        return None
+
+    css_original = "\n".join(rebasear_urls(Path(f).read_text(encoding='utf-8'), str(Path(f).parent))
+                             for f in folhas if Path(f).exists())
+    regras = parse_css(css_original)
+    gerado = html_gerado_para(pagina)
+    tokens = juntar_tokens(tokens_do_html(html), tokens_do_html(gerado))
+    bundle = serializar(filtrar_regras(regras, tokens))
+
+    BUNDLES_DIR.mkdir(parents=True, exist_ok=True)
+    destino = BUNDLES_DIR / f"{pagina.stem}.css"
+    if not destino.exists() or destino.read_text(encoding='utf-8') != bundle:
+        destino.write_text(bundle, encoding='utf-8')
+
+    href = destino.as_posix()
+    origem = " ".join(folhas)
+    if inline_critico:
+        linha = html.rfind("\n", 0, links[0].start()) + 1
+        indent = "\n" + html[linha:links[0].start()]
+        tokens_topo = juntar_tokens(tokens_do_html(topo_da_pagina(html)), tokens_do_html(gerado))
+        critico = serializar(filtrar_regras(regras, tokens_topo))
+        novo_link = (f'<style data-critico>{critico}</style>{indent}'
+                     f'<link rel="preload" href="{href}" as="style" '
+                     f'onload="this.onload=null;this.rel=\'stylesheet\'" data-bundle="{origem}">{indent}'
+                     f'<noscript><link rel="stylesheet" href="{href}" data-bundle-noscript></noscript>')
+    else:
+        novo_link = f'<link rel="stylesheet" href="{href}" data-bundle="{origem}">'
+
+    # trocar os <link> antigos por um só, na posição do primeiro
+    partes, cursor = [], 0
+    for i, m in enumerate(links):
+        antes = html[cursor:m.start()]
+        if i > 0:       # apagar também a linha onde estava o <link>
+            aparado = antes.rstrip(" \t")
+            antes = aparado[:-1] if aparado.endswith("\n") else antes
+        partes.append(antes)
+        if i == 0:
+            partes.append(novo_link)
+        cursor = m.end()
+    partes.append(html[cursor:])
+    novo = "".join(partes)
+
+    if novo != original:
+        pagina.write_text(novo, encoding='utf-8')
+    return len(css_original.encode('utf-8')), len(bundle.encode('utf-8'))
+
+
+def paginas_do_site() -> list[Path]:
+    """
+    Páginas *.html da raiz. As atividade-<id>.html vêm do template e as
+    arquivo-<ano>.html do activities.html, por isso usam os bundles deles.
+    """
+    return [p for p in sorted(Path(".").glob("*.html"))
+            if not p.name.startswith(("atividade-", "arquivo-")) or p.name == gestor_atividades.TEMPLATE_HTML]
+
+
+# ──────────────────────────────────────────────────────────────
+# MAIN
+# ──────────────────────────────────────────────────────────────
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Junta, limpa e minifica o CSS de cada página do site NuAr.")
+    parser.add_argument("paginas", nargs="*", help="páginas a processar (por omissão, todas)")
+    parser.add_argument("--inline-critico", action="store_true",
+                        help="põe inline o CSS do topo da página e carrega o resto sem bloquear")
+    args = parser.parse_args(argv)
+
+    paginas = [Path(p) for p in args.paginas] or paginas_do_site()
+    total_antes = total_depois = 0
+    for pagina in paginas:
+        resultado = processar_pagina(pagina, args.inline_critico)
+        if resultado is None:
+            continue
+        antes, depois = resultado
+        total_antes += antes
+        total_depois += depois
+        print(f"🎨 {pagina.name:28} {antes / 1024:7.1f} KB → {depois / 1024:6.1f} KB")
+
+    if total_antes:
+        print(f"\n✅ CSS bloqueante: {total_antes / 1024:.1f} KB → {total_depois / 1024:.1f} KB "
+              f"(-{100 * (1 - total_depois / total_antes):.0f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,359 @@
+"""
+╔══════════════════════════════════════════════════════════════╗
+║         OTIMIZADOR DE IMAGENS — NuAr                         ║
+║  Gera variantes redimensionadas (AVIF / WebP / JPEG ou PNG)  ║
+║  das imagens em images/ e troca por <picture> com            ║
+║  srcset/sizes os <img> das páginas cuja largura se conhece   ║
+║  (com sizes ou width).                                       ║
+║                                                              ║
+║  Ficheiros gerados:                                          ║
+║    images/otimizadas/<nome>-<hash>-<largura>.<formato>       ║
+║    images/otimizadas/manifesto.json — cache por hash         ║
+║                                                              ║
+║  Requer Pillow (pip install pillow). Para .HEIC instala      ║
+║  também pillow-heif; para AVIF, um Pillow com libavif.       ║
+╚══════════════════════════════════════════════════════════════╝
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+import versionar_assets
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+try:
+    import pillow_heif
+    pillow_heif.register_heif_opener()
+except ImportError:
+    pillow_heif = None
+
+
+# ──────────────────────────────────────────────────────────────
+# CONFIGURAÇÃO
+# ──────────────────────────────────────────────────────────────
+IMAGENS_DIR = Path("images")
+SAIDA_DIR   = IMAGENS_DIR / "otimizadas"
+MANIFESTO   = SAIDA_DIR / "manifesto.json"
+
+LARGURAS    = (480, 960, 1600)          # nunca se amplia acima do original
+QUALIDADE   = {"avif": 50, "webp": 75, "jpeg": 80}
+EXTENSOES   = {".jpg", ".jpeg", ".png", ".heic"}
+
+# Versões anteriores punham sizes="100vw" em todos os <img> sem sizes: num
+# <picture> já gerado, esse valor não diz a largura real da imagem
+SIZES_ANTIGO = "100vw"
+
+# O <img> dentro do <picture> tem de ser num formato que todos os browsers leem
+FALLBACKS = ("jpeg", "png")
+
+MIME = {"avif": "image/avif", "webp": "image/webp", "jpeg": "image/jpeg", "png": "image/png"}
+EXT  = {"avif": "avif", "webp": "webp", "jpeg": "jpg", "png": "png"}
+
+
+# ──────────────────────────────────────────────────────────────
+# UTILITÁRIOS
+# ──────────────────────────────────────────────────────────────
+
+def hash_ficheiro(caminho: Path) -> str:
+    h = hashlib.sha256()
+    with caminho.open("rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def tamanho_legivel(n: int) -> str:
+    if n < 1024:
+        return f"{n} B"
+    if n < 1024 ** 2:
+        return f"{n / 1024:.1f} KB"
+    return f"{n / 1024 ** 2:.1f} MB"
+
+
+def carregar_manifesto() -> dict:
+    try:
+        return json.loads(MANIFESTO.read_text(encoding='utf-8'))
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def gravar_manifesto(manifesto: dict):
+    SAIDA_DIR.mkdir(parents=True, exist_ok=True)
+    MANIFESTO.write_text(json.dumps(manifesto, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
+                         encoding='utf-8')
+
+
+def _variantes_existem(registo: dict) -> bool:
+    return all(Path(f).exists() for lista in registo["variantes"].values() for _, f in lista)
+
+
+# ──────────────────────────────────────────────────────────────
+# GERAÇÃO DAS VARIANTES
+# ──────────────────────────────────────────────────────────────
+
+_formatos_indisponiveis: set[str] = set()
+
+
+def _guardar(img, destino: Path, formato: str) -> bool:
+    """Grava numa variante; False se este Pillow não suportar o formato."""
+    opcoes = {"optimize": True}
+    if formato in QUALIDADE:
+        opcoes["quality"] = QUALIDADE[formato]
+    if formato == "jpeg":
+        opcoes["progressive"] = True
+    try:
+        img.save(destino, format=formato.upper(), **opcoes)
+        return True
+    except (KeyError, OSError, ValueError):
+        destino.unlink(missing_ok=True)
+        if formato not in _formatos_indisponiveis:
+            _formatos_indisponiveis.add(formato)
+            print(f"⚠️  Formato {formato.upper()} não suportado por este Pillow — ignorado.")
+        return False
+
+
+def otimizar_imagem(fonte: Path, manifesto: dict, forcar: bool = False) -> tuple[dict | None, bool]:
+    """
+    Gera as variantes de uma imagem. Devolve (registo, gerado): se o hash da
+    imagem original não mudou e as variantes existem, reutiliza o registo.
+    """
+    chave = fonte.as_posix()
+    h = hash_ficheiro(fonte)
+    anterior = manifesto.get(chave)
+    if not forcar and anterior and anterior["hash"] == h and _variantes_existem(anterior):
+        return anterior, False
+
+    if fonte.suffix.lower() == ".heic" and pillow_heif is None:
+        print(f"⚠️  {fonte.name}: instala pillow-heif para converter HEIC — ignorada.")
+        return None, False
+
+    with Image.open(fonte) as original:
+        img = ImageOps.exif_transpose(original)
+        tem_alfa = img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info
+        img = img.convert("RGBA" if tem_alfa else "RGB")
+    largura, altura = img.size
+
+    larguras = sorted({min(w, largura) for w in LARGURAS})
+    redimensionadas = {
+        w: img if w == largura else img.resize((w, max(1, round(altura * w / largura))), Image.LANCZOS)
+        for w in larguras
+    }
+
+    SAIDA_DIR.mkdir(parents=True, exist_ok=True)
+    variantes = {}
+    for formato in ("avif", "webp", "png" if tem_alfa else "jpeg"):
+        if formato in _formatos_indisponiveis:
+            continue
+        lista = []
+        for w, versao in redimensionadas.items():
+            destino = SAIDA_DIR / f"{fonte.stem}-{h[:10]}-{w}.{EXT[formato]}"
+            if not _guardar(versao, destino, formato):
+                lista = []
+                break
+            lista.append([w, destino.as_posix()])
+        if lista:
+            variantes[formato] = lista
+
+    # apagar as variantes da versão anterior da imagem
+    if anterior and anterior["hash"] != h:
+        for lista in anterior["variantes"].values():
+            for _, f in lista:
+                Path(f).unlink(missing_ok=True)
+
+    registo = {"hash": h, "largura": largura, "altura": altura, "variantes": variantes}
+    manifesto[chave] = registo
+    return registo, True
+
+
+def processar_imagens(forcar: bool = False) -> dict:
+    """Otimiza todas as imagens de images/; devolve o manifesto atualizado."""
+    manifesto = carregar_manifesto()
+    geradas = reutilizadas = 0
+
+    for fonte in sorted(IMAGENS_DIR.iterdir()):
+        if not fonte.is_file() or fonte.suffix.lower() not in EXTENSOES:
+            continue
+        registo, gerado = otimizar_imagem(fonte, manifesto, forcar)
+        if registo is None:
+            continue
+        if not gerado:
+            reutilizadas += 1
+            continue
+        geradas += 1
+        formato = next(iter(registo["variantes"]), None)
+        if formato is None:
+            continue
+        w, maior = registo["variantes"][formato][-1]
+        print(f"✅ {fonte.name}: {tamanho_legivel(fonte.stat().st_size)} → "
+              f"{formato} {w}px {tamanho_legivel(Path(maior).stat().st_size)}")
+
+    # esquecer imagens que já não existem
+    for chave in [c for c in manifesto if not Path(c).exists()]:
+        del manifesto[chave]
+
+    gravar_manifesto(manifesto)
+    print(f"\n🖼  {geradas} imagem(ns) otimizada(s), {reutilizadas} sem alterações (cache).")
+    return manifesto
+
+
+# ──────────────────────────────────────────────────────────────
+# REESCRITA DO HTML
+# ──────────────────────────────────────────────────────────────
+# Cada <img src="images/X"> com sizes (ou width) passa a
+#   <picture data-otimizada="images/X" style="display:contents">
+#       <source type="image/avif" srcset="…" sizes="…">
+#       <source type="image/webp" srcset="…" sizes="…">
+#       <img src="…" srcset="…" sizes="…" (restantes atributos originais)>
+#   </picture>
+# Voltar a correr o script refaz os <picture> já existentes a partir de
+# data-otimizada, por isso a reescrita é idempotente. Sem largura conhecida
+# o <img> fica como está: com sizes="100vw" um logótipo pequeno pedia a
+# variante maior. Os src já versionados (images/X.<hash>.jpg) voltam a
+# images/X pelo assets-manifest.json.
+
+_RE_IMG_OU_PICTURE = re.compile(
+    r'<picture data-otimizada="(?P<fonte>[^"]*)"[^>]*>.*?(?P<img><img\b[^>]*>).*?</picture>'
+    r'|(?P<solto><img\b[^>]*>)',
+    re.S,
+)
+_RE_ATRIBUTO = re.compile(r'([\w:-]+)(?:\s*=\s*("[^"]*"|\'[^\']*\'|[^\s>]+))?')
+
+
+def _atributos(tag: str) -> list[tuple[str, str | None]]:
+    corpo = tag[len("<img"):].rstrip(">").rstrip("/")
+    return [(m.group(1), m.group(2)) for m in _RE_ATRIBUTO.finditer(corpo)]
+
+
+def _valor(atributos: list, nome: str) -> str | None:
+    for n, v in atributos:
+        if n == nome and v is not None:
+            return v.strip("\"'")
+    return None
+
+
+def _srcset(lista: list) -> str:
+    return ", ".join(f"{f} {w}w" for w, f in lista)
+
+
+def _restantes(atributos: list) -> str:
+    """Os atributos do <img> original que a reescrita não muda."""
+    return " ".join(n if v is None else f"{n}={v}" for n, v in atributos if n not in ("src", "srcset", "sizes"))
+
+
+def _fallback(registo: dict) -> list | None:
+    return next((registo["variantes"][fmt] for fmt in FALLBACKS if registo["variantes"].get(fmt)), None)
+
+
+def largura_mostrada(atributos: list, gerada: bool) -> str | None:
+    """
+    O sizes do <img>: o que já tem ou, com width="N", "Npx". Sem nenhum dos
+    dois não se sabe a largura com que a imagem aparece (um logótipo de 45px
+    com "100vw" descarregava a variante maior) e fica None.
+    """
+    sizes = _valor(atributos, "sizes")
+    if sizes and not (gerada and sizes == SIZES_ANTIGO):
+        return sizes
+    largura = _valor(atributos, "width")
+    return f"{largura}px" if largura and largura.isdecimal() else None
+
+
+def gerar_picture(fonte: str, img_tag: str, registo: dict, sizes: str) -> str:
+    atributos = _atributos(img_tag)
+    fallback = _fallback(registo)
+
+    fontes = "".join(
+        f'<source type="{MIME[fmt]}" srcset="{_srcset(registo["variantes"][fmt])}" sizes="{sizes}">'
+        for fmt in ("avif", "webp") if fmt in registo["variantes"]
+    )
+    resto = _restantes(atributos)
+    img = (f'<img src="{fallback[-1][1]}" srcset="{_srcset(fallback)}" sizes="{sizes}"'
+           + (f" {resto}" if resto else "") + ">")
+    return f'<picture data-otimizada="{fonte}" style="display:contents">{fontes}{img}</picture>'
+
+
+def img_simples(fonte: str, img_tag: str) -> str:
+    """Desfaz um <picture> gerado: o <img> original, com src = fonte."""
+    resto = _restantes(_atributos(img_tag))
+    return f'<img src="{fonte}"' + (f" {resto}" if resto else "") + ">"
+
+
+def reescrever_html(conteudo: str, manifesto: dict,
+                    originais: dict | None = None) -> tuple[str, int, list[str]]:
+    """
+    Devolve (HTML, imagens com srcset, fontes saltadas por não terem largura
+    conhecida). `originais` (versionado → original, do assets-manifest.json)
+    reconhece os src que o versionar_assets.py já trocou por images/X.<hash>.jpg.
+    """
+    trocas, sem_largura = 0, []
+
+    def trocar(m):
+        nonlocal trocas
+        img_tag = m.group("img") or m.group("solto")
+        fonte = m.group("fonte") or _valor(_atributos(img_tag), "src")
+        fonte = (originais or {}).get(fonte, fonte)
+        registo = manifesto.get(fonte)
+        if not registo or not _fallback(registo):
+            # só avif/webp (o jpeg/png falhou): sem <img> para os outros browsers, fica como está
+            return m.group(0)
+        sizes = largura_mostrada(_atributos(img_tag), gerada=m.group("fonte") is not None)
+        if sizes is None:
+            sem_largura.append(fonte)
+            return img_simples(fonte, img_tag) if m.group("fonte") else m.group(0)
+        trocas += 1
+        return gerar_picture(fonte, img_tag, registo, sizes)
+
+    return _RE_IMG_OU_PICTURE.sub(trocar, conteudo), trocas, sem_largura
+
+
+def reescrever_paginas(manifesto: dict, paginas: list[Path]) -> int:
+    originais = {versionado: original for original, versionado in versionar_assets.carregar_manifesto().items()}
+    alteradas = 0
+    sem_largura = set()
+    for pagina in paginas:
+        conteudo = pagina.read_text(encoding='utf-8')
+        novo, trocas, saltadas = reescrever_html(conteudo, manifesto, originais)
+        sem_largura.update(saltadas)
+        if novo != conteudo:
+            pagina.write_text(novo, encoding='utf-8')
+            alteradas += 1
+            print(f"✏️  {pagina.name}: {trocas} imagem(ns) com srcset")
+    if sem_largura:
+        print(f"ℹ️  {len(sem_largura)} imagem(ns) sem srcset por não terem sizes nem width no <img>: "
+              + ", ".join(sorted(sem_largura)))
+    return alteradas
+
+
+# ──────────────────────────────────────────────────────────────
+# MAIN
+# ──────────────────────────────────────────────────────────────
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Otimiza as imagens do site NuAr.")
+    parser.add_argument("paginas", nargs="*",
+                        help="páginas HTML a reescrever (por omissão, todas as *.html da raiz)")
+    parser.add_argument("--sem-html", action="store_true", help="só gera as variantes, não mexe no HTML")
+    parser.add_argument("--forcar", action="store_true", help="ignora a cache e regenera tudo")
+    args = parser.parse_args(argv)
+
+    if Image is None:
+        print("❌ Pillow não está instalado (pip install pillow).")
+        return 1
+
+    manifesto = processar_imagens(args.forcar)
+    if not args.sem_html:
+        paginas = [Path(p) for p in args.paginas] or sorted(Path(".").glob("*.html"))
+        alteradas = reescrever_paginas(manifesto, paginas)
+        print(f"📄 {alteradas} página(s) atualizada(s).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
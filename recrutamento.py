@@ -1,13 +1,25 @@
+import argparse
+import json
+import os
 import re
+import sys
+from html import escape
 from pathlib import Path
 
+import instrumentacao
+
 HTML_PATH = Path("recrutamento.html")
 
+# Perguntas de todas as secções (fonte de verdade do formulário quando existe)
+ESQUEMA_PATH = Path("recrutamento-perguntas.json")
+
+TIPOS = ("short", "long", "checkbox", "dropdown")
+
 SECTIONS = {
-    "1": {"name": "Informações básicas", "marker": "<!-- BASIC_MARKER -->", "prefix": "basic", "section_id": "BASIC-section"},
-    "2": {"name": "Projeto ASTRO",        "marker": "<!-- ASTRO_MARKER -->", "prefix": "astro", "section_id": "ASTRO-section"},
-    "3": {"name": "Projeto NSS",          "marker": "<!-- NSS_MARKER -->",   "prefix": "nss",   "section_id": "NSS-section"},
-    "4": {"name": "Projeto STAR",         "marker": "<!-- STAR_MARKER -->",  "prefix": "star",  "section_id": "STAR-section"},
+    "1": {"name": "Informações básicas", "marker": "<!-- BASIC_MARKER -->", "inicio": "<!-- BASIC_INICIO -->", "prefix": "basic", "section_id": "BASIC-section"},
+    "2": {"name": "Projeto ASTRO",       "marker": "<!-- ASTRO_MARKER -->", "inicio": "<!-- ASTRO_INICIO -->", "prefix": "astro", "section_id": "ASTRO-section"},
+    "3": {"name": "Projeto NSS",         "marker": "<!-- NSS_MARKER -->",   "inicio": "<!-- NSS_INICIO -->",   "prefix": "nss",   "section_id": "NSS-section"},
+    "4": {"name": "Projeto STAR",        "marker": "<!-- STAR_MARKER -->",  "inicio": "<!-- STAR_INICIO -->",  "prefix": "star",  "section_id": "STAR-section"},
 }
 
 
@@ -16,7 +28,21 @@ def carregar_html() -> str:
 
 
 def gravar_html(conteudo: str) -> None:
-    HTML_PATH.write_text(conteudo, encoding="utf-8")
+    escrever_atomico(HTML_PATH, conteudo)
+
+
+def escrever_atomico(caminho: Path, conteudo: str) -> None:
+    """Temporário ao lado + os.replace: um crash a meio deixa o ficheiro antigo inteiro."""
+    temporario = caminho.with_name(f".{caminho.name}.{os.getpid()}.tmp")
+    try:
+        with open(temporario, "w", encoding="utf-8") as f:
+            f.write(conteudo)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, caminho)
+    except BaseException:
+        temporario.unlink(missing_ok=True)
+        raise
 
 
 def slugify(texto: str) -> str:
@@ -167,6 +193,10 @@ def gerar_html_pergunta(p: dict) -> str:
 
 # ------- inserção / remoção -------
 
+def indentar(bloco_html: str, indent: str = " " * 8) -> str:  # ajusta aqui se quiseres outro nível
+    return "\n".join(indent + linha if linha.strip() else linha for linha in bloco_html.splitlines())
+
+
 def inserir_na_secao(pergunta: dict, bloco_html: str) -> None:
     marker = pergunta["section"]["marker"]
     conteudo = carregar_html()
@@ -175,95 +205,358 @@ def inserir_na_secao(pergunta: dict, bloco_html: str) -> None:
     if idx == -1:
         raise RuntimeError(f"Marcador {marker} não encontrado no HTML.")
 
-    indent = " " * 8  # ajusta aqui se quiseres outro nível
-    bloco_indentado = "\n".join(
-        indent + linha if linha.strip() else linha
-        for linha in bloco_html.splitlines()
-    )
+    bloco_indentado = indentar(bloco_html)
 
     novo_conteudo = conteudo[:idx] + bloco_indentado + "\n" + conteudo[idx:]
     gravar_html(novo_conteudo)
 
 
-def remover_pergunta_por_label(secao: dict, label_text: str) -> bool:
+# ------- índice do formulário (uma passagem) -------
+# indexar_formulario() percorre o HTML uma vez e devolve, por secção, os
+# form-groups pela ordem em que aparecem, cada um com o id, o label (sem
+# o " *" das obrigatórias), o tipo, as opções e o intervalo [inicio, fim)
+# que ocupa. O intervalo começa logo a seguir ao conteúdo anterior, por
+# isso inclui a quebra de linha e o recuo do bloco: os intervalos de
+# perguntas seguidas ficam contíguos, e removê-los não deixa linhas em branco.
+
+_RE_TOKEN_FORM = re.compile(
+    r'<section\b[^>]*\bid="(?P<secao>[^"]*)"[^>]*>'
+    r'|</section\s*>'
+    r'|<div\b(?P<div>[^>]*)>'
+    r'|</div\s*>'
+    r'|<label>(?P<label>[^<]*)</label\s*>'
+    r'|<(?P<campo>input|textarea|select)\b(?P<attrs>[^>]*)>'
+    r'|<option\b[^>]*\bvalue="(?P<opcao>[^"]*)"',
+    re.S,
+)
+_RE_ATTR = re.compile(r'\b(id|name|type|value)="([^"]*)"')
+
+SECOES_POR_ID = {sec["section_id"]: sec for sec in SECTIONS.values()}
+
+
+def label_sem_asterisco(label: str) -> str:
+    return label.strip().removesuffix("*").strip()
+
+
+def indexar_formulario(conteudo: str) -> dict[str, list[dict]]:
+    """{prefixo da secção: [pergunta, …]} com as posições de cada form-group."""
+    indice = {sec["prefix"]: [] for sec in SECTIONS.values()}
+    secao = None
+    pilha = []          # por cada <div> aberto: a pergunta (form-group) ou None
+    atual = None        # form-group mais exterior em que estamos
+
+    for m in _RE_TOKEN_FORM.finditer(conteudo):
+        token = m.group(0)
+        if m.group("secao") is not None:
+            sec = SECOES_POR_ID.get(m.group("secao"))
+            secao = sec["prefix"] if sec else None
+        elif token.startswith("</section"):
+            secao = None
+        elif m.group("div") is not None:
+            pergunta = None
+            if atual is None and secao and re.search(r'\bclass="form-group"', m.group("div")):
+                anterior = len(conteudo[:m.start()].rstrip())
+                quebra = conteudo.find("\n", anterior, m.start())
+                atual = pergunta = {"id": None, "label": None, "tipo": None, "required": False,
+                                    "options": [], "secao": secao,
+                                    "inicio": quebra if quebra != -1 else m.start()}
+            pilha.append(pergunta)
+        elif token.startswith("</div"):
+            if pilha and pilha.pop() is not None:
+                atual["fim"] = m.end()
+                indice[atual["secao"]].append(atual)
+                atual = None
+        elif atual is None:
+            continue
+        elif m.group("label") is not None:
+            if atual["label"] is None:
+                atual["label"] = label_sem_asterisco(m.group("label"))
+        elif m.group("campo"):
+            attrs = dict(_RE_ATTR.findall(m.group("attrs")))
+            atual["id"] = atual["id"] or attrs.get("id") or attrs.get("name")
+            atual["required"] = atual["required"] or bool(re.search(r'\brequired\b', m.group("attrs")))
+            if attrs.get("type") == "checkbox":
+                atual["tipo"] = "checkbox"
+                atual["options"].append(attrs.get("value", ""))
+            elif atual["tipo"] is None:
+                atual["tipo"] = {"input": "short", "textarea": "long", "select": "dropdown"}[m.group("campo")]
+        elif m.group("opcao"):
+            atual["options"].append(m.group("opcao"))
+
+    return indice
+
+
+def corresponde(pergunta: dict, chave: str) -> bool:
+    """A chave pode ser o id da pergunta ou o label (com ou sem o " *")."""
+    return chave == pergunta["id"] or label_sem_asterisco(chave) == pergunta["label"]
+
+
+def selecionar(perguntas: list[dict], chaves: list[str]) -> tuple[list[dict], list[str]]:
+    """(perguntas pela ordem das chaves, chaves sem pergunta)."""
+    encontradas, em_falta = [], []
+    for chave in chaves:
+        p = next((p for p in perguntas if corresponde(p, chave)), None)
+        if p is None:
+            em_falta.append(chave)
+        elif p not in encontradas:
+            encontradas.append(p)
+    return encontradas, em_falta
+
+
+def aplicar_edicoes(conteudo: str, edicoes: list[tuple[int, int, str]]) -> str:
     """
-    Remove o <div class="form-group"> cujo <label>Texto</label> corresponde
-    ao label_text, dentro da secção indicada.
+    Aplica várias edições (início, fim, texto novo) numa só passagem.
+    As posições referem-se ao conteúdo original e não se podem sobrepor;
+    uma inserção é uma edição com início == fim (várias no mesmo sítio
+    ficam pela ordem em que vêm).
     """
-    conteudo = carregar_html()
+    partes, cursor = [], 0
+    for inicio, fim, texto in sorted(edicoes, key=lambda e: (e[0], e[1])):
+        partes += [conteudo[cursor:inicio], texto]
+        cursor = fim
+    partes.append(conteudo[cursor:])
+    return "".join(partes)
 
-    # localizar início e fim aproximados da secção (pelo id do <section>)
-    sec_id = secao["section_id"]
-    sec_start = conteudo.find(f'<section id="{sec_id}"')
-    if sec_start == -1:
-        print(f"⚠ Secção '{secao['name']}' (id={sec_id}) não encontrada.")
-        return False
 
-    sec_end = conteudo.find("</section>", sec_start)
-    if sec_end == -1:
-        print(f"⚠ Fecho </section> não encontrado para '{secao['name']}'.")
-        return False
-    sec_end += len("</section>")
+def remover_perguntas(pedidos: dict[str, list[str] | None]) -> int:
+    """
+    Remove de uma vez as perguntas pedidas ({prefixo: [id ou label, …]},
+    ou {prefixo: None} para todas as da secção). Não remove nada se faltar
+    alguma; devolve quantas removeu. Com esquema, as perguntas saem do
+    esquema e o formulário é gerado de novo; sem esquema, saem do HTML
+    com uma leitura, um índice e uma escrita.
+    """
+    esquema = carregar_esquema() if ESQUEMA_PATH.exists() else None
+    if esquema is None:
+        conteudo = carregar_html()
+        fonte = indexar_formulario(conteudo)
+    else:
+        fonte = esquema
+    remover = []
+    falhou = False
+    for prefixo, chaves in pedidos.items():
+        perguntas = fonte.get(prefixo, [])
+        if chaves is None:
+            remover += perguntas
+            continue
+        encontradas, em_falta = selecionar(perguntas, chaves)
+        for chave in em_falta:
+            print(f"⚠ Pergunta '{chave}' não encontrada na secção '{prefixo}'.")
+        falhou = falhou or bool(em_falta)
+        remover += encontradas
+    if falhou or not remover:
+        return 0
+
+    if esquema is None:
+        gravar_html(aplicar_edicoes(conteudo, [(p["inicio"], p["fim"], "") for p in remover]))
+    else:
+        removidas = {id(p) for p in remover}
+        for prefixo in pedidos:
+            esquema[prefixo] = [p for p in esquema.get(prefixo, []) if id(p) not in removidas]
+        gravar_esquema(esquema)
+        gerar_a_partir_do_esquema()
+    return len(remover)
 
-    sec_html = conteudo[sec_start:sec_end]
 
-    # procurar o label dentro da secção
-    label_pattern = f"<label>{label_text}</label>"
-    label_pos = sec_html.find(label_pattern)
-    if label_pos == -1:
-        print(f"⚠ Pergunta com label '{label_text}' não encontrada na secção '{secao['name']}'.")
-        return False
+def remover_pergunta_por_label(secao: dict, label_text: str) -> bool:
+    """Remove a pergunta com este label (ou id) da secção indicada."""
+    return remover_perguntas({secao["prefix"]: [label_text]}) == 1
+
 
-    # recuar até ao início do <div class="form-group">
-    div_start = sec_html.rfind('<div class="form-group"', 0, label_pos)
-    if div_start == -1:
-        print("⚠ Não foi encontrado <div class=\"form-group\"> antes do label.")
+def reordenar_perguntas(secao: dict, chaves: list[str]) -> bool:
+    """
+    Põe as perguntas indicadas no início da secção, por esta ordem; as
+    restantes ficam depois, pela ordem em que estavam.
+    """
+    esquema = carregar_esquema() if ESQUEMA_PATH.exists() else None
+    if esquema is None:
+        conteudo = carregar_html()
+        perguntas = indexar_formulario(conteudo)[secao["prefix"]]
+    else:
+        perguntas = esquema.get(secao["prefix"], [])
+    primeiras, em_falta = selecionar(perguntas, chaves)
+    for chave in em_falta:
+        print(f"⚠ Pergunta '{chave}' não encontrada na secção '{secao['name']}'.")
+    if em_falta or not perguntas:
         return False
+    ordem = primeiras + [p for p in perguntas if p not in primeiras]
+
+    if esquema is not None:
+        esquema[secao["prefix"]] = ordem
+        gravar_esquema(esquema)
+        gerar_a_partir_do_esquema()
+        return True
+    # os blocos de perguntas seguidas são contíguos: troca-se a secção de uma vez
+    for anterior, seguinte in zip(perguntas, perguntas[1:]):
+        if conteudo[anterior["fim"]:seguinte["inicio"]].strip():
+            print(f"⚠ Há conteúdo entre as perguntas de '{secao['name']}' — não é possível reordenar.")
+            return False
+    blocos = "".join(conteudo[p["inicio"]:p["fim"]] for p in ordem)
+    gravar_html(aplicar_edicoes(conteudo, [(perguntas[0]["inicio"], perguntas[-1]["fim"], blocos)]))
+    return True
 
-    # avançar até fechar esse div (balanceando <div> / </div>)
-    i = div_start
-    depth = 0
-    n = len(sec_html)
-    div_end = None
 
-    while i < n:
-        next_open = sec_html.find("<div", i)
-        next_close = sec_html.find("</div", i)
+def esquema_do_html(conteudo: str) -> dict:
+    """Esquema com as perguntas que já estão no HTML (para começar a usar o esquema)."""
+    marcadores = {sec["prefix"]: sec["marker"] for sec in SECTIONS.values()}
+    return {
+        prefixo: [{k: p[k] for k in ("id", "label", "tipo", "required", "options")} for p in perguntas]
+        for prefixo, perguntas in indexar_formulario(conteudo).items()
+        if perguntas or marcadores[prefixo] in conteudo
+    }
 
-        if next_open == -1 and next_close == -1:
-            break
 
-        if next_close == -1 or (next_open != -1 and next_open < next_close):
-            depth += 1
-            i = next_open + 4
+# ------- esquema (perguntas em JSON/YAML) -------
+# {"basic": [{"id", "label", "tipo", "required", "options"}, …], "astro": […], …}
+# O formulário inteiro é gerado numa passagem: em cada secção, tudo entre
+# <!-- X_INICIO --> e <!-- X_MARKER --> é substituído pelas perguntas do
+# esquema, com uma só leitura e uma só escrita do recrutamento.html.
+
+def carregar_esquema(caminho: Path = ESQUEMA_PATH) -> dict:
+    texto = caminho.read_text(encoding="utf-8")
+    if caminho.suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise RuntimeError("Para ler YAML instala o PyYAML (pip install pyyaml).")
+        try:
+            esquema = yaml.safe_load(texto) or {}
+        except yaml.YAMLError as e:
+            raise ValueError(f"YAML inválido em {caminho}: {e}")
+    else:
+        esquema = json.loads(texto)
+    return validar_esquema(esquema)
+
+
+def gravar_esquema(esquema: dict, caminho: Path = ESQUEMA_PATH) -> None:
+    if caminho.suffix.lower() in (".yaml", ".yml"):
+        import yaml
+        texto = yaml.safe_dump(esquema, allow_unicode=True, sort_keys=False)
+    else:
+        texto = json.dumps(esquema, ensure_ascii=False, indent=2) + "\n"
+    escrever_atomico(caminho, texto)
+
+
+def validar_esquema(esquema: dict) -> dict:
+    """Completa os campos opcionais e falha com todos os erros de uma vez."""
+    if not isinstance(esquema, dict):
+        raise ValueError("Esquema inválido:\n  - esperava-se um objeto {secção: [perguntas]}, "
+                         f"não {type(esquema).__name__}")
+    prefixos = {sec["prefix"] for sec in SECTIONS.values()}
+    erros = [f"secção desconhecida '{p}'" for p in esquema if p not in prefixos]
+    vistos = set()
+    for prefixo, perguntas in esquema.items():
+        if perguntas is not None and not isinstance(perguntas, list):
+            erros.append(f"{prefixo}: esperava-se uma lista de perguntas, não {type(perguntas).__name__}")
+            continue
+        esquema[prefixo] = perguntas = perguntas or []
+        for n, p in enumerate(perguntas, 1):
+            onde = f"{prefixo} #{n}"
+            if not isinstance(p, dict):
+                erros.append(f"{onde}: esperava-se um objeto com label, tipo…, não {type(p).__name__}")
+                continue
+            if not isinstance(p.get("label"), str) or not p["label"].strip():
+                erros.append(f"{onde}: falta o label")
+                continue
+            p.setdefault("id", f"{prefixo}_{slugify(p['label'])}")
+            p.setdefault("tipo", "short")
+            p["required"] = bool(p.get("required", False))
+            p.setdefault("options", [])
+            if p["options"] is None:
+                p["options"] = []
+            if not isinstance(p["id"], str) or not p["id"].strip():
+                erros.append(f"{onde}: id inválido ({p['id']!r})")
+                continue
+            if not isinstance(p["options"], list) or not all(isinstance(o, str) for o in p["options"]):
+                erros.append(f"{onde} ({p['id']}): options tem de ser uma lista de textos")
+            elif p["tipo"] not in TIPOS:
+                erros.append(f"{onde} ({p['id']}): tipo {p['tipo']!r} inválido (usa {', '.join(TIPOS)})")
+            elif p["tipo"] in ("checkbox", "dropdown") and not p["options"]:
+                erros.append(f"{onde} ({p['id']}): '{p['tipo']}' sem options")
+            if p["id"] in vistos:
+                erros.append(f"{onde}: id '{p['id']}' repetido")
+            vistos.add(p["id"])
+    if erros:
+        raise ValueError("Esquema inválido:\n  - " + "\n  - ".join(erros))
+    return esquema
+
+
+_RE_FORM          = re.compile(r'<form\b((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>', re.I)
+_RE_METODO_ACAO   = re.compile(r'\s+(?:method|action)\s*=\s*(?:"[^"]*"|\'[^\']*\'|[^\s>]+)', re.I)
+
+
+def edicao_do_form(conteudo: str, acao: str) -> tuple[int, int, str]:
+    """<form> que contém as secções, com method="post" e action=acao (o resto dos atributos fica)."""
+    primeira = min((i for sec in SECTIONS.values()
+                    if (i := conteudo.find(f'<section id="{sec["section_id"]}"')) != -1), default=len(conteudo))
+    formularios = list(_RE_FORM.finditer(conteudo, 0, primeira))
+    if not formularios:
+        raise RuntimeError("<form> das perguntas não encontrado no HTML.")
+    form = formularios[-1]
+    atributos = _RE_METODO_ACAO.sub("", form.group(1))
+    return form.start(), form.end(), f'<form method="post" action="{escape(acao)}"{atributos}>'
+
+
+def gerar_formulario(conteudo: str, esquema: dict, acao: str | None = None) -> str:
+    """
+    Reescreve as perguntas de todas as secções do esquema numa passagem e,
+    com `acao`, o action do <form> (o URL do servidor_candidaturas.py).
+    """
+    edicoes = [edicao_do_form(conteudo, acao)] if acao else []
+    for secao in SECTIONS.values():
+        if secao["prefix"] not in esquema:
+            continue
+        sec_start = conteudo.find(f'<section id="{secao["section_id"]}"')
+        if sec_start == -1:
+            # sem ela, a procura começava no topo e apanhava perguntas de outra secção
+            raise RuntimeError(f"Secção {secao['section_id']} não encontrada no HTML.")
+        marker = conteudo.find(secao["marker"], sec_start)
+        if marker == -1:
+            raise RuntimeError(f"Marcador {secao['marker']} não encontrado no HTML.")
+        fim = conteudo.rfind("\n", 0, marker) + 1          # início da linha do marcador
+        if conteudo[fim:marker].strip():                    # … se estiver sozinho na linha
+            fim = marker
+        blocos = "".join(indentar(gerar_html_pergunta(p)) + "\n" for p in esquema[secao["prefix"]])
+
+        inicio = conteudo.find(secao["inicio"], sec_start, marker)
+        if inicio != -1:
+            edicoes.append((inicio + len(secao["inicio"]), fim, "\n" + blocos))
         else:
-            depth -= 1
-            i = next_close + 5  # len("</div") = 5
-            if depth == 0:
-                # fecha o div inicial
-                end_tag = sec_html.find(">", next_close)
-                if end_tag == -1:
-                    end_tag = next_close + 5
-                div_end = end_tag + 1
-                break
-
-    if div_end is None:
-        print("⚠ Não foi possível determinar o fim do bloco <div class=\"form-group\">.")
-        return False
+            # primeira geração: as perguntas antigas (inseridas antes do marcador,
+            # desde o primeiro form-group da secção) passam a ser as do esquema
+            primeira = conteudo.find('<div class="form-group"', sec_start, marker)
+            a = conteudo.rfind("\n", 0, primeira) + 1 if primeira != -1 else fim
+            recuo = conteudo[fim:marker]
+            edicoes.append((a, fim, recuo + secao["inicio"] + "\n" + blocos))
 
-    # remover o bloco dessa secção
-    novo_sec_html = sec_html[:div_start] + sec_html[div_end:]
+    return aplicar_edicoes(conteudo, edicoes)
 
-    # limpar linhas em branco duplicadas resultantes da remoção
-    # (remove linhas que só tenham espaços/tabs entre \n\n)
-    # novo_sec_html = re.sub(r"\n[ \t]*\n[ \t]*\n[ \t]*\n", "\n\n", novo_sec_html)
-    novo_sec_html = re.sub(r"\n[ \t]*\n+", "\n", novo_sec_html)
 
+def gerar_a_partir_do_esquema(caminho: Path = ESQUEMA_PATH, acao: str | None = None) -> int:
+    """Uma leitura e uma escrita do HTML; devolve o número de perguntas."""
+    esquema = carregar_esquema(caminho)
+    conteudo = carregar_html()
+    novo = gerar_formulario(conteudo, esquema, acao)
+    if novo != conteudo:
+        gravar_html(novo)
+    return sum(len(perguntas) for perguntas in esquema.values())
 
-    # remontar o HTML completo
-    novo_conteudo = conteudo[:sec_start] + novo_sec_html + conteudo[sec_end:]
-    gravar_html(novo_conteudo)
-    return True
+
+def perguntas_do_formulario() -> dict[str, list[dict]]:
+    """Perguntas de cada secção: do esquema, se existir, senão do próprio recrutamento.html."""
+    if ESQUEMA_PATH.exists():
+        return carregar_esquema()
+    return indexar_formulario(carregar_html())
+
+
+def adicionar_ao_esquema(pergunta: dict) -> None:
+    esquema = carregar_esquema()
+    prefixo = pergunta["section"]["prefix"]
+    registo = {k: pergunta[k] for k in ("id", "label", "tipo", "required", "options")}
+    esquema.setdefault(prefixo, []).append(registo)
+    validar_esquema(esquema)
+    gravar_esquema(esquema)
+    gerar_a_partir_do_esquema()
 
 
 def menu():
@@ -276,14 +569,25 @@ def menu():
 
         if op == "1":
             pergunta = criar_pergunta()
-            bloco = gerar_html_pergunta(pergunta)
-            inserir_na_secao(pergunta, bloco)
+            try:
+                if ESQUEMA_PATH.exists():
+                    # valida antes de gravar: um id repetido não chega ao esquema
+                    adicionar_ao_esquema(pergunta)
+                else:
+                    inserir_na_secao(pergunta, gerar_html_pergunta(pergunta))
+            except (OSError, ValueError, RuntimeError) as e:
+                print(f"\n❌ {e}")
+                continue
             print(f"\n✅ Pergunta '{pergunta['label']}' adicionada em {pergunta['section']['name']}.")
         elif op == "2":
             print("\n=== REMOVER PERGUNTA ===")
             secao = escolher_secao()
             label = input("Texto exato do label da pergunta a remover: ").strip()
-            ok = remover_pergunta_por_label(secao, label)
+            try:
+                ok = remover_pergunta_por_label(secao, label)
+            except (OSError, ValueError, RuntimeError) as e:
+                print(f"\n❌ {e}")
+                continue
             if ok:
                 print(f"\n✅ Pergunta '{label}' removida de {secao['name']}.")
             else:
@@ -294,5 +598,77 @@ def menu():
             print("Opção inválida.")
 
 
+# ------- instrumentação (--timings / --profile) -------
+
+# {função: (bytes lidos, bytes escritos)}
+ETAPAS_MEDIDAS = {
+    "carregar_html":              (instrumentacao.bytes_do_resultado, None),
+    "gravar_html":                (None, instrumentacao.bytes_do_argumento(0, "conteudo")),
+    "gerar_html_pergunta":        (None, None),
+    "inserir_na_secao":           (None, None),
+    "remover_pergunta_por_label": (None, None),
+    "indexar_formulario":         (None, None),
+    "remover_perguntas":          (None, None),
+    "reordenar_perguntas":        (None, None),
+    "carregar_esquema":           (None, None),
+    "gerar_formulario":           (None, None),
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Gestor do formulário de recrutamento do NuAr.")
+    parser.add_argument("--timings", action="store_true",
+                        help="mostra no fim o tempo, as chamadas e os bytes de cada etapa")
+    parser.add_argument("--profile", metavar="FICHEIRO", default=None,
+                        help="grava os tempos de cada etapa em JSON")
+    sub = parser.add_subparsers(dest="comando")
+    p_gerar = sub.add_parser("gerar", help="gera as perguntas de todas as secções a partir do esquema")
+    p_gerar.add_argument("esquema", nargs="?", type=Path, default=ESQUEMA_PATH,
+                         help=f"ficheiro JSON/YAML (por omissão, {ESQUEMA_PATH})")
+    p_gerar.add_argument("--acao", metavar="URL", default=None,
+                         help="URL do servidor_candidaturas.py a pôr no action do <form> (p.ex. https://…/candidaturas)")
+    secoes = [sec["prefix"] for sec in SECTIONS.values()]
+    p_remover = sub.add_parser("remover", help="remove várias perguntas de uma secção de uma só vez")
+    p_remover.add_argument("secao", choices=secoes)
+    p_remover.add_argument("perguntas", nargs="*", help="id ou label de cada pergunta")
+    p_remover.add_argument("--todas", action="store_true", help="remove todas as perguntas da secção")
+    p_reordenar = sub.add_parser("reordenar", help="põe as perguntas indicadas primeiro, por esta ordem")
+    p_reordenar.add_argument("secao", choices=secoes)
+    p_reordenar.add_argument("perguntas", nargs="+", help="id ou label de cada pergunta")
+    p_exportar = sub.add_parser("exportar-esquema", help="cria o esquema a partir das perguntas do HTML")
+    p_exportar.add_argument("esquema", nargs="?", type=Path, default=ESQUEMA_PATH)
+    args = parser.parse_args(argv)
+
+    if args.timings or args.profile:
+        instrumentacao.instrumentar(sys.modules[__name__], ETAPAS_MEDIDAS)
+    if args.comando == "remover" and not args.todas and not args.perguntas:
+        parser.error("indica as perguntas a remover ou --todas")
+    try:
+        if args.comando == "gerar":
+            total = gerar_a_partir_do_esquema(args.esquema, args.acao)
+            print(f"✅ {total} pergunta(s) geradas em {HTML_PATH} a partir de {args.esquema}.")
+        elif args.comando == "remover":
+            total = remover_perguntas({args.secao: None if args.todas else args.perguntas})
+            print(f"{'✅' if total else '❌'} {total} pergunta(s) removida(s) de '{args.secao}'.")
+            return 0 if total else 1
+        elif args.comando == "reordenar":
+            secao = next(sec for sec in SECTIONS.values() if sec["prefix"] == args.secao)
+            if not reordenar_perguntas(secao, args.perguntas):
+                return 1
+            print(f"✅ Perguntas de '{args.secao}' reordenadas.")
+        elif args.comando == "exportar-esquema":
+            esquema = esquema_do_html(carregar_html())
+            gravar_esquema(esquema, args.esquema)
+            print(f"✅ {sum(map(len, esquema.values()))} pergunta(s) exportadas para {args.esquema}.")
+        else:
+            menu()
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        instrumentacao.concluir(args.timings, args.profile)
+    return 0
+
+
 if __name__ == "__main__":
-    menu()
+    sys.exit(main())
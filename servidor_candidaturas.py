@@ -0,0 +1,390 @@
+"""
+╔══════════════════════════════════════════════════════════════╗
+║         SERVIDOR DE CANDIDATURAS — NuAr                      ║
+║  Recebe os POST do formulário do recrutamento.html, valida   ║
+║  as respostas contra as perguntas que o recrutamento.py      ║
+║  conhece (ids, obrigatórias, opções) e grava-as em SQLite    ║
+║  em lotes: cada transação junta todas as candidaturas que    ║
+║  chegaram entretanto. Com a fila cheia responde 503 com      ║
+║  Retry-After, em vez de acumular pedidos sem limite.         ║
+║                                                              ║
+║  Ficheiros:                                                  ║
+║    candidaturas.sqlite3 — uma linha por candidatura (JSON)   ║
+║                                                              ║
+║  No recrutamento.html, o <form> aponta para aqui com         ║
+║    recrutamento.py gerar --acao https://…/candidaturas       ║
+║  Campos que não são perguntas (submit, consentimento…) são   ║
+║  ignorados.                                                  ║
+║  Teste de carga: carga_candidaturas.py                       ║
+╚══════════════════════════════════════════════════════════════╝
+"""
+
+import argparse
+import asyncio
+import json
+import signal
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from html import escape
+from pathlib import Path
+from urllib.parse import parse_qs
+
+import recrutamento
+
+
+# ──────────────────────────────────────────────────────────────
+# CONFIGURAÇÃO
+# ──────────────────────────────────────────────────────────────
+BASE_DADOS     = Path("candidaturas.sqlite3")
+ENDERECO       = "127.0.0.1"
+PORTA          = 8080
+CAMINHO        = "/candidaturas"
+
+TAMANHO_LOTE   = 500        # candidaturas por transação, no máximo
+ESPERA_LOTE    = 0.002      # s a esperar por mais candidaturas antes de gravar um lote pequeno
+FILA_MAXIMA    = 5000       # acima disto os pedidos recebem 503
+ESPERA_FECHO   = 5.0        # s para as respostas pendentes saírem quando o servidor termina
+
+CORPO_MAXIMO   = 64 * 1024  # bytes por pedido
+RESPOSTA_MAXIMA = 5000      # caracteres por resposta
+
+# Quem pode submeter a partir do browser (o site está noutro domínio)
+ORIGEM_CORS    = "*"
+
+ESTADOS_HTTP = {200: "OK", 201: "Created", 204: "No Content", 303: "See Other", 400: "Bad Request",
+                404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+                415: "Unsupported Media Type", 503: "Service Unavailable"}
+
+
+# ──────────────────────────────────────────────────────────────
+# BASE DE DADOS
+# ──────────────────────────────────────────────────────────────
+
+ESQUEMA_SQL = """
+CREATE TABLE IF NOT EXISTS candidaturas (
+    id        INTEGER PRIMARY KEY,
+    recebida  TEXT NOT NULL,
+    respostas TEXT NOT NULL
+)"""
+
+
+def abrir_base(caminho: Path = BASE_DADOS) -> sqlite3.Connection:
+    # WAL: as leituras (exportar) não bloqueiam as escritas do servidor
+    conexao = sqlite3.connect(caminho, check_same_thread=False, isolation_level=None)
+    conexao.execute("PRAGMA journal_mode=WAL")
+    conexao.execute("PRAGMA synchronous=NORMAL")
+    conexao.execute(ESQUEMA_SQL)
+    return conexao
+
+
+def gravar_lote(conexao: sqlite3.Connection, lote: list[tuple[str, str]]):
+    """Uma transação para o lote inteiro (é o commit que custa, não as linhas)."""
+    conexao.execute("BEGIN")
+    try:
+        conexao.executemany("INSERT INTO candidaturas (recebida, respostas) VALUES (?, ?)", lote)
+        conexao.execute("COMMIT")
+    except BaseException:
+        conexao.execute("ROLLBACK")
+        raise
+
+
+# ──────────────────────────────────────────────────────────────
+# VALIDAÇÃO
+# ──────────────────────────────────────────────────────────────
+
+def regras_do_formulario(esquema: Path | None = None) -> dict[str, dict]:
+    """{id da pergunta: pergunta}, do esquema indicado ou do que o recrutamento.py usa."""
+    secoes = recrutamento.carregar_esquema(esquema) if esquema else recrutamento.perguntas_do_formulario()
+    return {p["id"]: p for perguntas in secoes.values() for p in perguntas}
+
+
+def validar(campos: dict[str, list[str]], regras: dict[str, dict]) -> tuple[dict, list[str]]:
+    """
+    (respostas normalizadas, erros). Checkboxes ficam como lista, o resto como
+    texto. Só se leem os campos das perguntas: os outros inputs da parte escrita
+    à mão do formulário (botão submit com name, consentimento, honeypot…) são
+    ignorados e não ficam gravados.
+    """
+    erros = []
+    respostas = {}
+    for qid, p in regras.items():
+        valores = [v.strip() for v in campos.get(qid, []) if v.strip()]
+        if not valores:
+            if p["required"]:
+                erros.append(f"{qid}: resposta obrigatória")
+            continue
+        if any(len(v) > RESPOSTA_MAXIMA for v in valores):
+            erros.append(f"{qid}: resposta com mais de {RESPOSTA_MAXIMA} caracteres")
+        elif p["tipo"] == "checkbox":
+            invalidas = [v for v in valores if v not in p["options"]]
+            if invalidas:
+                erros.append(f"{qid}: opções inválidas ({', '.join(invalidas)})")
+            respostas[qid] = list(dict.fromkeys(valores))
+        elif len(valores) > 1:
+            erros.append(f"{qid}: só aceita uma resposta")
+        elif p["tipo"] == "dropdown" and valores[0] not in p["options"]:
+            erros.append(f"{qid}: opção inválida ({valores[0]})")
+        else:
+            respostas[qid] = valores[0]
+    return respostas, erros
+
+
+def campos_do_corpo(tipo: str, corpo: bytes) -> dict[str, list[str]]:
+    """Corpo form-urlencoded (o que o <form> envia) ou JSON, sempre como {campo: [valores]}."""
+    if tipo.startswith("application/x-www-form-urlencoded"):
+        return parse_qs(corpo.decode("utf-8"), keep_blank_values=True)
+    if tipo.startswith("application/json"):
+        dados = json.loads(corpo)
+        if not isinstance(dados, dict):
+            raise ValueError("o JSON tem de ser um objeto")
+        return {k: [str(x) for x in v] if isinstance(v, list) else [str(v)] for k, v in dados.items()}
+    raise LookupError(tipo)
+
+
+# ──────────────────────────────────────────────────────────────
+# FILA E GRAVAÇÃO EM LOTES
+# ──────────────────────────────────────────────────────────────
+# Cada pedido válido entra na fila com um future e só recebe resposta
+# depois do commit do lote em que foi gravado. O gravador junta tudo o
+# que estiver na fila (até TAMANHO_LOTE) e grava numa thread, para o
+# event loop continuar a aceitar pedidos enquanto o SQLite escreve.
+# Ao terminar, FIM entra na fila depois da última candidatura aceite: o
+# gravador grava o que falta, responde a todos e só então pára.
+
+FIM = None
+
+
+def _esvaziar(fila: asyncio.Queue, lote: list):
+    while len(lote) < TAMANHO_LOTE:
+        try:
+            lote.append(fila.get_nowait())
+        except asyncio.QueueEmpty:
+            return
+
+
+async def _gravar(lote: list, conexao: sqlite3.Connection, estado: dict):
+    try:
+        await asyncio.to_thread(gravar_lote, conexao, [(recebida, texto) for recebida, texto, _ in lote])
+    except Exception as e:
+        print(f"❌ Erro a gravar {len(lote)} candidatura(s): {e}")
+        for *_, futuro in lote:
+            if not futuro.done():
+                futuro.set_exception(e)
+        return
+    for *_, futuro in lote:
+        if not futuro.done():
+            futuro.set_result(None)
+    estado["gravadas"] += len(lote)
+    estado["lotes"] += 1
+
+
+async def gravador(fila: asyncio.Queue, conexao: sqlite3.Connection, estado: dict):
+    while True:
+        lote = [await fila.get()]
+        _esvaziar(fila, lote)
+        if len(lote) < TAMANHO_LOTE and ESPERA_LOTE and lote[-1] is not FIM:
+            await asyncio.sleep(ESPERA_LOTE)
+            _esvaziar(fila, lote)
+        terminar = lote[-1] is FIM            # nada entra na fila depois de FIM
+        if terminar:
+            lote.pop()
+        if lote:
+            await _gravar(lote, conexao, estado)
+        if terminar:
+            return
+
+
+# ──────────────────────────────────────────────────────────────
+# HTTP
+# ──────────────────────────────────────────────────────────────
+
+def pagina_html(titulo: str, linhas: list[str]) -> str:
+    itens = "".join(f"<li>{escape(linha)}</li>" for linha in linhas)
+    return (f'<!DOCTYPE html><html lang="pt"><meta charset="utf-8"><title>{escape(titulo)}</title>'
+            f"<h1>{escape(titulo)}</h1>" + (f"<ul>{itens}</ul>" if itens else "")
+            + '<p><a href="javascript:history.back()">Voltar</a></p></html>')
+
+
+def resposta(estado_http: int, corpo: dict | str, html: bool, extra: dict | None = None) -> tuple:
+    if html and isinstance(corpo, dict):
+        corpo = pagina_html(corpo.get("mensagem", ""), corpo.get("erros", []))
+    if isinstance(corpo, dict):
+        return estado_http, "application/json; charset=utf-8", json.dumps(corpo, ensure_ascii=False), extra
+    return estado_http, "text/html; charset=utf-8", corpo, extra
+
+
+async def atender(metodo: str, caminho: str, cabecalhos: dict, corpo: bytes, contexto: dict) -> tuple:
+    # o <form> do browser quer HTML de volta; fetch()/scripts recebem JSON
+    html = "text/html" in cabecalhos.get("accept", "")
+    caminho = caminho.split("?", 1)[0]
+    if metodo == "OPTIONS":
+        return 204, "", "", {"Access-Control-Allow-Methods": "POST, OPTIONS",
+                             "Access-Control-Allow-Headers": "Content-Type"}
+    if caminho == "/saude" and metodo == "GET":
+        estado = contexto["estado"]
+        return resposta(200, {"fila": contexto["fila"].qsize(), **estado}, False)
+    if caminho != CAMINHO:
+        return resposta(404, {"mensagem": "Não encontrado"}, html)
+    if metodo != "POST":
+        return resposta(405, {"mensagem": "Usa POST"}, html, {"Allow": "POST, OPTIONS"})
+
+    try:
+        campos = campos_do_corpo(cabecalhos.get("content-type", ""), corpo)
+    except LookupError:
+        return resposta(415, {"mensagem": "Formato não suportado (usa um <form> ou JSON)"}, html)
+    except (ValueError, UnicodeDecodeError) as e:
+        return resposta(400, {"mensagem": "Pedido inválido", "erros": [str(e)]}, html)
+    except RecursionError:
+        # JSON válido mas aninhado a milhares de níveis ([[[…]]]): json.loads não chega ao fim
+        return resposta(400, {"mensagem": "Pedido inválido", "erros": ["JSON demasiado aninhado"]}, html)
+    respostas, erros = validar(campos, contexto["regras"])
+    if not set(campos) <= contexto["regras"].keys():
+        contexto["estado"]["com_campos_extra"] += 1
+    if erros:
+        contexto["estado"]["invalidas"] += 1
+        return resposta(400, {"mensagem": "Candidatura com erros", "erros": erros}, html)
+
+    if contexto["a_terminar"]:
+        return resposta(503, {"mensagem": "O servidor está a reiniciar — tenta dentro de momentos"},
+                        html, {"Retry-After": "5"})
+    futuro = asyncio.get_running_loop().create_future()
+    recebida = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+    try:
+        contexto["fila"].put_nowait((recebida, json.dumps(respostas, ensure_ascii=False), futuro))
+    except asyncio.QueueFull:
+        contexto["estado"]["recusadas"] += 1
+        return resposta(503, {"mensagem": "Demasiadas candidaturas em simultâneo — tenta dentro de momentos"},
+                        html, {"Retry-After": "1"})
+    try:
+        await futuro
+    except Exception:
+        return resposta(503, {"mensagem": "Não foi possível gravar — tenta outra vez"}, html, {"Retry-After": "1"})
+    return resposta(201, {"mensagem": "Candidatura recebida. Obrigado!"}, html)
+
+
+async def tratar_ligacao(leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter, contexto: dict):
+    """Uma ligação HTTP/1.1, com keep-alive (vários pedidos seguidos)."""
+    tarefa = asyncio.current_task()
+    contexto["ligacoes"][tarefa] = escritor
+    ocupadas = contexto["ocupadas"]         # ligações a meio de um pedido
+    try:
+        while True:
+            try:
+                cabecalho = await leitor.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                break
+            ocupadas.add(tarefa)
+            linhas = cabecalho.decode("latin-1").split("\r\n")
+            pedido = linhas[0].split(" ", 2)
+            cabecalhos = {}
+            for linha in linhas[1:]:
+                nome, _, valor = linha.partition(":")
+                if nome:
+                    cabecalhos[nome.strip().lower()] = valor.strip()
+
+            tamanho = cabecalhos.get("content-length") or "0"
+            tamanho = int(tamanho) if tamanho.isdecimal() else -1       # -1: negativo ou não numérico
+            if len(pedido) != 3 or not pedido[2].startswith("HTTP/") or tamanho < 0:
+                # sem saber onde acaba o corpo não há como ler o pedido seguinte
+                resultado = resposta(400, {"mensagem": "Pedido HTTP inválido"}, False)
+                manter = False
+            elif tamanho > CORPO_MAXIMO:
+                resultado = resposta(413, {"mensagem": "Pedido demasiado grande"}, False)
+                manter = False
+            else:
+                metodo, caminho, versao = pedido
+                corpo = await leitor.readexactly(tamanho) if tamanho else b""
+                resultado = await atender(metodo, caminho, cabecalhos, corpo, contexto)
+                manter = (versao == "HTTP/1.1" and cabecalhos.get("connection", "").lower() != "close"
+                          and not contexto["a_terminar"])
+
+            estado_http, tipo, texto, extra = resultado
+            dados = texto.encode("utf-8")
+            cabecalhos_resposta = {"Content-Length": str(len(dados)), "Access-Control-Allow-Origin": ORIGEM_CORS,
+                                   "Connection": "keep-alive" if manter else "close", **(extra or {})}
+            if tipo:
+                cabecalhos_resposta["Content-Type"] = tipo
+            escritor.write((f"HTTP/1.1 {estado_http} {ESTADOS_HTTP[estado_http]}\r\n"
+                            + "".join(f"{k}: {v}\r\n" for k, v in cabecalhos_resposta.items())
+                            + "\r\n").encode("latin-1") + dados)
+            await escritor.drain()
+            ocupadas.discard(tarefa)
+            if not manter:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        ocupadas.discard(tarefa)
+        del contexto["ligacoes"][tarefa]
+        escritor.close()
+
+
+async def servir(endereco: str, porta: int, base: Path, regras: dict[str, dict]):
+    conexao = abrir_base(base)
+    fila = asyncio.Queue(maxsize=FILA_MAXIMA)
+    estado = {"gravadas": 0, "lotes": 0, "invalidas": 0, "recusadas": 0, "com_campos_extra": 0}
+    contexto = {"fila": fila, "estado": estado, "regras": regras, "ligacoes": {}, "ocupadas": set(),
+                "a_terminar": False}
+    tarefa_gravador = asyncio.create_task(gravador(fila, conexao, estado))
+    servidor = await asyncio.start_server(lambda l, e: tratar_ligacao(l, e, contexto), endereco, porta,
+                                          backlog=1024)
+    try:
+        # SIGTERM (systemd, kill) termina como o Ctrl+C
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except (NotImplementedError, AttributeError):
+        pass
+    print(f"📮 A receber candidaturas em http://{endereco}:{porta}{CAMINHO} "
+          f"({len(regras)} pergunta(s), base {base}) — Ctrl+C para sair")
+    try:
+        await servidor.serve_forever()
+    finally:
+        # 1. deixar de aceitar ligações e candidaturas novas (passam a receber 503)
+        servidor.close()
+        contexto["a_terminar"] = True
+        # 2. o gravador grava tudo o que foi aceite e resolve os futures
+        await fila.put(FIM)
+        await tarefa_gravador
+        # 3. os pedidos a meio enviam a resposta (201 ou 503); as ligações paradas fecham
+        for tarefa, escritor in contexto["ligacoes"].items():
+            if tarefa not in contexto["ocupadas"]:
+                escritor.close()
+        if contexto["ligacoes"]:
+            await asyncio.wait(list(contexto["ligacoes"]), timeout=ESPERA_FECHO)
+        conexao.close()
+        print(f"\n💾 {estado['gravadas']} candidatura(s) gravada(s) em {estado['lotes']} lote(s); "
+              f"{estado['invalidas']} inválida(s), {estado['recusadas']} recusada(s) por excesso de carga.")
+        if estado["com_campos_extra"]:
+            print(f"ℹ️  {estado['com_campos_extra']} pedido(s) com campos que não são perguntas (ignorados).")
+
+
+# ──────────────────────────────────────────────────────────────
+# MAIN
+# ──────────────────────────────────────────────────────────────
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Recebe e grava as candidaturas do formulário do NuAr.")
+    parser.add_argument("--endereco", default=ENDERECO)
+    parser.add_argument("--porta", type=int, default=PORTA)
+    parser.add_argument("--base", type=Path, default=BASE_DADOS, help=f"base SQLite (por omissão, {BASE_DADOS})")
+    parser.add_argument("--esquema", type=Path, default=None,
+                        help="esquema das perguntas (por omissão, o do recrutamento.py ou o próprio HTML)")
+    args = parser.parse_args(argv)
+
+    try:
+        regras = regras_do_formulario(args.esquema)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"❌ Não foi possível ler as perguntas do formulário: {e}")
+        return 1
+    if not regras:
+        print("❌ O formulário não tem perguntas.")
+        return 1
+    try:
+        asyncio.run(servir(args.endereco, args.porta, args.base, regras))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+"""
+╔══════════════════════════════════════════════════════════════╗
+║         VERIFICADOR DE LIGAÇÕES INTERNAS — NuAr              ║
+║  Lê cada página *.html (e os CSS e SVG) uma única vez e      ║
+║  confirma que todos os href / src / srcset / url() apontam   ║
+║  para um ficheiro do site e, quando têm #âncora, para um id  ║
+║  que existe na página de destino.                            ║
+║                                                              ║
+║  Ficheiros gerados:                                          ║
+║    .cache-links.json — ligações e ids de cada ficheiro,      ║
+║                        por hash do conteúdo                  ║
+║                                                              ║
+║  Termina com código 1 se houver ligações partidas, para      ║
+║  poder bloquear um deploy.                                   ║
+╚══════════════════════════════════════════════════════════════╝
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from html import unescape
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+
+# ──────────────────────────────────────────────────────────────
+# CONFIGURAÇÃO
+# ──────────────────────────────────────────────────────────────
+EXTENSOES  = {".html", ".css", ".svg"}
+CACHE      = Path(".cache-links.json")
+
+# Versão do formato da cache: mudar quando a extração muda
+VERSAO     = 2
+
+# Atributos com um URL (srcset tem uma lista de URLs)
+ATRIBUTOS  = {"href", "src", "srcset", "poster", "data", "action", "xlink:href"}
+
+# Pastas que não são servidas
+IGNORAR    = {".git", "__pycache__", "node_modules", ".venv", "venv"}
+
+# Fontes de outras páginas: os {{ slots }} só são preenchidos pelo gestor
+EXCLUIDAS  = {"atividade-template.html"}
+
+# Âncoras que o browser resolve sem precisar de id
+ANCORAS_IMPLICITAS = {"", "top"}
+
+# Comentários e conteúdo de <script>/<style> não têm ligações a verificar
+# (os URLs montados em JavaScript não se conseguem resolver estaticamente);
+# a tag de abertura fica, porque o src de um <script> é uma ligação como as outras
+_RE_IGNORAR  = re.compile(r'<!--.*?-->|(?P<abertura><(?P<elemento>script|style)\b(?:[^>"\']|"[^"]*"|\'[^\']*\')*>)'
+                          r'.*?(?=</(?P=elemento))', re.S | re.I)
+_RE_TAG      = re.compile(r'<([a-zA-Z][\w:-]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>')
+_RE_ATRIBUTO = re.compile(r'([^\s=/>"\']+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))')
+_RE_URL_CSS  = re.compile(r'url\(\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\')]+))\s*\)|@import\s+(?:"([^"]*)"|\'([^\']*)\')')
+
+
+# ──────────────────────────────────────────────────────────────
+# UTILITÁRIOS
+# ──────────────────────────────────────────────────────────────
+
+def listar_ficheiros() -> list[str]:
+    ficheiros = []
+    for raiz, pastas, nomes in os.walk("."):
+        pastas[:] = sorted(p for p in pastas if p not in IGNORAR and not p.startswith("."))
+        for nome in sorted(nomes):
+            if not nome.startswith(".") and Path(nome).suffix in EXTENSOES and nome not in EXCLUIDAS:
+                ficheiros.append(Path(raiz, nome).as_posix().removeprefix("./"))
+    return ficheiros
+
+
+def listar_site() -> set[str]:
+    """Todos os ficheiros que o servidor pode entregar (alvos possíveis)."""
+    site = set()
+    for raiz, pastas, nomes in os.walk("."):
+        pastas[:] = [p for p in pastas if p not in IGNORAR and not p.startswith(".")]
+        site.update(Path(raiz, n).as_posix().removeprefix("./") for n in nomes)
+    return site
+
+
+def carregar_cache() -> dict:
+    try:
+        cache = json.loads(CACHE.read_text(encoding='utf-8'))
+    except (FileNotFoundError, ValueError):
+        return {}
+    return cache.get("ficheiros", {}) if cache.get("versao") == VERSAO else {}
+
+
+def gravar_cache(ficheiros: dict):
+    conteudo = json.dumps({"versao": VERSAO, "ficheiros": ficheiros}, ensure_ascii=False, sort_keys=True)
+    CACHE.write_text(conteudo + "\n", encoding='utf-8')
+
+
+# ──────────────────────────────────────────────────────────────
+# EXTRAÇÃO (uma leitura por ficheiro)
+# ──────────────────────────────────────────────────────────────
+
+def _apagar(m: re.Match) -> str:
+    # Mantém as quebras de linha para os números de linha continuarem certos
+    abertura = m.group("abertura") or ""
+    return abertura + "\n" * m.group(0).count("\n", len(abertura))
+
+
+def _urls_css(conteudo: str) -> list[str]:
+    return [next(u for u in m.groups() if u is not None).strip() for m in _RE_URL_CSS.finditer(conteudo)]
+
+
+def extrair_html(texto: str) -> tuple[list, set]:
+    """Ligações (linha, atributo, URL) e ids/names de uma página ou SVG."""
+    texto = _RE_IGNORAR.sub(_apagar, texto)
+    inicios = [0] + [m.end() for m in re.finditer("\n", texto)]
+    ligacoes, ids = [], set()
+    for tag in _RE_TAG.finditer(texto):
+        linha = bisect_right(inicios, tag.start())
+        nome_tag = tag.group(1).lower()
+        for atributo in _RE_ATRIBUTO.finditer(tag.group(2)):
+            nome = atributo.group(1).lower()
+            valor = unescape(next(v for v in atributo.group(2, 3, 4) if v is not None)).strip()
+            if nome == "id" or (nome == "name" and nome_tag in ("a", "map")):
+                ids.add(valor)
+            elif nome == "srcset":
+                for candidato in valor.split(","):
+                    if candidato.split():
+                        ligacoes.append((linha, nome, candidato.split()[0]))
+            elif nome in ATRIBUTOS and (nome != "data" or nome_tag == "object"):
+                ligacoes.append((linha, nome, valor))
+            elif nome == "style" and "url(" in valor:
+                ligacoes.extend((linha, "style", u) for u in _urls_css(valor))
+    return ligacoes, ids
+
+
+def extrair(caminho: str) -> tuple[str, dict]:
+    """Trabalho de cada processo: (caminho, {"hash", "ligacoes", "ids"})."""
+    dados = Path(caminho).read_bytes()
+    texto = dados.decode('utf-8', errors='replace')
+    if caminho.endswith(".css"):
+        ligacoes = []
+        for n, linha in enumerate(texto.splitlines(), 1):
+            ligacoes.extend((n, "url", u) for u in _urls_css(linha))
+        ids = set()
+    else:
+        ligacoes, ids = extrair_html(texto)
+    return caminho, {"hash": hashlib.sha256(dados).hexdigest(), "ligacoes": ligacoes, "ids": sorted(ids)}
+
+
+# ──────────────────────────────────────────────────────────────
+# RESOLUÇÃO
+# ──────────────────────────────────────────────────────────────
+
+def resolver(origem: str, url: str, site: set[str]) -> tuple[str | None, str | None]:
+    """
+    (ficheiro de destino, âncora) de um URL interno; (None, None) se o URL for
+    externo ou não for verificável. Um destino que não existe volta como "".
+    """
+    if not url or "{{" in url or url.startswith("//"):
+        return None, None
+    partes = urlsplit(url)
+    if partes.scheme or partes.netloc:          # http:, mailto:, tel:, data:, javascript:…
+        return None, None
+    caminho = unquote(partes.path)
+    ancora = unquote(partes.fragment) if "#" in url else None
+    if not caminho:
+        return origem, ancora
+
+    base = "" if caminho.startswith("/") else os.path.dirname(origem)
+    alvo = os.path.normpath(os.path.join(base, caminho.lstrip("/"))).replace(os.sep, "/")
+    if alvo.startswith(".."):
+        return "", ancora
+    if alvo == ".":
+        alvo = "index.html"
+    # O GitHub Pages serve pasta/ → pasta/index.html e pagina → pagina.html
+    for candidato in (alvo, f"{alvo}/index.html", f"{alvo}.html"):
+        if candidato in site:
+            return candidato, ancora
+    return "", ancora
+
+
+def verificar(extraidos: dict, site: set[str]) -> list[tuple[str, int, str, str]]:
+    """Lista de (origem, linha, URL, motivo) das ligações partidas."""
+    ids = {caminho: set(info["ids"]) for caminho, info in extraidos.items()}
+    problemas = []
+    for origem in sorted(extraidos):
+        for linha, _, url in extraidos[origem]["ligacoes"]:
+            alvo, ancora = resolver(origem, url, site)
+            if alvo is None:
+                continue
+            if alvo == "":
+                problemas.append((origem, linha, url, "ficheiro não existe"))
+            elif ancora not in (None, *ANCORAS_IMPLICITAS) and alvo in ids and ancora not in ids[alvo]:
+                problemas.append((origem, linha, url, f"âncora #{ancora} não existe em {alvo}"))
+    return problemas
+
+
+def verificar_site(processos: int | None = None, mostrar: bool = True) -> list[tuple[str, int, str, str]]:
+    """
+    Só se voltam a ler os ficheiros cujo hash mudou; a resolução contra os
+    ficheiros existentes corre sempre, porque apagar ou renomear o destino
+    parte ligações de páginas que não mudaram.
+    """
+    inicio = time.perf_counter()
+    cache = carregar_cache()
+    extraidos = {}
+    pendentes = []
+    for caminho in listar_ficheiros():
+        info = cache.get(caminho)
+        if info and info["hash"] == hashlib.sha256(Path(caminho).read_bytes()).hexdigest():
+            extraidos[caminho] = info
+        else:
+            pendentes.append(caminho)
+
+    processos = processos or os.cpu_count() or 1
+    if processos > 1 and len(pendentes) > 1:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            lote = max(1, len(pendentes) // (processos * 4))
+            extraidos.update(pool.map(extrair, pendentes, chunksize=lote))
+    else:
+        extraidos.update(map(extrair, pendentes))
+    if pendentes or set(cache) != set(extraidos):
+        gravar_cache(extraidos)
+
+    problemas = verificar(extraidos, listar_site())
+    if mostrar:
+        total = sum(len(info["ligacoes"]) for info in extraidos.values())
+        origem_anterior = None
+        for origem, linha, url, motivo in problemas:
+            if origem != origem_anterior:
+                print(f"\n📄 {origem}")
+                origem_anterior = origem
+            print(f"   ❌ linha {linha:<5} {url}  — {motivo}")
+        print(f"\n{'❌' if problemas else '✅'} {len(problemas)} ligação(ões) partida(s) em {total} "
+              f"verificada(s), {len(extraidos)} ficheiro(s) "
+              f"({len(pendentes)} lido(s), {len(extraidos) - len(pendentes)} da cache) "
+              f"em {time.perf_counter() - inicio:.2f} s.")
+    return problemas
+
+
+# ──────────────────────────────────────────────────────────────
+# MAIN
+# ──────────────────────────────────────────────────────────────
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Verifica as ligações internas e os assets do site NuAr.")
+    parser.add_argument("--sem-cache", action="store_true", help="volta a ler todos os ficheiros")
+    parser.add_argument("-j", "--processos", type=int, default=None,
+                        help="número de processos (por omissão, um por núcleo)")
+    args = parser.parse_args(argv)
+
+    if args.sem_cache:
+        CACHE.unlink(missing_ok=True)
+    return 1 if verificar_site(args.processos) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
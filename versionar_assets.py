@@ -0,0 +1,203 @@
+"""
+╔══════════════════════════════════════════════════════════════╗
+║         VERSIONAMENTO DE ASSETS — NuAr                       ║
+║  Copia css/ e images/ para nomes com hash do conteúdo        ║
+║  (css/style.css → css/style.<hash>.css) e atualiza as        ║
+║  referências em todas as páginas *.html (incluindo o         ║
+║  atividade-template.html usado pelo gestor_atividades.py).   ║
+║                                                              ║
+║  Ficheiros gerados:                                          ║
+║    assets-manifest.json — original → versão com hash         ║
+║    _headers             — cache longa (immutable) para os    ║
+║                           assets com hash, curta para HTML   ║
+╚══════════════════════════════════════════════════════════════╝
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+from pathlib import Path
+
+import comprimir_estaticos
+
+
+# ──────────────────────────────────────────────────────────────
+# CONFIGURAÇÃO
+# ──────────────────────────────────────────────────────────────
+PASTAS_ASSETS   = ("css", "images")
+EXTENSOES       = {".css", ".js", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".svg", ".ico"}
+MANIFESTO_JSON  = "assets-manifest.json"
+HEADERS         = "_headers"
+
+# Pastas cujos ficheiros já têm o hash no nome (otimizar_imagens.py, espelho do Drive)
+PASTAS_JA_VERSIONADAS = ("images/otimizadas", "images/drive")
+
+CACHE_IMUTAVEL  = "public, max-age=31536000, immutable"
+CACHE_HTML      = "public, max-age=300, must-revalidate"
+
+TAMANHO_HASH    = 10
+
+_RE_COM_HASH    = re.compile(rf'\.[0-9a-f]{{{TAMANHO_HASH}}}(\.\w+)$')
+# data-otimizada="images/X" é a chave do otimizar_imagens.py no manifesto dele: fica sem hash
+_RE_REF_HTML    = re.compile(r'data-otimizada="[^"]*"|(?<![\w/.-])((?:%s)/[^"\'\s)>,]+)' % "|".join(PASTAS_ASSETS))
+_RE_URL_CSS     = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+
+# ──────────────────────────────────────────────────────────────
+# UTILITÁRIOS
+# ──────────────────────────────────────────────────────────────
+
+def hash_bytes(conteudo: bytes) -> str:
+    return hashlib.sha256(conteudo).hexdigest()[:TAMANHO_HASH]
+
+
+def sem_hash(caminho: str) -> str:
+    """css/style.0a1b2c3d4e.css → css/style.css"""
+    return _RE_COM_HASH.sub(r'\1', caminho)
+
+
+def com_hash(caminho: str, h: str) -> str:
+    p = Path(caminho)
+    return p.with_name(f"{p.stem}.{h}{p.suffix}").as_posix()
+
+
+def ja_versionado(caminho: str) -> bool:
+    return caminho.startswith(PASTAS_JA_VERSIONADAS)
+
+
+def listar_assets() -> list[str]:
+    """Assets originais (sem as cópias com hash já geradas)."""
+    assets = []
+    for pasta in PASTAS_ASSETS:
+        for p in sorted(Path(pasta).rglob("*")):
+            caminho = p.as_posix()
+            if p.is_file() and p.suffix.lower() in EXTENSOES and sem_hash(caminho) == caminho:
+                assets.append(caminho)
+    return assets
+
+
+def carregar_manifesto() -> dict:
+    try:
+        return json.loads(Path(MANIFESTO_JSON).read_text(encoding='utf-8'))
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+# ──────────────────────────────────────────────────────────────
+# VERSIONAMENTO
+# ──────────────────────────────────────────────────────────────
+
+def reescrever_css(conteudo: str, pasta_css: str, mapa: dict) -> str:
+    """Troca url(../images/x.png) pelas versões com hash (caminhos relativos ao CSS)."""
+    def trocar(m):
+        aspas, url = m.group(1), m.group(2)
+        if url.startswith(("data:", "http:", "https:", "//", "#")):
+            return m.group(0)
+        alvo = os.path.normpath(os.path.join(pasta_css, sem_hash(url))).replace(os.sep, "/")
+        if alvo not in mapa:
+            return m.group(0)
+        novo = os.path.relpath(mapa[alvo], pasta_css).replace(os.sep, "/")
+        return f"url({aspas}{novo}{aspas})"
+
+    return _RE_URL_CSS.sub(trocar, conteudo)
+
+
+def versionar_assets() -> dict:
+    """
+    Cria as cópias com hash e devolve o mapa original → versionado.
+    As imagens são tratadas primeiro porque o CSS pode referenciá-las.
+    """
+    anterior = carregar_manifesto()
+    mapa = {}
+    novos = 0
+
+    assets = listar_assets()
+    for caminho in sorted(assets, key=lambda c: c.endswith(".css")):
+        if ja_versionado(caminho):
+            mapa[caminho] = caminho
+            continue
+
+        if caminho.endswith(".css"):
+            texto = Path(caminho).read_text(encoding='utf-8')
+            conteudo = reescrever_css(texto, str(Path(caminho).parent), mapa).encode('utf-8')
+        else:
+            conteudo = Path(caminho).read_bytes()
+
+        destino = com_hash(caminho, hash_bytes(conteudo))
+        mapa[caminho] = destino
+        if not Path(destino).exists():
+            Path(destino).write_bytes(conteudo)
+            shutil.copystat(caminho, destino)
+            novos += 1
+
+    # remover versões antigas que deixaram de ser usadas
+    usados = set(mapa.values())
+    for antigo in set(anterior.values()) - usados:
+        if antigo != sem_hash(antigo):
+            Path(antigo).unlink(missing_ok=True)
+            comprimir_estaticos.apagar_variantes(antigo)
+
+    print(f"🔖 {len(mapa)} asset(s) versionado(s), {novos} cópia(s) nova(s).")
+    return mapa
+
+
+def reescrever_html(conteudo: str, mapa: dict) -> str:
+    """Aponta css/… e images/… para as versões com hash (aceita nomes já versionados)."""
+    def trocar(m):
+        if m.group(1) is None:
+            return m.group(0)
+        caminho, cardinal, fragmento = m.group(1).partition("#")     # images/icones.svg#icon-pin
+        original = sem_hash(caminho)
+        return mapa.get(original, caminho) + cardinal + fragmento
+
+    return _RE_REF_HTML.sub(trocar, conteudo)
+
+
+def reescrever_paginas(mapa: dict, paginas: list[Path]) -> int:
+    alteradas = 0
+    for pagina in paginas:
+        conteudo = pagina.read_text(encoding='utf-8')
+        novo = reescrever_html(conteudo, mapa)
+        if novo != conteudo:
+            pagina.write_text(novo, encoding='utf-8')
+            alteradas += 1
+    print(f"📄 {alteradas} página(s) atualizada(s).")
+    return alteradas
+
+
+def gerar_headers(mapa: dict) -> str:
+    """Ficheiro _headers (Netlify / Cloudflare Pages)."""
+    linhas = ["# Gerado por versionar_assets.py — não editar à mão", ""]
+    for versionado in sorted(set(mapa.values())):
+        linhas += [f"/{versionado}", f"  Cache-Control: {CACHE_IMUTAVEL}", ""]
+    for padrao in ("/", "/*.html", "/*.json"):
+        linhas += [padrao, f"  Cache-Control: {CACHE_HTML}", ""]
+    return "\n".join(linhas)
+
+
+# ──────────────────────────────────────────────────────────────
+# MAIN
+# ──────────────────────────────────────────────────────────────
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Versiona os assets do site NuAr com hash no nome.")
+    parser.add_argument("--sem-html", action="store_true", help="só gera cópias, manifesto e _headers")
+    args = parser.parse_args(argv)
+
+    mapa = versionar_assets()
+    if not args.sem_html:
+        reescrever_paginas(mapa, sorted(Path(".").glob("*.html")))
+
+    Path(MANIFESTO_JSON).write_text(json.dumps(mapa, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
+                                    encoding='utf-8')
+    Path(HEADERS).write_text(gerar_headers(mapa), encoding='utf-8')
+    print(f"✅ {MANIFESTO_JSON} e {HEADERS} atualizados.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())